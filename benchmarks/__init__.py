@@ -0,0 +1,5 @@
+"""Benchmarks of task_manager on seeded synthetic workloads.
+
+Run ``python -m benchmarks`` from the repository root; see ``--help`` for
+sizes, a subset of benchmarks and comparing with an earlier JSON report.
+"""
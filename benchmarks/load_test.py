@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import numpy as np
+from task_manager.models import CompactTask
+from .workload import generate_tasks, write_csv
+
+
+# Share of requests per kind; "create" is the only write
+REQUEST_MIX = {
+    "list": 0.25,
+    "get": 0.25,
+    "search": 0.1,
+    "calendar": 0.15,
+    "risk": 0.1,
+    "recommendations": 0.05,
+    "create": 0.1,
+}
+_SEARCH_TERMS = ["laporan", "review", "budget", "rapat", "deploy", "skripsi", "tim", "client"]
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection sending JSON requests"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, target: str, body: Optional[Dict] = None) -> Tuple[int, Dict]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self._writer.write(
+            f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+        )
+        await self._writer.drain()
+        status = int((await self._reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self._reader.readexactly(length))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _next_request(rng: random.Random, ids: List[str]) -> Tuple[str, str, str, Optional[Dict]]:
+    """(kind, method, target, body) of a random request following REQUEST_MIX"""
+    kind = rng.choices(list(REQUEST_MIX), weights=list(REQUEST_MIX.values()))[0]
+    if kind == "list":
+        return kind, "GET", f"/tasks?offset={rng.randrange(0, 200)}&limit=20&selesai=false", None
+    if kind == "get":
+        return kind, "GET", f"/tasks/{rng.choice(ids)}", None
+    if kind == "search":
+        return kind, "GET", f"/tasks?q={rng.choice(_SEARCH_TERMS)}&limit=20", None
+    if kind == "calendar":
+        start = date.today() + timedelta(days=rng.randrange(-60, 60))
+        return kind, "GET", f"/calendar?start={start.isoformat()}&days=7", None
+    if kind == "risk":
+        return kind, "GET", f"/tasks/{rng.choice(ids)}/risk", None
+    if kind == "recommendations":
+        return kind, "GET", "/recommendations?limit=20", None
+    deadline = date.today() + timedelta(days=rng.randrange(1, 60))
+    return kind, "POST", "/tasks", {
+        "nama": f"Load test {rng.randrange(10 ** 6)}",
+        "deskripsi": "dibuat oleh load test",
+        "prioritas": rng.choice(["Tinggi", "Sedang", "Rendah"]),
+        "deadline": deadline.isoformat(),
+    }
+
+
+async def _client(host: str, port: int, ids: List[str], seed: int, stop_at: float,
+                  latencies: Dict[str, List[float]], errors: Dict[str, int]) -> None:
+    rng = random.Random(seed)
+    connection = Connection(host, port)
+    try:
+        while time.perf_counter() < stop_at:
+            kind, method, target, body = _next_request(rng, ids)
+            start = time.perf_counter()
+            try:
+                status, _ = await connection.request(method, target, body)
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                errors[kind] = errors.get(kind, 0) + 1
+                connection.close()
+                connection = Connection(host, port)
+                continue
+            latencies.setdefault(kind, []).append(time.perf_counter() - start)
+            if status >= 400:
+                errors[kind] = errors.get(kind, 0) + 1
+    finally:
+        connection.close()
+
+
+def _summary(latencies: List[float], seconds: float) -> Dict:
+    values = np.asarray(latencies)
+    return {
+        "requests": len(values),
+        "rps": len(values) / seconds,
+        "p50_ms": float(np.percentile(values, 50) * 1000),
+        "p90_ms": float(np.percentile(values, 90) * 1000),
+        "p99_ms": float(np.percentile(values, 99) * 1000),
+        "max_ms": float(values.max() * 1000),
+    }
+
+
+async def run_load(url: str, concurrency: int = 32, duration: float = 10.0, seed: int = 0) -> Dict:
+    """Send REQUEST_MIX traffic from concurrency keep-alive clients for duration seconds"""
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    probe = Connection(host, port)
+    _, page = await probe.request("GET", "/tasks?limit=500")
+    probe.close()
+    ids = [task["ID"] for task in page["tasks"]]
+    if not ids:
+        raise SystemExit("The server has no tasks to request")
+
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, ids, seed + i, started + duration, latencies, errors) for i in range(concurrency)
+    ))
+    seconds = time.perf_counter() - started
+    everything = [value for values in latencies.values() for value in values]
+    return {
+        "url": url,
+        "concurrency": concurrency,
+        "duration": seconds,
+        "total": dict(_summary(everything, seconds), errors=sum(errors.values())),
+        "requests": {
+            kind: dict(_summary(values, seconds), errors=errors.get(kind, 0))
+            for kind, values in sorted(latencies.items())
+        },
+    }
+
+
+async def _wait_until_up(url: str, timeout: float = 60.0) -> None:
+    parts = urlsplit(url)
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            connection = Connection(parts.hostname, parts.port)
+            await connection.request("GET", "/health")
+            connection.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test",
+                                     description="Load test the task HTTP API")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="API to test (default: %(default)s)")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", type=int, metavar="TASKS",
+                        help="start a local server over this many synthetic tasks instead of using --url")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    server = workdir = None
+    url = args.url
+    if args.spawn:
+        workdir = tempfile.TemporaryDirectory(prefix="task-load-")
+        path = os.path.join(workdir.name, "tugas.csv")
+        write_csv(path, generate_tasks(args.spawn, args.seed, CompactTask, date.today()))
+        port = urlsplit(url).port or 8080
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "task_manager.api", path, "--port", str(port)],
+            cwd=workdir.name, env=dict(os.environ, PYTHONPATH=root), stdout=subprocess.DEVNULL
+        )
+        url = f"http://127.0.0.1:{port}"
+    try:
+        if server is not None:
+            asyncio.run(_wait_until_up(url))
+        results = asyncio.run(run_load(url, args.concurrency, args.duration, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+            workdir.cleanup()
+
+    total = results["total"]
+    print(f"{total['requests']} requests in {results['duration']:.1f}s: {total['rps']:.0f} req/s, "
+          f"p50 {total['p50_ms']:.1f} ms, p99 {total['p99_ms']:.1f} ms, {total['errors']} errors")
+    for kind, summary in results["requests"].items():
+        print(f"  {kind:<16} {summary['requests']:>7} {summary['rps']:8.0f} req/s "
+              f"p50 {summary['p50_ms']:7.1f} ms  p99 {summary['p99_ms']:7.1f} ms  {summary['errors']} errors")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    # Usage: python -m benchmarks.load_test --spawn 10000 [--concurrency 32] [--duration 10] [--output load.json]
+    sys.exit(main())
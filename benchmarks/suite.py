@@ -0,0 +1,300 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from task_manager.models import TaskManager, Task, CompactTask, task_footprint
+from task_manager.storage import JournalStorage
+from task_manager.analytics import analyze_productivity_patterns, predict_task_delay
+from .workload import REFERENCE_DATE, generate_tasks, write_csv
+
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_REPEAT = 5
+# Median slowdown against a baseline run that counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the app imports at startup, and the libraries they must not pull in: importing those
+# takes longer than the whole startup budget, so they are only imported where first needed
+STARTUP_MODULES = [
+    "task_manager.models", "task_manager.storage", "task_manager.shared", "task_manager.transfer",
+    "task_manager.training", "task_manager.analytics", "task_manager.columnar", "task_manager.tenants",
+]
+HEAVY_MODULES = ["sklearn", "scipy", "pandas", "plotly"]
+# Upper bound for importing STARTUP_MODULES in a fresh interpreter, in seconds (sklearn alone takes longer)
+STARTUP_IMPORT_BUDGET = 0.5
+# Upper bound for the mean task_footprint of a CompactTask, in bytes
+COMPACT_FOOTPRINT_BUDGET = 256
+FOOTPRINT_SAMPLE = 2000
+
+
+class Workload:
+    """Synthetic tasks of one size, written to a CSV file the benchmarks copy from"""
+
+    def __init__(self, size: int, seed: int, root: str):
+        self.size = size
+        self.seed = seed
+        self.dir = os.path.join(root, str(size))
+        os.makedirs(self.dir)
+        self.tasks = generate_tasks(size, seed, CompactTask)
+        self.today = REFERENCE_DATE
+        self.csv_path = os.path.join(self.dir, "tugas.csv")
+        write_csv(self.csv_path, self.tasks)
+        self._manager: Optional[TaskManager] = None
+
+    def copy(self, name: str) -> str:
+        """Private copy of the CSV file for a benchmark that writes to it"""
+        os.makedirs(os.path.join(self.dir, name))
+        path = os.path.join(self.dir, name, "tugas.csv")
+        shutil.copyfile(self.csv_path, path)
+        return path
+
+    def open_manager(self, name: str) -> TaskManager:
+        """Loaded manager over a private copy, configured like the app"""
+        return TaskManager(JournalStorage(self.copy(name)), task_class=CompactTask)
+
+    @property
+    def manager(self) -> TaskManager:
+        """Loaded manager shared by the benchmarks that do not depend on a cold start"""
+        if self._manager is None:
+            self._manager = self.open_manager("shared")
+        return self._manager
+
+    def probes(self, count: int) -> List[CompactTask]:
+        """New active tasks that are not part of the workload"""
+        return [
+            CompactTask(task.nama, task.prioritas, task.deadline, deskripsi=task.deskripsi)
+            for task in generate_tasks(count, self.seed + 1, Task, self.today)
+        ]
+
+
+def _time(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _repeat(fn: Callable[[], object], repeat: int) -> List[float]:
+    return [_time(fn) for _ in range(repeat)]
+
+
+def _first_and_warm(name: str, fn: Callable[[], object], repeat: int) -> Dict[str, List[float]]:
+    """Time the first call (which builds caches and models) apart from the calls after it"""
+    return {f"{name}.first": [_time(fn)], name: _repeat(fn, repeat)}
+
+
+def bench_load_csv(workload: Workload, repeat: int) -> Dict[str, List[float]]:
+    path = workload.copy("load")
+    return {"load_csv": _repeat(lambda: TaskManager(JournalStorage(path), task_class=CompactTask), repeat)}
+
+
+def bench_save_to_csv(workload: Workload, repeat: int) -> Dict[str, List[float]]:
+    return {"save_to_csv": _repeat(workload.manager.save_to_csv, repeat)}
+
+
+def bench_add_task(workload: Workload, repeat: int) -> Dict[str, List[float]]:
+    manager = workload.open_manager("add")
+    probes = iter(workload.probes(repeat + 1))
+    deadline = (date.today() + timedelta(days=7)).strftime("%Y-%m-%d")
+
+    def add():
+        probe = next(probes)
+        manager.add_task(probe.nama, probe.deskripsi, probe.prioritas, deadline)
+
+    return _first_and_warm("add_task", add, repeat)
+
+
+def bench_estimate_duration(workload: Workload, repeat: int) -> Dict[str, List[float]]:
+    manager = workload.manager
+    probes = iter(workload.probes(repeat + 1))
+    return _first_and_warm("estimate_duration", lambda: manager._estimate_duration(next(probes)), repeat)
+
+
+def bench_predict_task_delay(workload: Workload, repeat: int) -> Dict[str, List[float]]:
+    columns = workload.manager.columns
+    path = os.path.join(workload.dir, "delay_model.pkl")
+    probe = workload.probes(1)[0]
+    results = {"predict_task_delay.first": [_time(lambda: predict_task_delay(probe, [], path, columns))]}
+    results["predict_task_delay"] = _repeat(lambda: predict_task_delay(probe, [], path, columns), repeat)
+    results["predict_task_delay.cached"] = _repeat(
+        lambda: predict_task_delay(probe, [], path, columns, retrain=False), repeat
+    )
+    return results
+
+
+def bench_analyze_productivity_patterns(workload: Workload, repeat: int) -> Dict[str, List[float]]:
+    columns = workload.manager.columns
+    path = os.path.join(workload.dir, "productivity_clusters.pkl")
+    return _first_and_warm(
+        "analyze_productivity_patterns", lambda: analyze_productivity_patterns([], columns, path), repeat
+    )
+
+
+def bench_get_tasks_by_deadline(workload: Workload, repeat: int) -> Dict[str, List[float]]:
+    manager = workload.manager
+    return _first_and_warm(
+        "get_tasks_by_deadline", lambda: manager.get_tasks_by_deadline(7, start=workload.today), repeat
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[Workload, int], Dict[str, List[float]]]] = {
+    "load_csv": bench_load_csv,
+    "save_to_csv": bench_save_to_csv,
+    "add_task": bench_add_task,
+    "estimate_duration": bench_estimate_duration,
+    "predict_task_delay": bench_predict_task_delay,
+    "analyze_productivity_patterns": bench_analyze_productivity_patterns,
+    "get_tasks_by_deadline": bench_get_tasks_by_deadline,
+}
+
+
+def check_lazy_imports(repeat: int) -> Dict:
+    """Import the app's task_manager modules in fresh interpreters; none may load HEAVY_MODULES"""
+    runs = [startup_imports() for _ in range(repeat)]
+    heavy = sorted({m for run in runs for m in run["heavy"]})
+    seconds = _summary([run["seconds"] for run in runs])
+    return {
+        "check": "lazy_imports",
+        "passed": not heavy and seconds["median"] <= STARTUP_IMPORT_BUDGET,
+        "seconds": seconds,
+        "budget_seconds": STARTUP_IMPORT_BUDGET,
+        "heavy_modules": heavy,
+    }
+
+
+def startup_imports() -> Dict:
+    """Seconds to import STARTUP_MODULES in a fresh interpreter, and the HEAVY_MODULES that got loaded"""
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"for name in {STARTUP_MODULES!r}:\n"
+        "    __import__(name)\n"
+        "seconds = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': seconds, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def check_compact_footprint(seed: int) -> Dict:
+    """Mean task_footprint of Task and CompactTask over the same synthetic tasks"""
+    task = float(np.mean([task_footprint(t) for t in generate_tasks(FOOTPRINT_SAMPLE, seed, Task)]))
+    compact = float(np.mean([task_footprint(t) for t in generate_tasks(FOOTPRINT_SAMPLE, seed, CompactTask)]))
+    return {
+        "check": "compact_task_footprint",
+        "passed": compact < task and compact <= COMPACT_FOOTPRINT_BUDGET,
+        "task_bytes": round(task, 1),
+        "compact_task_bytes": round(compact, 1),
+        "budget_bytes": COMPACT_FOOTPRINT_BUDGET,
+    }
+
+
+def _summary(times: List[float]) -> Dict:
+    return {
+        "runs": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "max": max(times),
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: List[int], names: List[str], repeat: int = DEFAULT_REPEAT, seed: int = 0,
+        workdir: Optional[str] = None) -> Dict:
+    """Run the named benchmarks at every size plus the import and footprint checks"""
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "seed": seed,
+            "repeat": repeat,
+            "sizes": sizes,
+        },
+        "results": [],
+        "checks": [check_lazy_imports(repeat), check_compact_footprint(seed)],
+    }
+    for check in report["checks"]:
+        print(f"{check['check']:<40} {'ok' if check['passed'] else 'FAILED'}")
+
+    root = workdir or tempfile.mkdtemp(prefix="task-bench-")
+    try:
+        for size in sizes:
+            workload = Workload(size, seed, root)
+            for name in names:
+                for benchmark, times in BENCHMARKS[name](workload, repeat).items():
+                    result = {"benchmark": benchmark, "size": size, **_summary(times)}
+                    report["results"].append(result)
+                    print(f"{benchmark:<40} {size:>9} {result['median'] * 1000:12.2f} ms")
+    finally:
+        if workdir is None:
+            shutil.rmtree(root, ignore_errors=True)
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """Benchmarks whose median grew by more than tolerance against a baseline report"""
+    previous = {(r["benchmark"], r["size"]): r["median"] for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get((result["benchmark"], result["size"]))
+        if before and result["median"] > before * (1 + tolerance):
+            regressions.append({
+                "benchmark": result["benchmark"],
+                "size": result["size"],
+                "baseline": before,
+                "median": result["median"],
+                "ratio": result["median"] / before,
+            })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark task_manager")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="dataset sizes (default: %(default)s; 1000000 for the large run)")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help="benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic workload")
+    parser.add_argument("--output", default="benchmark.json", help="JSON report to write")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON report of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed median slowdown against the baseline (default: %(default)s)")
+    parser.add_argument("--workdir", help="keep the generated files in this directory")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.only, args.repeat, args.seed, args.workdir)
+    failed = [check["check"] for check in report["checks"] if not check["passed"]]
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+        for r in report["regressions"]:
+            print(f"Regression: {r['benchmark']} at {r['size']} tasks is {r['ratio']:.2f}x slower")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 1 if failed or report.get("regressions") else 0
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+import numpy as np
+from task_manager.models import Task
+from task_manager.columnar import PRIORITIES
+from task_manager.storage import CSVStorage
+
+
+# Share of each priority in PRIORITIES order
+PRIORITY_MIX = (0.25, 0.5, 0.25)
+# Share of tasks that are completed
+COMPLETED_SHARE = 0.6
+# Deadlines fall within this many days before or after the reference date
+DEADLINE_SPREAD = 120
+# Default "today" of generated workloads, fixed so results compare across days
+REFERENCE_DATE = date(2025, 1, 1)
+
+# Task texts mix Indonesian and English the way users write them
+_ACTIONS = [
+    "Buat", "Kerjakan", "Revisi", "Siapkan", "Review", "Kirim", "Perbaiki", "Susun",
+    "Update", "Cek", "Diskusi", "Presentasi", "Rapat", "Analisis", "Tulis", "Deploy",
+    "Fix", "Write", "Prepare", "Plan", "Test", "Refactor", "Draft", "Finalize",
+]
+_SUBJECTS = [
+    "laporan", "tugas", "makalah", "skripsi", "proposal", "jadwal", "anggaran", "presentasi",
+    "modul", "dokumentasi", "kuis", "ujian", "praktikum", "artikel", "slide", "kontrak",
+    "report", "budget", "invoice", "dashboard", "database", "API", "landing page", "sprint",
+    "backlog", "bug", "release", "newsletter", "meeting notes", "design", "unit test", "migration",
+]
+_CONTEXTS = [
+    "mingguan", "bulanan", "kuartal", "proyek", "kelas", "kantor", "klien", "tim",
+    "keuangan", "marketing", "riset", "semester", "internal", "produk", "weekly", "client",
+    "team", "Q1", "Q2", "Q3", "Q4", "frontend", "backend", "mobile",
+]
+_DETAILS = [
+    "sebelum deadline", "dengan dosen", "untuk rapat", "bersama tim", "sesuai template",
+    "cek ulang angka", "kirim via email", "minta feedback", "lengkapi lampiran", "perbaiki typo",
+    "follow up", "double check", "align with stakeholders", "update the tracker", "add screenshots",
+    "ask for review", "cover edge cases", "sync with design", "prepare handout", "book a room",
+]
+
+# Mean actual duration in hours per priority, matching Task.PRIORITY_DURATIONS
+_MEAN_HOURS = np.array([Task.PRIORITY_DURATIONS[p] for p in PRIORITIES])
+
+
+def generate_tasks(n: int, seed: int = 0, task_class: type = Task,
+                   today: Optional[date] = None) -> List[Task]:
+    """Seeded synthetic task set resembling real use of the app.
+
+    Priorities follow PRIORITY_MIX and deadlines are spread uniformly over
+    DEADLINE_SPREAD days around today (REFERENCE_DATE by default). About
+    COMPLETED_SHARE of the tasks are completed, usually a few days before
+    their deadline and sometimes after it, with a log-normal actual
+    duration around the priority's default and a daytime working hour.
+    Names and descriptions are built from Indonesian and English word
+    lists, so similar tasks share words. The same n, seed and today always give the same tasks and IDs.
+    """
+    rng = np.random.default_rng(seed)
+    today = today or REFERENCE_DATE
+    base = today.toordinal()
+
+    priority = rng.choice(len(PRIORITIES), size=n, p=PRIORITY_MIX)
+    deadline = base + rng.integers(-DEADLINE_SPREAD, DEADLINE_SPREAD + 1, size=n)
+    completed = rng.random(n) < COMPLETED_SHARE
+    # Mostly early, a tail of late completions drives the delay model
+    lateness = np.rint(rng.normal(-2.0, 3.0, size=n)).astype(np.int64)
+    finished = np.minimum(deadline + lateness, base)
+    actual = np.round(_MEAN_HOURS[priority] * rng.lognormal(0.0, 0.5, size=n), 1)
+    hour = rng.integers(8, 20, size=n)
+    words = [
+        rng.integers(0, len(pool), size=n)
+        for pool in (_ACTIONS, _SUBJECTS, _CONTEXTS, _DETAILS, _DETAILS)
+    ]
+    numbered = rng.random(n) < 0.3
+    number = rng.integers(1, 50, size=n)
+    ids = rng.integers(0, 2 ** 63, size=(n, 2), dtype=np.int64)
+
+    tasks = []
+    for i in range(n):
+        nama = f"{_ACTIONS[words[0][i]]} {_SUBJECTS[words[1][i]]} {_CONTEXTS[words[2][i]]}"
+        if numbered[i]:
+            nama = f"{nama} {number[i]}"
+        deskripsi = f"{_DETAILS[words[3][i]]}, {_DETAILS[words[4][i]]}"
+        done = bool(completed[i])
+        finish = date.fromordinal(int(finished[i])) if done else None
+        task = task_class(
+            nama, PRIORITIES[priority[i]], date.fromordinal(int(deadline[i])),
+            deskripsi=deskripsi,
+            selesai=done,
+            tanggal_selesai=finish,
+            durasi_aktual=float(actual[i]) if done else None,
+            waktu_rekomendasi=datetime.combine(finish, datetime.min.time()) + timedelta(hours=int(hour[i]))
+            if done else None,
+            id=f"{ids[i, 0]:016x}{ids[i, 1]:016x}",
+        )
+        tasks.append(task)
+    return tasks
+
+
+def write_csv(path: str, tasks: List[Task]) -> None:
+    """Write tasks to a CSV file in the app's format"""
+    CSVStorage(path).save_all([task.to_dict() for task in tasks])
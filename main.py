@@ -1,23 +1,101 @@
 import streamlit as st
-from datetime import datetime, date, time
-import pandas as pd
+from streamlit.errors import StreamlitAPIException
+from datetime import datetime, date, time, timedelta
 import numpy as np
-import plotly.express as px
-from collections import Counter
-from task_manager.models import TaskManager
-from task_manager.analytics import analyze_productivity_patterns, predict_task_delay
-from task_manager.recommendations import TimeOptimizer
+from task_manager.models import TaskManager, CompactTask, TASK_ORDERS
+from task_manager.columnar import PRIORITIES
+from task_manager.shared import SharedTaskManager
+from task_manager.tenants import WORKSPACES_DIR, DEFAULT_WORKSPACE, WORKSPACE_NAME, TenantPool, open_storage
+from task_manager.transfer import FORMATS
+from task_manager.training import ModelTrainer
+from task_manager.analytics import analyze_productivity_patterns, predict_task_delay, predict_task_delays
+from task_manager.metrics import METRICS_OPT_IN, metrics, timed, process_memory, deep_sizeof
+import csv
 import uuid
+import io
+import json
+import functools
+from contextlib import contextmanager
+
+
+@st.cache_resource(show_spinner=False)
+def get_task_manager() -> SharedTaskManager:
+    """Process-wide task manager shared by every session (without workspaces)"""
+    # Use the SQLite database once it has been migrated from tugas.csv
+    storage = open_storage(".")
+    # Defer loading so pages that don't list tasks render immediately;
+    # the similarity index is synced by the model trainer, not by the first new task
+    return SharedTaskManager(TaskManager(
+        storage=storage, task_class=CompactTask, lazy=True, snapshot=True, defer_estimates=True
+    ))
+
+
+@st.cache_resource(show_spinner=False)
+def get_model_trainer() -> ModelTrainer:
+    """Process-wide background trainer for the duration, delay and cluster models"""
+    return ModelTrainer(get_task_manager())
+
+
+@st.cache_resource(show_spinner=False)
+def get_tenant_pool() -> TenantPool:
+    """Process-wide LRU of loaded workspaces, used when the app runs with TASK_MANAGER_WORKSPACES"""
+    return TenantPool(WORKSPACES_DIR)
 
 
 def init_session_state():
     """Initialize session state variables"""
-    if 'task_manager' not in st.session_state:
-        st.session_state.task_manager = TaskManager()
+    if 'workspace' not in st.session_state:
+        name = st.query_params.get("workspace", DEFAULT_WORKSPACE)
+        st.session_state.workspace = name if WORKSPACE_NAME.match(name) else DEFAULT_WORKSPACE
     if 'productivity_data' not in st.session_state:
         st.session_state.productivity_data = None
 
 
+@contextmanager
+def use_workspace():
+    """Point the session at the current workspace's manager and trainer for the rest of this run.
+
+    With workspaces the partition is leased, so it is not unloaded while
+    the run uses it; every run fetches it again, so a session never keeps
+    a manager that was unloaded in between.
+    """
+    if WORKSPACES_DIR is None:
+        st.session_state.task_manager = get_task_manager()
+        st.session_state.trainer = get_model_trainer()
+        yield
+        return
+    with get_tenant_pool().lease(st.session_state.workspace) as tenant:
+        st.session_state.task_manager = tenant.manager
+        st.session_state.trainer = tenant.trainer
+        yield
+
+
+def in_workspace(fn):
+    """Run a fragment with the current workspace leased, like a full run of main()"""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with use_workspace():
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def select_workspace():
+    """Sidebar field for switching between workspaces"""
+    name = st.sidebar.text_input("Workspace", value=st.session_state.workspace).strip()
+    if name == st.session_state.workspace:
+        return
+    try:
+        get_tenant_pool().directory(name)
+    except ValueError as e:
+        st.sidebar.error(str(e))
+        return
+    st.session_state.workspace = name
+    st.session_state.productivity_data = None
+    st.session_state.pop("last_added_task", None)
+    st.query_params["workspace"] = name
+    st.rerun()
+
+
 def setup_page():
     """Configure page settings"""
     st.set_page_config(
@@ -30,10 +108,12 @@ def setup_page():
 
 def show_main_menu():
     """Display main navigation menu"""
-    menu = st.sidebar.selectbox(
-        "Menu",
-        ["Tambah Tugas", "Daftar Tugas", "Kalender", "Statistik", "Rekomendasi", "Analisis Produktivitas"]
-    )
+    pages = ["Tambah Tugas", "Daftar Tugas", "Kalender", "Statistik", "Rekomendasi", "Analisis Produktivitas",
+             "Impor/Ekspor"]
+    # Only listed when the app was started with TASK_MANAGER_METRICS=1
+    if METRICS_OPT_IN:
+        pages.append("Diagnostik")
+    menu = st.sidebar.selectbox("Menu", pages)
     
     if menu == "Tambah Tugas":
         show_add_task()
@@ -47,8 +127,13 @@ def show_main_menu():
         show_recommendations()
     elif menu == "Analisis Produktivitas":
         show_productivity_analysis()
+    elif menu == "Impor/Ekspor":
+        show_import_export()
+    elif menu == "Diagnostik":
+        show_diagnostics()
 
 
+@timed("view.show_add_task")
 def show_add_task():
     """Display task addition form"""
     st.header("➕ Tambah Tugas Baru")
@@ -73,22 +158,47 @@ def show_add_task():
                 )
                 
                 if success:
-                    task = result
                     st.success("Tugas berhasil ditambahkan!")
-                    if task.waktu_rekomendasi:
-                        st.info(
-                            f"💡 Rekomendasi: Kerjakan tugas ini pada {task.waktu_rekomendasi.strftime('%A, %d %B %Y pukul %H:%M')}\n"
-                            f"⏱ Estimasi durasi: {task.durasi_estimasi:.1f} jam"
-                        )
-                    
-                    # Show delay prediction
-                    delay_prob = predict_task_delay(task, st.session_state.task_manager.tasks)
-                    if delay_prob > 0.3:
-                        st.warning(f"⚠️ Potensi keterlambatan: {delay_prob*100:.1f}%")
+                    st.session_state.last_added_task = result.id
                 else:
                     st.error(result)
+    
+    # Warm up the models before the next submission; never waits for training
+    st.session_state.trainer.refresh()
+    show_last_added_task()
+
+
+@st.fragment(run_every=2)
+@in_workspace
+@timed("view.show_last_added_task")
+def show_last_added_task():
+    """Recommendation and delay risk of the last added task, redrawn as background models finish"""
+    task_id = st.session_state.get("last_added_task")
+    task = st.session_state.task_manager.get_task(task_id) if task_id else None
+    if task is None:
+        return
+    
+    st.markdown(f"**Tugas terakhir ditambahkan:** {task.nama}")
+    if task.waktu_rekomendasi:
+        st.info(
+            f"💡 Rekomendasi: Kerjakan tugas ini pada {task.waktu_rekomendasi.strftime('%A, %d %B %Y pukul %H:%M')}\n"
+            f"⏱ Estimasi durasi: {task.durasi_estimasi:.1f} jam"
+        )
+    
+    # Show delay prediction from the last trained model
+    delay_prob = predict_task_delay(task, [], st.session_state.trainer.delay_model_path, retrain=False)
+    if delay_prob > 0.3:
+        st.warning(f"⚠️ Potensi keterlambatan: {delay_prob*100:.1f}%")
+    if st.session_state.trainer.busy:
+        st.caption("⏳ Model sedang diperbarui di latar belakang; rekomendasi akan diperbarui otomatis.")
+
 
+# Sort options of the task list, mapped to TASK_ORDERS keys
+TASK_LIST_ORDERS = {"Deadline": "deadline", "Prioritas": "prioritas", "Status": "status"}
+TASK_PAGE_SIZES = [10, 20, 50, 100]
 
+
+@timed("view.show_task_list")
 def show_task_list():
     st.header("📝 Daftar Tugas")
     
@@ -100,7 +210,6 @@ def show_task_list():
     if 'edit_form_key' not in st.session_state:
         st.session_state.edit_form_key = str(uuid.uuid4())
 
-    # [Keep your existing filter and task display code here]
     # Filter tasks
     col1, col2 = st.columns(2)
     with col1:
@@ -108,126 +217,171 @@ def show_task_list():
     with col2:
         show_incomplete = st.checkbox("Tampilkan tugas belum selesai", value=True)
     
-    search_query = st.text_input("Cari tugas berdasarkan nama")
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        search_query = st.text_input("Cari tugas berdasarkan nama atau deskripsi")
+    with col2:
+        priorities = st.multiselect("Prioritas", list(PRIORITIES), default=list(PRIORITIES))
     
-    tasks = st.session_state.task_manager.tasks
+    searching = bool(search_query.strip())
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        sort_label = st.selectbox(
+            "Urutkan berdasarkan", (["Relevansi"] if searching else []) + list(TASK_LIST_ORDERS)
+        )
+    with col2:
+        page_size = st.selectbox("Tugas per halaman", TASK_PAGE_SIZES, index=1)
     
-    # Filter tasks
-    filtered_tasks = [
-        t for t in tasks
-        if ((show_completed and t.selesai) or (show_incomplete and not t.selesai))
-        and (not search_query or search_query.lower() in t.nama.lower())
-    ]
+    task_manager = st.session_state.task_manager
+    order = TASK_LIST_ORDERS.get(sort_label)
+    selesai = None if show_completed == show_incomplete else show_completed
+    prioritas = None if len(priorities) == len(PRIORITIES) else set(priorities)
+    results = None
+    if not (show_completed or show_incomplete) or not priorities:
+        total = 0
+    elif searching:
+        results = task_manager.search_tasks(search_query, selesai=selesai, prioritas=prioritas)
+        if order is not None:
+            results.sort(key=TASK_ORDERS[order])
+        total = len(results)
+    else:
+        total = task_manager.get_task_page(order, selesai, prioritas, limit=0)[1]
     
-    if not filtered_tasks:
+    if not total:
         st.info("Tidak ada tugas yang ditemukan.")
         return
     
+    pages = -(-total // page_size)
+    if st.session_state.get("task_page", 1) > pages:
+        st.session_state.task_page = pages
+    page = st.number_input(f"Halaman (dari {pages})", min_value=1, max_value=pages, step=1, key="task_page")
+    offset = (page - 1) * page_size
+    if results is not None:
+        page_tasks = results[offset:offset + page_size]
+    else:
+        page_tasks = task_manager.get_task_page(order, selesai, prioritas, offset, page_size)[0]
+    
+    st.caption(f"Menampilkan tugas {offset + 1}–{offset + len(page_tasks)} dari {total}")
     st.info("💡 Klik pada setiap task untuk melihat detail")
     
-    for i, task in enumerate(filtered_tasks, 1):
-        status_icon = "✅" if task.selesai else "📌"
+    for i, task in enumerate(page_tasks, offset + 1):
+        show_task_row(task.id, i)
+
+
+def rerun_row():
+    """Rerun only the current task row, or the whole page when it is drawn by a full run"""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+
+@st.fragment
+@in_workspace
+@timed("view.show_task_row")
+def show_task_row(task_id: str, i: int):
+    """One task of the list; its buttons and forms rerun only this row"""
+    task = st.session_state.task_manager.get_task(task_id)
+    if task is None:
+        return
+    status_icon = "✅" if task.selesai else "📌"
+    active = task_id in (st.session_state.completing_task, st.session_state.editing_task)
+    
+    with st.expander(f"{i}. {status_icon} {task.nama}", expanded=active):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"**Prioritas:** {task.prioritas}")
+            st.write(f"**Deadline:** {task.deadline.strftime('%d %B %Y')}")
+            st.write(f"**Estimasi Durasi:** {task.durasi_estimasi:.1f} jam")
+            
+            if task.selesai:
+                st.write(f"**Status:** Selesai")
+                st.write(f"**Tanggal Selesai:** {task.tanggal_selesai.strftime('%d %B %Y')}")
+                st.write(f"**Durasi Aktual:** {task.durasi_aktual:.1f} jam")
+            else:
+                st.write("**Status:** Belum selesai")
+            
+            if task.waktu_rekomendasi:
+                st.write(f"**Rekomendasi Waktu:** {task.waktu_rekomendasi.strftime('%d %B %Y, %H:%M')}")
         
-        with st.expander(f"{i}. {status_icon} {task.nama}"):
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write(f"**Prioritas:** {task.prioritas}")
-                st.write(f"**Deadline:** {task.deadline.strftime('%d %B %Y')}")
-                st.write(f"**Estimasi Durasi:** {task.durasi_estimasi:.1f} jam")
+        with col2:
+            st.write(f"**Deskripsi:** {task.deskripsi or 'Tidak ada deskripsi'}")
+        
+        # Action buttons
+        col1, col2, col3 = st.columns(3)
+        if not task.selesai:
+            if col1.button(f"Tandai Selesai {i}", key=f"complete_{task_id}"):
+                st.session_state.completing_task = task_id
+                st.session_state.editing_task = None
+                rerun_row()
+        
+        if col2.button(f"Edit {i}", key=f"edit_{task_id}"):
+            st.session_state.editing_task = task_id
+            st.session_state.completing_task = None
+            st.session_state.edit_form_key = str(uuid.uuid4())
+            rerun_row()
+        
+        if col3.button(f"Hapus {i}", key=f"delete_{task_id}"):
+            if st.session_state.task_manager.delete_task(task):
+                st.success("Task berhasil dihapus!")
+                st.session_state.editing_task = None
+                st.rerun()  # The rows below move up, so the whole page is redrawn
+            else:
+                st.error("Gagal menghapus task!")
+        
+        # Edit form for this task if selected
+        if st.session_state.editing_task == task_id:
+            with st.form(key=f"edit_form_{st.session_state.edit_form_key}"):
+                st.subheader(f"Edit Task: {task.nama}")
                 
-                if task.selesai:
-                    st.write(f"**Status:** Selesai")
-                    st.write(f"**Tanggal Selesai:** {task.tanggal_selesai.strftime('%d %B %Y')}")
-                    st.write(f"**Durasi Aktual:** {task.durasi_aktual:.1f} jam")
-                else:
-                    st.write("**Status:** Belum selesai")
+                new_nama = st.text_input("Nama Tugas*", value=task.nama)
+                new_deskripsi = st.text_area("Deskripsi Tugas", value=task.deskripsi)
+                new_prioritas = st.selectbox(
+                    "Prioritas*", 
+                    ["Tinggi", "Sedang", "Rendah"],
+                    index=["Tinggi", "Sedang", "Rendah"].index(task.prioritas)
+                )
+                new_deadline = st.date_input(
+                    "Deadline*", 
+                    value=task.deadline,
+                    min_value=date.today()
+                )
                 
-                if task.waktu_rekomendasi:
-                    st.write(f"**Rekomendasi Waktu:** {task.waktu_rekomendasi.strftime('%d %B %Y, %H:%M')}")
-            
-            with col2:
-                st.write(f"**Deskripsi:** {task.deskripsi or 'Tidak ada deskripsi'}")
-            
-            # Action buttons
-            col1, col2, col3 = st.columns(3)
-            if not task.selesai:
-                if col1.button(f"Tandai Selesai {i}", key=f"complete_{i}"):
-                    st.session_state.completing_task = i
-                    st.session_state.editing_task = None
-                    st.rerun()
-            
-            if col2.button(f"Edit {i}", key=f"edit_{i}"):
-                st.session_state.editing_task = i
-                st.session_state.completing_task = None
-                st.session_state.edit_form_key = str(uuid.uuid4())
-                st.rerun()
-            
-            if col3.button(f"Hapus {i}", key=f"delete_{i}"):
-                st.session_state.task_manager.tasks.remove(task)
-                if st.session_state.task_manager.save_to_csv():
-                    st.success("Task berhasil dihapus!")
-                    st.session_state.editing_task = None
-                    st.rerun()
-                else:
-                    st.error("Gagal menghapus task!")
-            
-            # Edit form for this task if selected
-            if st.session_state.editing_task == i:
-                with st.form(key=f"edit_form_{st.session_state.edit_form_key}"):
-                    st.subheader(f"Edit Task: {task.nama}")
-                    
-                    new_nama = st.text_input("Nama Tugas*", value=task.nama)
-                    new_deskripsi = st.text_area("Deskripsi Tugas", value=task.deskripsi)
-                    new_prioritas = st.selectbox(
-                        "Prioritas*", 
-                        ["Tinggi", "Sedang", "Rendah"],
-                        index=["Tinggi", "Sedang", "Rendah"].index(task.prioritas)
-                    )
-                    new_deadline = st.date_input(
-                        "Deadline*", 
-                        value=task.deadline,
-                        min_value=date.today()
-                    )
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        submit_edit = st.form_submit_button("Simpan Perubahan")
-                    with col2:
-                        cancel_edit = st.form_submit_button("Batal")
-                    
-                    if submit_edit:
-                        if not new_nama:
-                            st.error("Nama tugas wajib diisi!")
+                col1, col2 = st.columns(2)
+                with col1:
+                    submit_edit = st.form_submit_button("Simpan Perubahan")
+                with col2:
+                    cancel_edit = st.form_submit_button("Batal")
+                
+                if submit_edit:
+                    if not new_nama:
+                        st.error("Nama tugas wajib diisi!")
+                    else:
+                        if st.session_state.task_manager.update_task(
+                            task,
+                            nama=new_nama,
+                            deskripsi=new_deskripsi,
+                            prioritas=new_prioritas,
+                            deadline=new_deadline
+                        ):
+                            st.success("Perubahan berhasil disimpan!")
+                            st.session_state.editing_task = None
+                            rerun_row()
                         else:
-                            task.nama = new_nama
-                            task.deskripsi = new_deskripsi
-                            task.prioritas = new_prioritas
-                            task.deadline = new_deadline
-                            
-                            st.session_state.task_manager._generate_time_recommendation(task)
-                            
-                            if st.session_state.task_manager.save_to_csv():
-                                st.success("Perubahan berhasil disimpan!")
-                                st.session_state.editing_task = None
-                                st.rerun()
-                            else:
-                                st.error("Gagal menyimpan perubahan!")
-                    
-                    if cancel_edit:
-                        st.session_state.editing_task = None
-                        st.rerun()
-    
-    # [Keep your existing completion form code here]
-    if st.session_state.completing_task is not None:
-        task_index = st.session_state.completing_task - 1
-        if task_index < len(filtered_tasks):
-            task = filtered_tasks[task_index]
-            with st.form(key=f"complete_form_{task_index}"):
+                            st.error("Gagal menyimpan perubahan!")
+                
+                if cancel_edit:
+                    st.session_state.editing_task = None
+                    rerun_row()
+        
+        # Completion form for this task if selected
+        if st.session_state.completing_task == task_id:
+            with st.form(key=f"complete_form_{task_id}"):
                 st.write(f"Menandai task '{task.nama}' sebagai selesai")
                 tanggal = st.date_input(
                     "Tanggal Selesai", 
                     value=date.today(),
-                    key=f"tanggal_{task_index}"
+                    key=f"tanggal_{task_id}"
                 )
                 durasi = st.number_input(
                     "Durasi Aktual (jam)", 
@@ -235,7 +389,7 @@ def show_task_list():
                     value=float(task.durasi_estimasi),
                     step=0.5,
                     format="%.1f",
-                    key=f"durasi_{task_index}"
+                    key=f"durasi_{task_id}"
                 )
                 
                 submit = st.form_submit_button("Konfirmasi")
@@ -246,14 +400,14 @@ def show_task_list():
                         if isinstance(durasi, str):
                             durasi = float(durasi.replace(',', '.'))
                         
-                        task.mark_completed(
+                        if st.session_state.task_manager.complete_task(
+                            task,
                             tanggal_selesai=tanggal,
                             durasi_aktual=float(durasi)
-                        )
-                        if st.session_state.task_manager.save_to_csv():
+                        ):
                             st.success("Task berhasil ditandai selesai!")
                             st.session_state.completing_task = None
-                            st.rerun()
+                            rerun_row()
                         else:
                             st.error("Gagal menyimpan ke file!")
                     except Exception as e:
@@ -261,73 +415,142 @@ def show_task_list():
                 
                 if cancel:
                     st.session_state.completing_task = None
-                    st.rerun()
+                    rerun_row()
+
 
+# Upper bound on the number of day panels rendered in the range view
+MAX_CALENDAR_DAYS = 62
+# Upper bound on the number of overdue tasks listed
+MAX_OVERDUE_LISTED = 100
 
+
+def format_task_lines(tasks, today: date) -> str:
+    """One markdown bullet per task with its status"""
+    lines = []
+    for task in tasks:
+        if task.selesai:
+            status = "✅"
+        elif task.deadline < today:
+            status = "⏰"
+        else:
+            status = "📌"
+        lines.append(f"- {status} {task.nama} ({task.prioritas})")
+    return "\n".join(lines)
+
+
+@timed("view.show_calendar")
 def show_calendar():
-    """Display calendar view of tasks"""
+    """Display week, month or date-range calendar views of tasks"""
     st.header("🗓 Kalender Tugas")
+    manager = st.session_state.task_manager
+    today = date.today()
+    
+    overdue = manager.get_overdue_tasks(today)
+    if overdue:
+        with st.expander(f"⏰ Melewati deadline: {len(overdue)} tugas", expanded=True):
+            st.markdown(format_task_lines(overdue[:MAX_OVERDUE_LISTED], today))
+            if len(overdue) > MAX_OVERDUE_LISTED:
+                st.write(f"... dan {len(overdue) - MAX_OVERDUE_LISTED} tugas lainnya")
+    
+    view = st.radio("Tampilan", ["Minggu", "Bulan", "Rentang"], horizontal=True)
+    if view == "Minggu":
+        anchor = st.date_input("Minggu yang memuat tanggal", today)
+        start = anchor - timedelta(days=anchor.weekday())
+        end = start + timedelta(days=6)
+    elif view == "Bulan":
+        col1, col2 = st.columns(2)
+        with col1:
+            month_names = [date(2000, m, 1).strftime("%B") for m in range(1, 13)]
+            month = month_names.index(st.selectbox("Bulan", month_names, index=today.month - 1)) + 1
+        with col2:
+            year = int(st.number_input("Tahun", min_value=1970, max_value=9998, value=today.year))
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    else:
+        selected = st.date_input("Rentang tanggal", (today - timedelta(days=7), today + timedelta(days=30)))
+        if len(selected) < 2:
+            st.info("Pilih tanggal awal dan akhir.")
+            return
+        start, end = selected
     
-    days = st.slider("Jumlah hari ke depan yang ditampilkan", 1, 30, 7)
-    calendar = st.session_state.task_manager.get_tasks_by_deadline(days)
+    tasks = manager.get_tasks_in_range(start, end)
+    st.caption(f"{start.strftime('%d %B %Y')} - {end.strftime('%d %B %Y')}: {len(tasks)} tugas")
     
-    for date in sorted(calendar.keys()):
-        with st.expander(f"{date.strftime('%A, %d %B %Y')}"):
-            if calendar[date]:
-                for task in calendar[date]:
-                    status = "✅" if task.selesai else "📌"
-                    st.write(f"- {status} {task.nama} ({task.prioritas})")
+    calendar = {}
+    for task in tasks:
+        calendar.setdefault(task.deadline, []).append(task)
+    
+    if view == "Rentang":
+        # Long ranges only list the days that have tasks
+        days = sorted(calendar)
+        if len(days) > MAX_CALENDAR_DAYS:
+            st.info(f"Menampilkan {MAX_CALENDAR_DAYS} hari pertama dari {len(days)} hari yang memiliki tugas.")
+            days = days[:MAX_CALENDAR_DAYS]
+    else:
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    
+    for day in days:
+        day_tasks = calendar.get(day, [])
+        label = day.strftime('%A, %d %B %Y')
+        if day_tasks:
+            label += f" ({len(day_tasks)} tugas)"
+        with st.expander(label):
+            if day_tasks:
+                st.markdown(format_task_lines(day_tasks, today))
             else:
                 st.write("Tidak ada tugas untuk hari ini.")
 
 
+@timed("view.show_statistics")
 def show_statistics():
     """Display basic task statistics"""
+    # Plotting libraries are only loaded by the pages that draw charts
+    import plotly.express as px
+    
     st.header("📊 Statistik")
     
     tab1, tab2 = st.tabs(["Statistik Dasar", "Analisis Lanjutan"])
     
     with tab1:
         st.subheader("Statistik Dasar")
-        tasks = st.session_state.task_manager.tasks
+        columns = st.session_state.task_manager.columns
         
-        if not tasks:
+        if not len(columns):
             st.info("Belum ada tugas yang tercatat.")
             return
         
+        
         # Priority distribution
-        priority_dist = Counter([t.prioritas for t in tasks])
+        known = columns.prioritas >= 0
+        priority_counts = np.bincount(columns.prioritas[known], minlength=len(PRIORITIES))
         st.plotly_chart(
             px.pie(
-                names=list(priority_dist.keys()),
-                values=list(priority_dist.values()),
+                names=[PRIORITIES[i] for i in np.flatnonzero(priority_counts)],
+                values=priority_counts[priority_counts > 0],
                 title='Distribusi Prioritas Tugas'
             ),
             use_container_width=True
         )
         
         # Completion rate
-        completion_rate = sum(t.selesai for t in tasks) / len(tasks)
+        completion_rate = columns.selesai.mean()
         st.metric("Tingkat Penyelesaian", f"{completion_rate*100:.1f}%")
     
     with tab2:
         st.subheader("Analisis Lanjutan")
-        tasks = st.session_state.task_manager.tasks
+        columns = st.session_state.task_manager.columns
         
-        if not tasks:
+        if not len(columns):
             st.info("Tidak ada data untuk dianalisis.")
             return
         
         # Deadline analysis
-        today = date.today()
-        deadline_days = [
-            (t.deadline - today).days 
-            for t in tasks 
-            if not t.selesai and t.deadline >= today
-        ]
+        today = date.today().toordinal()
+        upcoming = ~columns.selesai & (columns.deadline >= today)
+        deadline_days = columns.deadline[upcoming] - today
         
-        if deadline_days:
-            avg_days = sum(deadline_days)/len(deadline_days)
+        if len(deadline_days):
+            avg_days = deadline_days.mean()
             st.write(f"⏳ Rata-rata hari menuju deadline: {avg_days:.1f} hari")
             
             st.plotly_chart(
@@ -341,6 +564,7 @@ def show_statistics():
 
 
 # Recommendations view
+@timed("view.show_recommendations")
 def show_recommendations():
     st.header("⏰ Rekomendasi Manajemen Waktu")
     
@@ -350,10 +574,36 @@ def show_recommendations():
         st.info("Tidak ada tugas aktif untuk direkomendasikan.")
         return
     
-    active_tasks.sort(key=lambda x: (x.prioritas, x.deadline))
     total_time = sum(t.durasi_estimasi for t in active_tasks)
     st.metric("Total Estimasi Waktu untuk Semua Tugas", f"{total_time:.1f} jam")
     
+    if st.button("📅 Jadwalkan Semua Tugas", help="Susun jadwal jam kerja (09:00-17:00, Senin-Jumat) untuk semua tugas aktif"):
+        with st.spinner("Menyusun jadwal..."):
+            schedule = st.session_state.task_manager.schedule_active_tasks()
+        st.session_state.late_task_ids = schedule.late_ids
+        active_tasks = st.session_state.task_manager.get_active_tasks()
+        if schedule.late:
+            st.error(f"⚠️ {len(schedule.late)} tugas tidak dapat selesai sebelum deadline:")
+            for task in schedule.late[:20]:
+                st.write(f"- **{task.nama}** (deadline {task.deadline.strftime('%d %B %Y')}, "
+                         f"selesai paling cepat {schedule.finish(task.id).strftime('%d %B %Y %H:%M')})")
+            if len(schedule.late) > 20:
+                st.write(f"... dan {len(schedule.late) - 20} tugas lainnya")
+        else:
+            st.success("Semua tugas terjadwal sebelum deadline.")
+    late_task_ids = st.session_state.get("late_task_ids")
+    
+    if late_task_ids is None:
+        active_tasks.sort(key=lambda x: (x.prioritas, x.deadline))
+    else:
+        active_tasks.sort(key=lambda x: (x.waktu_rekomendasi or datetime.max, x.deadline))
+    
+    # One model pass for every active task, with the last trained model
+    st.session_state.trainer.refresh()
+    delay_risks = predict_task_delays(active_tasks, [], st.session_state.trainer.delay_model_path, retrain=False)
+    if st.session_state.trainer.busy:
+        st.caption("⏳ Model risiko sedang diperbarui di latar belakang.")
+    
     for i, task in enumerate(active_tasks, 1):
         with st.expander(f"{i}. {task.nama} (Prioritas: {task.prioritas})"):
             col1, col2 = st.columns(2)
@@ -368,34 +618,47 @@ def show_recommendations():
                 urgency = max(0, 10 - days_left) / 10
                 st.progress(urgency, text=f"🚦 Tingkat urgensi: {urgency*100:.0f}%")
                 
-                if days_left < task.durasi_estimasi / 8:
+                delay_prob = delay_risks.get(task.id, 0.0)
+                st.progress(delay_prob, text=f"🤖 Risiko keterlambatan (ML): {delay_prob*100:.0f}%")
+                
+                if late_task_ids is not None:
+                    if task.id in late_task_ids:
+                        st.warning("⚠️ Peringatan: Menurut jadwal, deadline tidak tercapai!")
+                elif days_left < task.durasi_estimasi / 8:
                     st.warning("⚠️ Peringatan: Deadline mungkin tidak tercapai!")
 
 
+@timed("view.show_productivity_analysis")
 def show_productivity_analysis():
     """Display advanced productivity analysis"""
+    import pandas as pd
+    import plotly.express as px
+    
     st.header("📈 Analisis Produktivitas")
     
     # Debug info
-    completed_tasks = [t for t in st.session_state.task_manager.tasks 
-                      if t.selesai and t.tanggal_selesai and t.durasi_aktual]
-    st.write(f"Jumlah task yang memenuhi syarat: {len(completed_tasks)}")
+    completed_count = st.session_state.task_manager.columns.stats.completed
+    st.write(f"Jumlah task yang memenuhi syarat: {completed_count}")
     
     # Add example data button for testing
     if st.button("Gunakan Data Contoh (Dev Only)"):
         st.session_state.productivity_data = {
             'hourly_productivity': {9: 2.5, 10: 1.8, 14: 3.2},
             'weekday_productivity': {0: 2.1, 1: 1.7, 4: 2.9},
-            'productivity_clusters': np.array([[1, 10, 2], [4, 14, 3]]),
-            'raw_data': pd.DataFrame()
+            'productivity_clusters': np.array([[1, 10, 2], [4, 14, 3]])
         }
         st.success("Data contoh berhasil dimuat!")
     
     if st.button("Analisis Pola Produktivitas"):
         with st.spinner("Sedang menganalisis..."):
             try:
+                # Clusters come from the last background refresh
+                st.session_state.trainer.refresh()
                 st.session_state.productivity_data = analyze_productivity_patterns(
-                    st.session_state.task_manager.tasks
+                    st.session_state.task_manager.tasks,
+                    columns=st.session_state.task_manager.columns,
+                    model_path=st.session_state.trainer.cluster_model_path,
+                    refresh_clusters=False
                 )
                 
                 if st.session_state.productivity_data is None:
@@ -466,6 +729,14 @@ def show_productivity_analysis():
         except Exception as e:
             st.error(f"Gagal menampilkan grafik: {str(e)}")
     
+    # Show priority productivity
+    if data.get('priority_productivity'):
+        st.subheader("Produktivitas per Prioritas")
+        st.dataframe(pd.DataFrame({
+            'Prioritas': list(data['priority_productivity'].keys()),
+            'Rata-rata Durasi (jam)': [round(v, 1) for v in data['priority_productivity'].values()]
+        }), hide_index=True)
+    
     # Show cluster analysis if available
     if data.get('productivity_clusters') is not None:
         st.subheader("Pola Produktivitas (Clustering)")
@@ -490,11 +761,132 @@ def show_productivity_analysis():
             st.error(f"Gagal menampilkan cluster: {str(e)}")
 
 
+@timed("view.show_import_export")
+def show_import_export():
+    """Bulk import and export of tasks as CSV or JSON Lines"""
+    st.header("🔄 Impor/Ekspor Tugas")
+    
+    tab1, tab2 = st.tabs(["Impor", "Ekspor"])
+    
+    with tab1:
+        uploaded = st.file_uploader("File tugas (CSV atau JSON Lines)", type=["csv", "jsonl"])
+        st.caption("Kolom mengikuti format tugas.csv. Tugas dengan ID yang sudah ada akan diperbarui.")
+        if uploaded is not None and st.button("Impor Tugas"):
+            fmt = "jsonl" if uploaded.name.lower().endswith(".jsonl") else "csv"
+            with st.spinner("Sedang mengimpor..."):
+                # Rows are parsed while reading, the upload is never decoded as a whole
+                stream = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+                try:
+                    stats = st.session_state.task_manager.import_tasks(stream, fmt)
+                except (UnicodeDecodeError, csv.Error) as e:
+                    st.error(f"File tidak dapat dibaca: {str(e)}")
+                    return
+            st.success(
+                f"{stats['added']} tugas ditambahkan, {stats['updated']} diperbarui, "
+                f"{stats['skipped']} dilewati."
+            )
+    
+    with tab2:
+        fmt = st.radio("Format", list(FORMATS), format_func=FORMATS.get, horizontal=True)
+        if st.button("Siapkan File Ekspor"):
+            buffer = io.StringIO()
+            count = st.session_state.task_manager.export_tasks(buffer, fmt)
+            st.session_state.export_file = (fmt, buffer.getvalue(), count)
+        
+        export_file = st.session_state.get("export_file")
+        if export_file and export_file[0] == fmt:
+            st.download_button(
+                f"Unduh {export_file[2]} tugas",
+                data=export_file[1],
+                file_name=f"tugas.{fmt}",
+                mime="text/csv" if fmt == "csv" else "application/jsonl"
+            )
+
+
+def session_memory() -> dict:
+    """Approximate bytes held by each session state entry, without the objects shared by all sessions"""
+    shared = {id(st.session_state.task_manager), id(st.session_state.trainer)}
+    return {key: deep_sizeof(value, shared) for key, value in st.session_state.to_dict().items()}
+
+
+def show_diagnostics():
+    """Display operation latencies, counters and memory usage for performance analysis"""
+    import pandas as pd
+    import plotly.express as px
+    
+    st.header("🩺 Diagnostik")
+    # Collection stays process-wide (TASK_MANAGER_METRICS), so one session cannot switch it off for the others
+    st.caption("Metrik dikumpulkan untuk seluruh proses, termasuk pelatihan model di latar belakang, "
+               "selama aplikasi dijalankan dengan TASK_MANAGER_METRICS=1.")
+    
+    if st.button("Reset Metrik"):
+        metrics.reset()
+    
+    snapshot = metrics.snapshot()
+    memory = {"process": process_memory(), "session": session_memory()}
+    st.download_button(
+        "Unduh JSON",
+        data=json.dumps({"metrics": snapshot, "memory": memory}, indent=2),
+        file_name="diagnostik.json",
+        mime="application/json"
+    )
+    
+    st.subheader("Latensi Operasi")
+    timers = snapshot["timers"]
+    if not timers:
+        st.info("Belum ada operasi yang tercatat.")
+    else:
+        st.dataframe(pd.DataFrame([
+            {
+                "Operasi": name,
+                "Jumlah": data["count"],
+                "Total (ms)": data["total"] * 1000,
+                "Rata-rata (ms)": data["mean"] * 1000,
+                "p50 (ms)": data["p50"] * 1000,
+                "p90 (ms)": data["p90"] * 1000,
+                "p99 (ms)": data["p99"] * 1000,
+                "Maks (ms)": data["max"] * 1000,
+            }
+            for name, data in timers.items()
+        ]).round(2), hide_index=True)
+        
+        name = st.selectbox("Histogram operasi", list(timers))
+        buckets = timers[name]["buckets"]
+        st.plotly_chart(px.bar(
+            x=[f"≤ {bound * 1000:g} ms" for bound, _ in buckets],
+            y=[count for _, count in buckets],
+            labels={"x": "Durasi", "y": "Jumlah"},
+            title=f"Distribusi Latensi: {name}"
+        ))
+    
+    if snapshot["counters"]:
+        st.subheader("Penghitung")
+        st.dataframe(pd.DataFrame(
+            list(snapshot["counters"].items()), columns=["Penghitung", "Nilai"]
+        ), hide_index=True)
+    
+    st.subheader("Penggunaan Memori")
+    col1, col2, col3 = st.columns(3)
+    process = memory["process"]
+    if process["rss"] is not None:
+        col1.metric("Memori proses (RSS)", f"{process['rss'] / 2**20:.1f} MB")
+    if process["peak_rss"] is not None:
+        col2.metric("Puncak RSS", f"{process['peak_rss'] / 2**20:.1f} MB")
+    col3.metric("State sesi ini", f"{sum(memory['session'].values()) / 2**10:.1f} KB")
+    st.dataframe(pd.DataFrame(
+        sorted(((key, size / 2**10) for key, size in memory["session"].items()), key=lambda item: -item[1]),
+        columns=["Kunci state", "Ukuran (KB)"]
+    ).round(1), hide_index=True)
+
+
 def main():
     """Main application function"""
     init_session_state()
     setup_page()
-    show_main_menu()
+    if WORKSPACES_DIR is not None:
+        select_workspace()
+    with use_workspace():
+        show_main_menu()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+from typing import Dict
+import numpy as np
+
+
+class RunningStats:
+    """Count, sum and sum of squares of a value per small integer key"""
+
+    def __init__(self, size: int):
+        self.count = np.zeros(size, dtype=np.int64)
+        self.sum = np.zeros(size, dtype=np.float64)
+        self.sumsq = np.zeros(size, dtype=np.float64)
+
+    def add(self, key: int, value: float, sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) one observation"""
+        self.count[key] += sign
+        self.sum[key] += sign * value
+        self.sumsq[key] += sign * value * value
+
+    def add_many(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """Add many observations at once"""
+        size = len(self.count)
+        self.count += np.bincount(keys, minlength=size)
+        self.sum += np.bincount(keys, weights=values, minlength=size)
+        self.sumsq += np.bincount(keys, weights=values * values, minlength=size)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Add all observations of other, e.g. the statistics of another partition"""
+        self.count += other.count
+        self.sum += other.sum
+        self.sumsq += other.sumsq
+
+    def copy(self) -> 'RunningStats':
+        stats = RunningStats(0)
+        stats.count, stats.sum, stats.sumsq = self.count.copy(), self.sum.copy(), self.sumsq.copy()
+        return stats
+
+    @property
+    def total(self) -> int:
+        return int(self.count.sum())
+
+    def means(self) -> Dict[int, float]:
+        """Mean value per key that has observations"""
+        present = np.flatnonzero(self.count)
+        return {int(k): float(self.sum[k] / self.count[k]) for k in present}
+
+    def stds(self) -> Dict[int, float]:
+        """Population standard deviation per key that has observations"""
+        present = np.flatnonzero(self.count)
+        means = self.sum[present] / self.count[present]
+        variances = np.maximum(self.sumsq[present] / self.count[present] - means ** 2, 0.0)
+        return {int(k): float(s) for k, s in zip(present, np.sqrt(variances))}
+
+
+class ProductivityStats:
+    """Running duration statistics of completed tasks per hour, weekday and priority.
+
+    Each completed task contributes its actual duration once to each group,
+    so adding, removing or editing a task costs O(1) and reading the
+    per-group means does not depend on the size of the history.
+    """
+
+    # Hour used for tasks without a recommended time
+    DEFAULT_HOUR = 12
+
+    def __init__(self, n_priorities: int):
+        self.hour = RunningStats(24)
+        self.weekday = RunningStats(7)
+        self.priority = RunningStats(n_priorities)
+
+    @classmethod
+    def from_arrays(cls, weekday: np.ndarray, hour: np.ndarray, prioritas: np.ndarray,
+                    duration: np.ndarray, n_priorities: int) -> 'ProductivityStats':
+        """Build the statistics for many completed tasks in one vectorized pass"""
+        stats = cls(n_priorities)
+        hour = hour.astype(np.int64)
+        stats.hour.add_many(np.where(hour >= 0, hour, cls.DEFAULT_HOUR), duration)
+        stats.weekday.add_many(weekday.astype(np.int64), duration)
+        known = prioritas >= 0
+        stats.priority.add_many(prioritas[known].astype(np.int64), duration[known])
+        return stats
+
+    def add(self, weekday: int, hour: int, prioritas: int, duration: float, sign: int = 1) -> None:
+        """Add (sign=1) or remove (sign=-1) one completed task"""
+        self.hour.add(hour if hour >= 0 else self.DEFAULT_HOUR, duration, sign)
+        self.weekday.add(weekday, duration, sign)
+        if prioritas >= 0:
+            self.priority.add(prioritas, duration, sign)
+
+    def merge(self, other: 'ProductivityStats') -> None:
+        """Add all completed tasks of other"""
+        self.hour.merge(other.hour)
+        self.weekday.merge(other.weekday)
+        self.priority.merge(other.priority)
+
+    def copy(self) -> 'ProductivityStats':
+        stats = ProductivityStats(0)
+        stats.hour, stats.weekday, stats.priority = self.hour.copy(), self.weekday.copy(), self.priority.copy()
+        return stats
+
+    @property
+    def completed(self) -> int:
+        """Number of completed tasks in the statistics"""
+        return self.weekday.total
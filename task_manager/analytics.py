@@ -1,92 +1,324 @@
+import hashlib
+import os
+import pickle
+import threading
 from datetime import datetime
-from collections import Counter
-import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from typing import Dict, Optional, List
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple
 from .models import Task
+from .columnar import TaskColumns, PRIORITIES, PRIORITY_CODES
+from .aggregates import ProductivityStats
+from .metrics import timed, timer
 
+# pandas and scikit-learn are imported by the functions that use them, so
+# importing this module does not slow down app startup
+if TYPE_CHECKING:
+    from sklearn.ensemble import RandomForestClassifier
 
-def analyze_productivity_patterns(tasks: List[Task]) -> Dict:
-    """Analyze user's productivity patterns with time series and clustering"""
-    completed_tasks = [t for t in tasks if t.selesai and t.tanggal_selesai and t.durasi_aktual]
+
+def _columns_for(tasks: List[Task], columns: Optional[TaskColumns]) -> TaskColumns:
+    """Use the given columnar view, or build one for a plain task list"""
+    return columns if columns is not None else TaskColumns.from_tasks(tasks)
+
+
+def _save_pickle(path: str, payload: Dict, what: str) -> None:
+    """Atomically persist a model payload, warning instead of failing"""
+    try:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: Could not persist {what} - {e}")
+
+
+CLUSTER_MODEL_PATH = "productivity_clusters.pkl"
+N_CLUSTERS = 3
+# Upper bound on the rows fed to the clustering in one refresh
+CLUSTER_BATCH = 10000
+
+# In-process cluster state: path -> {"seen": ID keys of the completed tasks fed so far, "model": ...}
+_cluster_cache: Dict[str, Dict] = {}
+_cluster_lock = threading.Lock()
+
+
+def _cluster_features(columns: TaskColumns, rows: np.ndarray) -> np.ndarray:
+    """(weekday, hour, duration) of the given rows"""
+    hours = columns.hour[rows].astype(np.int64)
+    return np.column_stack([
+        TaskColumns.weekday(columns.tanggal_selesai[rows]),
+        np.where(hours >= 0, hours, ProductivityStats.DEFAULT_HOUR),
+        columns.durasi_aktual[rows]
+    ]).astype(np.float64)
+
+
+def _id_keys(ids: List[str]) -> np.ndarray:
+    """64-bit FNV-style keys of task IDs, equal in every process (unlike hash())"""
+    if not ids:
+        return np.empty(0, dtype=np.uint64)
+    raw = np.char.encode(np.array(ids), "utf-8")
+    width = -(-raw.dtype.itemsize // 8) * 8
+    words = raw.astype(f"S{width}").view(np.uint64).reshape(len(ids), -1)
+    keys = np.full(len(ids), 0xcbf29ce484222325, dtype=np.uint64)
+    for column in words.T:
+        keys = (keys ^ column) * np.uint64(0x100000001b3)
+    return keys
+
+
+def _load_cluster_state(model_path: str) -> Dict:
+    """Cluster state persisted by an earlier process, or an empty one"""
+    if os.path.exists(model_path):
+        try:
+            with open(model_path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable cluster model - {e}")
+    return {"seen": None, "model": None}
+
+
+def update_productivity_clusters(columns: TaskColumns,
+                                 model_path: str = CLUSTER_MODEL_PATH) -> Optional[np.ndarray]:
+    """Cluster centers of (weekday, hour, duration), refreshed with newly completed tasks only.
+
+    The first call fits MiniBatchKMeans on at most CLUSTER_BATCH completed
+    tasks. Later calls partial_fit the tasks completed since then, taken
+    by most recent completion date, so the model work is proportional
+    to the new data. Completed tasks are recognized by a 64-bit key of
+    their ID, so a deletion cannot hide a completion the way a count
+    would. Only the centroids and the keys are kept and persisted;
+    deleted tasks are not unlearned.
+    """
+    from sklearn.cluster import MiniBatchKMeans
     
-    if not completed_tasks:
-        return None
+    with _cluster_lock:
+        state = _cluster_cache.get(model_path)
+        if state is None:
+            state = _cluster_cache[model_path] = _load_cluster_state(model_path)
         
-    # Time Series Analysis
-    df = pd.DataFrame({
-        'date': [t.tanggal_selesai for t in completed_tasks],
-        'duration': [t.durasi_aktual for t in completed_tasks],
-        'weekday': [t.tanggal_selesai.weekday() for t in completed_tasks],
-        'hour': [t.waktu_rekomendasi.hour if t.waktu_rekomendasi else 12 for t in completed_tasks]
-    })
-    
-    # Productivity by time of day
-    hourly_productivity = df.groupby('hour')['duration'].mean()
-    
-    # Weekly patterns
-    weekday_productivity = df.groupby('weekday')['duration'].mean()
-    
-    # Clustering user behavior
-    X = df[['weekday', 'hour', 'duration']].dropna()
-    if len(X) >= 3:  # Minimum samples for clustering
-        kmeans = KMeans(n_clusters=min(3, len(X)), random_state=42)
-        clusters = kmeans.fit_predict(X)
-        df.loc[X.index, 'cluster'] = clusters
-        cluster_centers = kmeans.cluster_centers_
+        rows = np.flatnonzero(columns.completed_mask())
+        model = state["model"]
+        if model is None and len(rows) < N_CLUSTERS:  # Minimum samples for clustering
+            return None
+        ids = columns.ids
+        keys = _id_keys([ids[row] for row in rows.tolist()])
+        seen = state["seen"]
+        if model is not None and not isinstance(seen, np.ndarray):
+            seen = keys  # Model file from before keys were kept: count every current task as fed
+        if model is not None:
+            rows = rows[~np.isin(keys, seen)]
+        new = min(len(rows), CLUSTER_BATCH)
+        if new > 0:
+            if model is None:
+                rows = np.random.default_rng(42).choice(rows, new, replace=False)
+                model = MiniBatchKMeans(n_clusters=N_CLUSTERS, random_state=42, n_init=3)
+                with timer("clusters.fit"):
+                    model.fit(_cluster_features(columns, rows))
+            else:
+                if new < len(rows):
+                    rows = rows[np.argpartition(-columns.tanggal_selesai[rows], new - 1)[:new]]
+                with timer("clusters.partial_fit"):
+                    model.partial_fit(_cluster_features(columns, rows))
+            state["model"] = model
+            _save_pickle(model_path, {"seen": keys, "model": model}, "cluster model")
+        state["seen"] = keys
+        return model.cluster_centers_.copy() if model is not None else None
+
+
+def latest_productivity_clusters(model_path: str = CLUSTER_MODEL_PATH) -> Optional[np.ndarray]:
+    """Centers of the last fitted clustering, without fitting anything"""
+    state = _cluster_cache.get(model_path) or _load_cluster_state(model_path)
+    model = state["model"]
+    return model.cluster_centers_.copy() if model is not None else None
+
+
+def analyze_productivity_patterns(tasks: List[Task], columns: Optional[TaskColumns] = None,
+                                  model_path: str = CLUSTER_MODEL_PATH, refresh_clusters: bool = True) -> Dict:
+    """Analyze user's productivity patterns from running aggregates and incremental clustering.
+
+    With refresh_clusters=False the last fitted clusters are returned as they
+    are, for callers that leave the refresh to a background ModelTrainer.
+    """
+    columns = _columns_for(tasks, columns)
+    stats = columns.stats
+    
+    if not stats.completed:
+        return None
+    
+    # Productivity by time of day, weekday and priority from the running aggregates
+    hourly_productivity = stats.hour.means()
+    weekday_productivity = stats.weekday.means()
+    priority_productivity = {PRIORITIES[k]: mean for k, mean in stats.priority.means().items()}
+    
+    # Clustering user behavior; the result stays small regardless of history size
+    if refresh_clusters:
+        cluster_centers = update_productivity_clusters(columns, model_path)
     else:
-        cluster_centers = None
+        cluster_centers = latest_productivity_clusters(model_path)
     
     return {
-        'hourly_productivity': hourly_productivity.to_dict(),
-        'weekday_productivity': weekday_productivity.to_dict(),
-        'productivity_clusters': cluster_centers,
-        'raw_data': df
+        'hourly_productivity': hourly_productivity,
+        'weekday_productivity': weekday_productivity,
+        'priority_productivity': priority_productivity,
+        'productivity_clusters': cluster_centers
     }
 
 
-def predict_task_delay(task: Task, tasks: List[Task]) -> float:
-    """Predict probability of task delay using machine learning"""
-    completed_tasks = [t for t in tasks if t.selesai and t.durasi_aktual and t.tanggal_selesai]
+DELAY_MODEL_PATH = "delay_model.pkl"
+
+# In-process cache shared by all Streamlit reruns: path -> (data version, model)
+_delay_model_cache: Dict[str, Tuple[str, Optional['RandomForestClassifier']]] = {}
+
+
+def _delay_features(task: Task) -> List:
+    """Feature vector for predicting delay of a (not yet completed) task"""
+    return [
+        task.durasi_estimasi,
+        task.durasi_estimasi,  # Using estimate since actual not available
+        (task.deadline - datetime.now().date()).days,
+        task.prioritas == "Tinggi",
+        task.prioritas == "Sedang"
+    ]
+
+
+def delay_feature_matrix(tasks: List[Task]) -> np.ndarray:
+    """Rows of _delay_features for many tasks, built column by column"""
+    today = datetime.now().date().toordinal()
+    estimates = np.fromiter((t.durasi_estimasi for t in tasks), dtype=np.float64, count=len(tasks))
+    deadlines = np.fromiter((t.deadline.toordinal() for t in tasks), dtype=np.int64, count=len(tasks))
+    priorities = np.array([t.prioritas for t in tasks])
     
-    if len(completed_tasks) < 5:  # Minimum number of completed tasks needed
-        return 0.0  # Default to no delay if not enough data
-        
-    # Prepare features and target
-    X = []
-    y = []
-    
-    for t in completed_tasks:
-        days_to_deadline = (t.deadline - t.tanggal_selesai).days
-        was_delayed = 1 if days_to_deadline < 0 else 0
-        X.append([
-            t.durasi_estimasi,
-            t.durasi_aktual,
-            days_to_deadline,
-            t.prioritas == "Tinggi",
-            t.prioritas == "Sedang"
-        ])
-        y.append(was_delayed)
+    return np.column_stack([
+        estimates,
+        estimates,  # Using estimate since actual not available
+        deadlines - today,
+        priorities == "Tinggi",
+        priorities == "Sedang"
+    ])
+
+
+def _delay_training_data(columns: TaskColumns) -> Tuple[np.ndarray, np.ndarray]:
+    """Build features and delay labels from completed tasks"""
+    mask = columns.completed_mask()
+    days_to_deadline = columns.deadline[mask] - columns.tanggal_selesai[mask]
+    prioritas = columns.prioritas[mask]
+    
+    X = np.column_stack([
+        columns.durasi_estimasi[mask],
+        columns.durasi_aktual[mask],
+        days_to_deadline,
+        prioritas == PRIORITY_CODES["Tinggi"],
+        prioritas == PRIORITY_CODES["Sedang"]
+    ]).astype(np.float64)
+    y = (days_to_deadline < 0).astype(np.int8)
+    return X, y
+
+
+def _data_version(X: np.ndarray, y: np.ndarray) -> str:
+    """Version key of the training data: sample count plus content hash"""
+    digest = hashlib.sha1(np.ascontiguousarray(X).tobytes())
+    digest.update(y.tobytes())
+    return f"{len(y)}-{digest.hexdigest()}"
+
+
+def _load_delay_model(model_path: str) -> Optional[Tuple[str, Optional['RandomForestClassifier']]]:
+    """(version, model) persisted by an earlier process, if readable"""
+    if not os.path.exists(model_path):
+        return None
+    try:
+        with open(model_path, "rb") as f:
+            stored = pickle.load(f)
+        return stored["version"], stored["model"]
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable delay model - {e}")
+        return None
+
+
+def get_delay_model(tasks: List[Task], model_path: str = DELAY_MODEL_PATH,
+                    columns: Optional[TaskColumns] = None,
+                    retrain: bool = True) -> Optional['RandomForestClassifier']:
+    """Return the delay model for the current data, retraining only when it changed.
+
+    With retrain=False the last good model is returned without looking at
+    the data, so the call costs the same however many tasks there are.
+    """
+    if not retrain:
+        cached = _delay_model_cache.get(model_path)
+        if cached is None:
+            cached = _load_delay_model(model_path)
+            if cached is None:
+                return None
+            _delay_model_cache[model_path] = cached
+        return cached[1]
+    
+    X, y = _delay_training_data(_columns_for(tasks, columns))
+    
+    if len(y) < 5:  # Minimum number of completed tasks needed
+        return None
+    
+    version = _data_version(X, y)
+    
+    cached = _delay_model_cache.get(model_path)
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    # Reuse the model persisted by an earlier process if the data is unchanged
+    stored = _load_delay_model(model_path)
+    if stored is not None and stored[0] == version:
+        _delay_model_cache[model_path] = stored
+        return stored[1]
+    
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import train_test_split
     
     try:
         # Train model
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         model = RandomForestClassifier(n_estimators=100, random_state=42)
-        model.fit(X_train, y_train)
-        
-        # Predict for current task
-        task_features = [
-            task.durasi_estimasi,
-            task.durasi_estimasi,  # Using estimate since actual not available
-            (task.deadline - datetime.now().date()).days,
-            task.prioritas == "Tinggi",
-            task.prioritas == "Sedang"
-        ]
-        
-        proba = model.predict_proba([task_features])
-        return proba[0][1] if proba.shape[1] > 1 else 0.0  # Return probability of delay or 0 if model can't predict
+        with timer("delay_model.train"):
+            model.fit(X_train, y_train)
+    except Exception:
+        model = None
+    
+    _delay_model_cache[model_path] = (version, model)
+    _save_pickle(model_path, {"version": version, "model": model}, "delay model")
+    return model
+
+
+def forget_models(*model_paths: str) -> None:
+    """Drop the in-process cache of delay and cluster models stored at model_paths"""
+    with _cluster_lock:
+        for path in model_paths:
+            _cluster_cache.pop(path, None)
+            _delay_model_cache.pop(path, None)
+
+
+def predict_task_delay(task: Task, tasks: List[Task], model_path: str = DELAY_MODEL_PATH,
+                       columns: Optional[TaskColumns] = None, retrain: bool = True) -> float:
+    """Predict probability of task delay using machine learning"""
+    model = get_delay_model(tasks, model_path, columns, retrain)
+    if model is None:
+        return 0.0  # Default to no delay if not enough data or training failed
+    
+    try:
+        proba = model.predict_proba([_delay_features(task)])
+        return float(proba[0][1]) if proba.shape[1] > 1 else 0.0  # Return probability of delay or 0 if model can't predict
     except Exception:
         return 0.0  # Return 0 if any error occurs
+
+
+@timed("delay_model.predict")
+def predict_task_delays(new_tasks: List[Task], tasks: List[Task], model_path: str = DELAY_MODEL_PATH,
+                        columns: Optional[TaskColumns] = None, retrain: bool = True) -> Dict[str, float]:
+    """Predict delay probability for many tasks in one model pass, keyed by task ID"""
+    if not new_tasks:
+        return {}
+    
+    model = get_delay_model(tasks, model_path, columns, retrain)
+    if model is None or len(model.classes_) < 2:
+        return {t.id: 0.0 for t in new_tasks}
+    
+    try:
+        proba = model.predict_proba(delay_feature_matrix(new_tasks))[:, 1]
+    except Exception:
+        return {t.id: 0.0 for t in new_tasks}
+    return {t.id: float(p) for t, p in zip(new_tasks, proba)}
@@ -0,0 +1,393 @@
+import argparse
+import asyncio
+import functools
+import json
+import math
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from .models import TaskManager, CompactTask, Task, TASK_ORDERS
+from .columnar import PRIORITIES
+from .storage import JournalStorage, SQLiteStorage
+from .shared import SharedTaskManager
+from .training import ModelTrainer
+from .analytics import DELAY_MODEL_PATH, predict_task_delay, predict_task_delays
+
+
+# Largest accepted request body, and largest page of tasks per response
+MAX_BODY = 1 << 20
+MAX_LIMIT = 500
+
+
+class ApiError(Exception):
+    """Request error reported to the client as {"error": message} with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _parse_date(value: Optional[str], field: str) -> Optional[date]:
+    if value is None or value == "":
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ApiError(400, f"Format tanggal salah pada {field}, gunakan YYYY-MM-DD")
+
+
+def _parse_bool(value: Optional[str], field: str) -> Optional[bool]:
+    if value is None or value == "":
+        return None
+    if value.lower() in ("true", "1"):
+        return True
+    if value.lower() in ("false", "0"):
+        return False
+    raise ApiError(400, f"Nilai {field} harus true atau false")
+
+
+def _parse_int(value: Optional[str], field: str, default: int, low: int = 0, high: Optional[int] = None) -> int:
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ApiError(400, f"Nilai {field} harus bilangan bulat")
+    if number < low or (high is not None and number > high):
+        raise ApiError(400, f"Nilai {field} di luar batas")
+    return number
+
+
+def _parse_priorities(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    priorities = value.split(",")
+    unknown = [p for p in priorities if p not in PRIORITIES]
+    if unknown:
+        raise ApiError(400, f"Prioritas tidak dikenal: {', '.join(unknown)}")
+    return priorities
+
+
+def _text(body: Dict, field: str, required: bool = True) -> Optional[str]:
+    value = body.get(field)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or (required and not value.strip()):
+        raise ApiError(400, f"{field} wajib diisi")
+    return value
+
+
+def _task_json(task: Task) -> Dict:
+    """A task in the JSON Lines export format"""
+    return task.to_dict()
+
+
+class TaskAPI:
+    """HTTP JSON API over a SharedTaskManager, served by one asyncio event loop.
+
+    The loop only parses requests and writes responses. Every manager call
+    runs on a thread pool, because the shared manager's lock may make it
+    wait behind a writer. Model work (delay risk and scheduling every
+    active task) runs on a separate, smaller pool, so slow requests cannot
+    use up the threads that quick reads need. Models are trained in the
+    background by a ModelTrainer, as in the app. Connections are kept
+    alive, so a client can send many requests over one socket.
+    """
+
+    ROUTES = [
+        ("GET", r"/health", "health"),
+        ("GET", r"/tasks", "list_tasks"),
+        ("POST", r"/tasks", "create_task"),
+        ("GET", r"/tasks/(?P<task_id>[^/]+)", "get_task"),
+        ("PATCH", r"/tasks/(?P<task_id>[^/]+)", "update_task"),
+        ("DELETE", r"/tasks/(?P<task_id>[^/]+)", "delete_task"),
+        ("POST", r"/tasks/(?P<task_id>[^/]+)/complete", "complete_task"),
+        ("GET", r"/tasks/(?P<task_id>[^/]+)/risk", "task_risk"),
+        ("GET", r"/calendar", "calendar"),
+        ("GET", r"/recommendations", "recommendations"),
+        ("POST", r"/recommendations/schedule", "schedule"),
+    ]
+
+    def __init__(self, manager: SharedTaskManager, trainer: Optional[ModelTrainer] = None,
+                 workers: int = 8, model_workers: int = 2):
+        self.manager = manager
+        self.trainer = trainer
+        # Predict with the model the trainer writes
+        self.delay_model_path = trainer.delay_model_path if trainer else DELAY_MODEL_PATH
+        self._routes = [(method, re.compile(f"{pattern}$"), name) for method, pattern, name in self.ROUTES]
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self._model_executor = ThreadPoolExecutor(max_workers=model_workers, thread_name_prefix="api-model")
+
+    async def _call(self, fn: Callable, *args, model: bool = False, **kwargs):
+        """Run a blocking manager or model call off the event loop"""
+        executor = self._model_executor if model else self._executor
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    def _refresh_models(self) -> None:
+        if self.trainer is not None:
+            self.trainer.refresh()
+
+    async def _task(self, task_id: str) -> Task:
+        task = await self._call(self.manager.get_task, task_id)
+        if task is None:
+            raise ApiError(404, "Tugas tidak ditemukan")
+        return task
+
+    async def dispatch(self, method: str, target: str, body: Optional[Dict]) -> Tuple[int, Dict]:
+        """Route a request to its handler and return (status, JSON payload)"""
+        url = urlsplit(target)
+        query = dict(parse_qsl(url.query))
+        allowed = False
+        for route_method, pattern, name in self._routes:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            allowed = True
+            if route_method == method:
+                return await getattr(self, name)(query, body or {}, **match.groupdict())
+        if allowed:
+            raise ApiError(405, "Metode tidak didukung")
+        raise ApiError(404, "Alamat tidak ditemukan")
+
+    async def health(self, query: Dict, body: Dict) -> Tuple[int, Dict]:
+        return 200, {"status": "ok", "version": self.manager.version,
+                     "models_busy": self.trainer.busy if self.trainer else False}
+
+    async def list_tasks(self, query: Dict, body: Dict) -> Tuple[int, Dict]:
+        """Filtered page of tasks in a TASK_ORDERS order, or the best matches of a search"""
+        selesai = _parse_bool(query.get("selesai"), "selesai")
+        prioritas = _parse_priorities(query.get("prioritas"))
+        offset = _parse_int(query.get("offset"), "offset", 0)
+        limit = _parse_int(query.get("limit"), "limit", 20, 1, MAX_LIMIT)
+        if query.get("q"):
+            results = await self._call(self.manager.search_tasks, query["q"], selesai, prioritas)
+            tasks, total = results[offset:offset + limit], len(results)
+        else:
+            order = query.get("order", "deadline")
+            if order not in TASK_ORDERS:
+                raise ApiError(400, f"Urutan tidak dikenal: {order}")
+            tasks, total = await self._call(self.manager.get_task_page, order, selesai, prioritas, offset, limit)
+        return 200, {"tasks": [_task_json(t) for t in tasks], "total": total, "offset": offset, "limit": limit}
+
+    async def create_task(self, query: Dict, body: Dict) -> Tuple[int, Dict]:
+        prioritas = _text(body, "prioritas")
+        if prioritas not in PRIORITIES:
+            raise ApiError(400, f"Prioritas tidak dikenal: {prioritas}")
+        deadline = _parse_date(_text(body, "deadline"), "deadline")
+        success, result = await self._call(
+            self.manager.add_task, _text(body, "nama"), _text(body, "deskripsi", False) or "",
+            prioritas, deadline.strftime("%Y-%m-%d")
+        )
+        if not success:
+            raise ApiError(400, result)
+        self._refresh_models()
+        return 201, {"task": _task_json(result)}
+
+    async def get_task(self, query: Dict, body: Dict, task_id: str) -> Tuple[int, Dict]:
+        return 200, {"task": _task_json(await self._task(task_id))}
+
+    async def update_task(self, query: Dict, body: Dict, task_id: str) -> Tuple[int, Dict]:
+        """Change any of nama, deskripsi, prioritas and deadline"""
+        task = await self._task(task_id)
+        prioritas = _text(body, "prioritas", False) or task.prioritas
+        if prioritas not in PRIORITIES:
+            raise ApiError(400, f"Prioritas tidak dikenal: {prioritas}")
+        fields = {
+            "nama": _text(body, "nama", False) or task.nama,
+            "deskripsi": (_text(body, "deskripsi", False) or "") if "deskripsi" in body else task.deskripsi,
+            "prioritas": prioritas,
+            "deadline": _parse_date(body.get("deadline"), "deadline") or task.deadline,
+        }
+        if not await self._call(self.manager.update_task, task, **fields):
+            raise ApiError(500, "Perubahan tidak dapat disimpan")
+        self._refresh_models()
+        return 200, {"task": _task_json(await self._task(task_id))}
+
+    async def complete_task(self, query: Dict, body: Dict, task_id: str) -> Tuple[int, Dict]:
+        task = await self._task(task_id)
+        durasi = body.get("durasi_aktual")
+        # json.loads accepts NaN and Infinity, which would pass the comparison below
+        number = isinstance(durasi, (int, float)) and not isinstance(durasi, bool) and math.isfinite(durasi)
+        if not number or durasi <= 0:
+            raise ApiError(400, "durasi_aktual harus angka lebih dari 0")
+        tanggal = _parse_date(body.get("tanggal_selesai"), "tanggal_selesai")
+        if not await self._call(self.manager.complete_task, task, tanggal_selesai=tanggal,
+                                durasi_aktual=float(durasi)):
+            raise ApiError(500, "Perubahan tidak dapat disimpan")
+        self._refresh_models()
+        return 200, {"task": _task_json(await self._task(task_id))}
+
+    async def delete_task(self, query: Dict, body: Dict, task_id: str) -> Tuple[int, Dict]:
+        if not await self._call(self.manager.delete_task, await self._task(task_id)):
+            raise ApiError(500, "Tugas tidak dapat dihapus")
+        self._refresh_models()
+        return 200, {"deleted": task_id}
+
+    async def task_risk(self, query: Dict, body: Dict, task_id: str) -> Tuple[int, Dict]:
+        """Delay risk of one task from the last trained model"""
+        task = await self._task(task_id)
+        self._refresh_models()
+        risk = await self._call(predict_task_delay, task, [], self.delay_model_path, retrain=False, model=True)
+        return 200, {"id": task_id, "risk": risk}
+
+    async def calendar(self, query: Dict, body: Dict) -> Tuple[int, Dict]:
+        """Tasks per deadline day from start to end (or for days days from start, today by default)"""
+        start = _parse_date(query.get("start"), "start") or datetime.now().date()
+        end = _parse_date(query.get("end"), "end")
+        if end is None:
+            end = start + timedelta(days=_parse_int(query.get("days"), "days", 7, 1, 366) - 1)
+        if end < start:
+            raise ApiError(400, "end harus setelah start")
+        active_only = bool(_parse_bool(query.get("active_only"), "active_only"))
+        tasks = await self._call(self.manager.get_tasks_in_range, start, end, active_only)
+        days: Dict[str, List[Dict]] = {}
+        for task in tasks:
+            days.setdefault(task.deadline.isoformat(), []).append(_task_json(task))
+        return 200, {"start": start.isoformat(), "end": end.isoformat(), "days": days}
+
+    async def recommendations(self, query: Dict, body: Dict) -> Tuple[int, Dict]:
+        """Active tasks in recommended order with their delay risk"""
+        limit = _parse_int(query.get("limit"), "limit", 50, 1, MAX_LIMIT)
+        active = await self._call(self.manager.get_active_tasks)
+        active.sort(key=lambda t: (t.waktu_rekomendasi or datetime.max, t.deadline))
+        self._refresh_models()
+        risks = await self._call(predict_task_delays, active[:limit], [], self.delay_model_path,
+                                 retrain=False, model=True)
+        return 200, {
+            "tasks": [dict(_task_json(t), Risiko=risks.get(t.id, 0.0)) for t in active[:limit]],
+            "total": len(active),
+            "models_busy": self.trainer.busy if self.trainer else False,
+        }
+
+    async def schedule(self, query: Dict, body: Dict) -> Tuple[int, Dict]:
+        """Reschedule every active task into working hours"""
+        schedule = await self._call(self.manager.schedule_active_tasks, model=True)
+        return 200, {"scheduled": len(schedule.blocks), "late": sorted(schedule.late_ids)}
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict, bytes]]:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ApiError(400, "Permintaan tidak valid")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "transfer-encoding" in headers:
+            raise ApiError(411, "Gunakan Content-Length, transfer bertahap tidak didukung")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise ApiError(400, "Content-Length tidak valid")
+        if length < 0:
+            raise ApiError(400, "Content-Length tidak valid")
+        if length > MAX_BODY:
+            raise ApiError(413, "Isi permintaan terlalu besar")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _respond(self, method: str, target: str, raw: bytes) -> Tuple[int, Dict]:
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            return 400, {"error": "Isi permintaan bukan JSON yang valid"}
+        if body is not None and not isinstance(body, dict):
+            return 400, {"error": "Isi permintaan harus objek JSON"}
+        try:
+            return await self.dispatch(method, target, body)
+        except ApiError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            print(f"Error handling {method} {target}: {e}")
+            return 500, {"error": "Terjadi kesalahan pada server"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection until the client closes it"""
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, raw = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = await self._respond(method, target, raw)
+                except ApiError as e:
+                    status, payload, keep_alive = e.status, {"error": e.message}, False
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._model_executor.shutdown(wait=True)
+        if self.trainer is not None:
+            self.trainer.shutdown()
+
+
+def open_shared_manager(path: str) -> SharedTaskManager:
+    """Shared manager over a CSV (with journal) or SQLite file, configured like the app"""
+    storage = SQLiteStorage(path) if os.path.splitext(path)[1] == ".db" else JournalStorage(path)
+    return SharedTaskManager(TaskManager(
+        storage=storage, task_class=CompactTask, lazy=True, snapshot=True, defer_estimates=True
+    ))
+
+
+async def _serve_forever(api: TaskAPI, host: str, port: int) -> None:
+    server = await api.serve(host, port)
+    print(f"Serving task API on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m task_manager.api", description="HTTP JSON API for tasks")
+    parser.add_argument("path", nargs="?", help="task file (default: tugas.db if it exists, else tugas.csv)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=8, help="threads for manager calls")
+    parser.add_argument("--model-workers", type=int, default=2, help="threads for model work")
+    args = parser.parse_args(argv)
+
+    path = args.path or ("tugas.db" if os.path.exists("tugas.db") else "tugas.csv")
+    manager = open_shared_manager(path)
+    api = TaskAPI(manager, ModelTrainer(manager), args.workers, args.model_workers)
+    try:
+        asyncio.run(_serve_forever(api, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    # Usage: python -m task_manager.api [tugas.csv] [--host 127.0.0.1] [--port 8080]
+    sys.exit(main())
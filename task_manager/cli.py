@@ -0,0 +1,261 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .models import TaskManager, CompactTask, Task, blend_duration
+from .scheduler import build_schedule
+from .storage import JournalStorage, SQLiteStorage
+from .recommendations import TimeOptimizer
+from .analytics import (
+    CLUSTER_MODEL_PATH, DELAY_MODEL_PATH, delay_feature_matrix, get_delay_model, update_productivity_clusters
+)
+
+
+JOBS = ("recommend", "delay", "clusters")
+# Active tasks per estimate job sent to a worker, and per similarity query inside it
+CHUNKSIZE = 1024
+QUERY_BATCH = 32
+# Delay risk at or above which a task counts as at risk in the report
+HIGH_RISK = 0.5
+TOP_RISKS = 20
+
+# Set in every worker process by _init_worker; inherited without copying where fork is available
+_worker: Dict = {}
+
+
+def _init_worker(optimizer: Optional[TimeOptimizer], columns) -> None:
+    _worker["optimizer"] = optimizer
+    _worker["columns"] = columns
+
+
+def _estimate_chunk(tasks: List[Task]) -> Tuple[List[float], float]:
+    """Duration estimates of active tasks from their most similar completed tasks, and the seconds taken"""
+    started = time.perf_counter()
+    optimizer = _worker["optimizer"]
+    estimates = []
+    for start in range(0, len(tasks), QUERY_BATCH):
+        batch = tasks[start:start + QUERY_BATCH]
+        for task, similar in zip(batch, optimizer.find_similar_tasks(batch)):
+            # Re-planned from the priority default, not from the previous estimate
+            estimates.append(blend_duration(
+                task._estimate_initial_duration(),
+                [t.durasi_aktual for t in similar if t.durasi_aktual is not None]
+            ))
+    return estimates, time.perf_counter() - started
+
+
+def _train_delay_model(model_path: str) -> bool:
+    return get_delay_model([], model_path, columns=_worker["columns"]) is not None
+
+
+def _predict_delays(model_path: str, X: np.ndarray) -> np.ndarray:
+    model = get_delay_model([], model_path, retrain=False)  # Loaded once per worker
+    if model is None or len(model.classes_) < 2:
+        return np.zeros(len(X))
+    return model.predict_proba(X)[:, 1]
+
+
+def _update_clusters(model_path: str) -> Optional[list]:
+    centers = update_productivity_clusters(_worker["columns"], model_path)
+    return centers.tolist() if centers is not None else None
+
+
+def open_manager(path: str) -> TaskManager:
+    """Fully loaded manager over a CSV (with journal) or SQLite file"""
+    if os.path.splitext(path)[1] == ".db":
+        return TaskManager(SQLiteStorage(path), task_class=CompactTask)
+    return TaskManager(JournalStorage(path), task_class=CompactTask)
+
+
+class BatchRun:
+    """One run of the batch jobs over a task file.
+
+    Work that does not depend on each other runs in a process pool: the
+    delay forest and the productivity clusters are trained by one worker
+    each while the others estimate durations of active tasks in chunks.
+    The estimates are then packed into working hours by build_schedule,
+    delay risks are predicted in chunks from the fresh estimates, and all
+    changed tasks are written back in one save.
+
+    The similarity queries dominate the run time, about linear in the
+    number of active tasks times the completed tasks sharing their words.
+    Chunks are sent earliest deadline first. With a budget, no new chunk
+    is sent once it could not finish in time (a sent chunk waits behind
+    at most one other per worker). The time the load took is held back,
+    because the final save needs about as much. Tasks that are not reached
+    keep their current estimate and are counted as skipped.
+    """
+
+    def __init__(self, path: str, jobs: List[str] = JOBS, workers: Optional[int] = None,
+                 budget: Optional[float] = None, delay_model_path: str = DELAY_MODEL_PATH,
+                 cluster_model_path: str = CLUSTER_MODEL_PATH):
+        self.path = path
+        self.jobs = jobs
+        self.workers = workers or os.cpu_count() or 1
+        self.budget = budget
+        self.delay_model_path = delay_model_path
+        self.cluster_model_path = cluster_model_path
+        self.timings: Dict[str, float] = {}
+        self.report: Dict = {"file": path, "jobs": list(jobs), "workers": self.workers}
+
+    def _phase(self, name: str, start: float) -> float:
+        now = time.perf_counter()
+        self.timings[name] = now - start
+        return now
+
+    def run(self) -> Dict:
+        started = time.perf_counter()
+        manager = open_manager(self.path)
+        active = manager.get_active_tasks()
+        columns = manager.columns
+        self.report.update(tasks=len(columns), active=len(active), completed=int(columns.stats.completed))
+        now = self._phase("load", started)
+        deadline = started + self.budget - self.timings["load"] if self.budget else None
+
+        optimizer = None
+        if "recommend" in self.jobs:
+            optimizer = TimeOptimizer(manager.get_valid_completed_tasks())
+            now = self._phase("index", now)
+
+        # Forked workers share the loaded tasks and index instead of unpickling copies
+        context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+        with ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(optimizer, columns)) as pool:
+            training = {}
+            if "delay" in self.jobs:
+                training["delay"] = pool.submit(_train_delay_model, self.delay_model_path)
+            if "clusters" in self.jobs:
+                training["clusters"] = pool.submit(_update_clusters, self.cluster_model_path)
+
+            if "recommend" in self.jobs:
+                self._recommend(manager, active, pool, deadline)
+                now = self._phase("recommend", now)
+
+            if "clusters" in self.jobs:
+                self.report["clusters"] = training["clusters"].result()
+            if "delay" in self.jobs:
+                self._delay_risks(active, training["delay"].result(), pool)
+            now = self._phase("models", now)
+
+        if "recommend" in self.jobs:
+            self._save(manager, active)
+            now = self._phase("save", now)
+        self.timings["total"] = now - started
+        self.report["timings"] = self.timings
+        return self.report
+
+    def _recommend(self, manager: TaskManager, active: List[Task], pool: ProcessPoolExecutor,
+                   deadline: Optional[float]) -> None:
+        """Re-estimate durations in the pool, then schedule every active task"""
+        ordered = sorted(active, key=lambda task: task.deadline)
+        chunks = [ordered[i:i + CHUNKSIZE] for i in range(0, len(ordered), CHUNKSIZE)]
+        running: Dict[Future, List[Task]] = {}
+        next_chunk, estimated, chunk_seconds = 0, 0, []
+        while next_chunk < len(chunks) or running:
+            # Keep every worker busy with one chunk queued behind it
+            while next_chunk < len(chunks) and len(running) < 2 * self.workers:
+                if deadline and chunk_seconds and time.perf_counter() + 2 * np.mean(chunk_seconds) > deadline:
+                    break
+                running[pool.submit(_estimate_chunk, chunks[next_chunk])] = chunks[next_chunk]
+                next_chunk += 1
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = running.pop(future)
+                estimates, seconds = future.result()
+                for task, estimate in zip(chunk, estimates):
+                    task.durasi_estimasi = estimate
+                estimated += len(chunk)
+                chunk_seconds.append(seconds)
+
+        # Same packing as "Jadwalkan Semua Tugas", without its per-call write
+        schedule = build_schedule(active)
+        for task in active:
+            task.waktu_rekomendasi = schedule.start(task.id)
+        self.report["recommend"] = {
+            "estimated": estimated,
+            "skipped": len(active) - estimated,
+            "late": len(schedule.late),
+        }
+
+    def _delay_risks(self, active: List[Task], trained: bool, pool: ProcessPoolExecutor) -> None:
+        """Predict delay risks of the active tasks in chunks with the freshly trained forest"""
+        risks = np.zeros(len(active))
+        if trained and active:
+            X = delay_feature_matrix(active)
+            bounds = list(range(0, len(active), CHUNKSIZE * 16)) + [len(active)]
+            parts = pool.map(_predict_delays, [self.delay_model_path] * (len(bounds) - 1),
+                             [X[a:b] for a, b in zip(bounds, bounds[1:])])
+            risks = np.concatenate(list(parts))
+        top = np.argsort(-risks, kind="stable")[:TOP_RISKS]
+        self.report["delay"] = {
+            "trained": trained,
+            "at_risk": int((risks >= HIGH_RISK).sum()),
+            "mean_risk": float(risks.mean()) if len(risks) else 0.0,
+            "top": [
+                {
+                    "id": active[i].id,
+                    "nama": active[i].nama,
+                    "deadline": active[i].deadline.isoformat(),
+                    "risk": float(risks[i]),
+                }
+                for i in top.tolist()
+            ],
+        }
+
+    @staticmethod
+    def _save(manager: TaskManager, active: List[Task]) -> None:
+        """Write the new estimates and recommended times back in one storage write"""
+        if manager.storage.queryable:
+            with manager.bulk():
+                manager.update_tasks(active)
+        elif not manager.save_to_csv():
+            raise RuntimeError(f"Could not save {manager.storage.path}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m task_manager.cli",
+        description="Re-plan active tasks, predict delay risks and refresh productivity clusters without the UI"
+    )
+    parser.add_argument("path", help="task file: CSV (with its .journal) or SQLite .db")
+    parser.add_argument("--jobs", nargs="+", choices=JOBS, default=list(JOBS), help="jobs to run (default: all)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--budget", type=float, help="seconds after which no new estimate chunk is started")
+    parser.add_argument("--delay-model", default=DELAY_MODEL_PATH, help="delay model file (default: %(default)s)")
+    parser.add_argument("--cluster-model", default=CLUSTER_MODEL_PATH,
+                        help="productivity cluster file (default: %(default)s)")
+    parser.add_argument("--report", help="write the run report to this JSON file")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f"{args.path} does not exist")
+    run = BatchRun(args.path, args.jobs, args.workers, args.budget, args.delay_model, args.cluster_model)
+    report = run.run()
+    report["finished"] = datetime.now().isoformat(timespec="seconds")
+
+    print(f"{report['tasks']} tasks, {report['active']} active, {report['completed']} completed")
+    if "recommend" in report:
+        r = report["recommend"]
+        print(f"Re-planned {r['estimated']} active tasks ({r['skipped']} skipped, {r['late']} late)")
+    if "delay" in report:
+        print(f"{report['delay']['at_risk']} active tasks at risk of delay")
+    if "clusters" in report:
+        print(f"Productivity clusters: {'updated' if report['clusters'] is not None else 'not enough data'}")
+    print(", ".join(f"{name} {seconds:.1f}s" for name, seconds in report["timings"].items()))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    # Usage: python -m task_manager.cli tugas.csv [--jobs ...] [--workers N] [--budget SECONDS] [--report hasil.json]
+    sys.exit(main())
@@ -0,0 +1,196 @@
+from datetime import date
+from typing import List, Dict, Optional
+import numpy as np
+from .aggregates import ProductivityStats
+
+
+PRIORITIES = ("Tinggi", "Sedang", "Rendah")
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITIES)}
+
+# Ordinal of 1970-01-01, for converting date ordinals to datetime64[D]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+class TaskColumns:
+    """Columnar NumPy view of a task set for analytics and statistics.
+
+    Each task occupies one row across typed arrays: dates as proleptic
+    ordinals (0 when empty), durations as float64 (NaN when empty), status
+    as bool and priority as an int8 code into ``PRIORITIES`` (-1 for
+    unknown values). Rows are appended into over-allocated buffers and
+    removed by moving the last row into the gap, so every mutation is O(1).
+    Accessors return zero-copy slices of the live rows. Productivity
+    statistics of the completed rows are built on first use of ``stats``
+    and then kept up to date by every mutation.
+    """
+
+    _COLUMNS = {
+        "deadline": np.int32,
+        "tanggal_selesai": np.int32,
+        "durasi_estimasi": np.float64,
+        "durasi_aktual": np.float64,
+        "selesai": np.bool_,
+        "prioritas": np.int8,
+        "hour": np.int8,
+    }
+
+    def __init__(self, capacity: int = 64):
+        self._size = 0
+        self._ids: Optional[List[str]] = []
+        self._rows: Optional[Dict[str, int]] = {}
+        self._id_source: Optional[np.ndarray] = None
+        self._stats: Optional[ProductivityStats] = None
+        self._data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self._COLUMNS.items()}
+
+    @classmethod
+    def from_tasks(cls, tasks: List) -> 'TaskColumns':
+        """Build columns for a list of tasks"""
+        columns = cls(capacity=max(64, len(tasks)))
+        for task in tasks:
+            columns.add(task)
+        return columns
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], ids: np.ndarray) -> 'TaskColumns':
+        """Build columns from existing arrays; the ID index is decoded on first mutation"""
+        columns = cls(capacity=0)
+        columns._size = len(ids)
+        columns._data = {
+            name: np.array(arrays[name], dtype=dtype)
+            for name, dtype in cls._COLUMNS.items()
+        }
+        columns._ids = None
+        columns._rows = None
+        columns._id_source = ids
+        return columns
+
+    def copy(self) -> 'TaskColumns':
+        """Independent copy holding only the live rows"""
+        columns = TaskColumns(capacity=0)
+        columns._size = self._size
+        columns._data = {name: array[:self._size].copy() for name, array in self._data.items()}
+        if self._ids is None:
+            columns._ids = None
+            columns._rows = None
+            columns._id_source = self._id_source
+        else:
+            columns._ids = list(self._ids)
+            columns._rows = dict(self._rows)
+        columns._stats = self._stats.copy() if self._stats is not None else None
+        return columns
+
+    def _ensure_index(self) -> None:
+        """Decode the ID index of columns created with from_arrays"""
+        if self._ids is None:
+            ids = np.asarray(self._id_source[:self._size])
+            # Snapshot IDs are UTF-8 bytes
+            self._ids = [i.decode("utf-8") for i in ids.tolist()] if ids.dtype.kind == "S" else ids.astype(str).tolist()
+            self._rows = {task_id: row for row, task_id in enumerate(self._ids)}
+            self._id_source = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        """Double the capacity of every column"""
+        for name, array in self._data.items():
+            grown = np.zeros(max(64, len(array) * 2), dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._data[name] = grown
+
+    def _write(self, row: int, task) -> None:
+        """Store task fields in the given row"""
+        self._data["deadline"][row] = task.deadline.toordinal()
+        self._data["tanggal_selesai"][row] = task.tanggal_selesai.toordinal() if task.tanggal_selesai else 0
+        self._data["durasi_estimasi"][row] = task.durasi_estimasi
+        self._data["durasi_aktual"][row] = task.durasi_aktual if task.durasi_aktual is not None else np.nan
+        self._data["selesai"][row] = task.selesai
+        self._data["prioritas"][row] = PRIORITY_CODES.get(task.prioritas, -1)
+        self._data["hour"][row] = task.waktu_rekomendasi.hour if task.waktu_rekomendasi else -1
+
+    def add(self, task) -> None:
+        """Append a task (or refresh it if already present)"""
+        self._ensure_index()
+        if task.id in self._rows:
+            self.update(task)
+            return
+        if self._size == len(self._data["deadline"]):
+            self._grow()
+        self._rows[task.id] = self._size
+        self._ids.append(task.id)
+        self._write(self._size, task)
+        self._count_row(self._size, 1)
+        self._size += 1
+
+    def update(self, task) -> None:
+        """Refresh the row of a changed task"""
+        self._ensure_index()
+        row = self._rows.get(task.id)
+        if row is None:
+            self.add(task)
+        else:
+            self._count_row(row, -1)
+            self._write(row, task)
+            self._count_row(row, 1)
+
+    def remove(self, task_id: str) -> None:
+        """Remove a task by moving the last row into its place"""
+        self._ensure_index()
+        row = self._rows.pop(task_id, None)
+        if row is None:
+            return
+        self._count_row(row, -1)
+        last = self._size - 1
+        last_id = self._ids.pop()
+        if row != last:
+            for array in self._data.values():
+                array[row] = array[last]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+        self._size = last
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        data = self.__dict__.get("_data")
+        if data is not None and name in data:
+            return data[name][:self._size]
+        raise AttributeError(name)
+
+    @property
+    def ids(self) -> List[str]:
+        """Task IDs in row order"""
+        self._ensure_index()
+        return self._ids
+
+    @staticmethod
+    def weekday(ordinals: np.ndarray) -> np.ndarray:
+        """Weekday (Monday=0) of date ordinals"""
+        return (ordinals - 1) % 7
+
+    def completed_mask(self) -> np.ndarray:
+        """Rows of completed tasks with completion date and non-zero actual duration"""
+        aktual = self.durasi_aktual
+        return self.selesai & (self.tanggal_selesai > 0) & ~np.isnan(aktual) & (aktual != 0)
+
+    @property
+    def stats(self) -> ProductivityStats:
+        """Running productivity statistics of the rows in completed_mask()"""
+        if self._stats is None:
+            mask = self.completed_mask()
+            self._stats = ProductivityStats.from_arrays(
+                self.weekday(self.tanggal_selesai[mask]), self.hour[mask],
+                self.prioritas[mask], self.durasi_aktual[mask], len(PRIORITIES)
+            )
+        return self._stats
+
+    def _count_row(self, row: int, sign: int) -> None:
+        """Add a row to (or remove it from) the statistics if it is a completed task"""
+        if self._stats is None:
+            return
+        data = self._data
+        aktual = data["durasi_aktual"][row]
+        completion = int(data["tanggal_selesai"][row])
+        if not (data["selesai"][row] and completion > 0 and aktual == aktual and aktual != 0):
+            return
+        self._stats.add(
+            (completion - 1) % 7, int(data["hour"][row]), int(data["prioritas"][row]), float(aktual), sign
+        )
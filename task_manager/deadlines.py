@@ -0,0 +1,63 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import List, Dict, Optional
+import numpy as np
+
+
+class DeadlineIndex:
+    """Task IDs sorted by deadline, answering date-range queries in O(log n + k).
+
+    Deadlines are kept as date ordinals in a sorted list with the task IDs
+    in a parallel list. Both ends of a range are found with bisect, and
+    additions and removals locate their position the same way, so keeping
+    the index current costs one bisect plus a list insert or delete.
+    """
+
+    def __init__(self):
+        self._ordinals: List[int] = []
+        self._ids: List[str] = []
+        self._keys: Dict[str, int] = {}
+
+    @classmethod
+    def from_arrays(cls, ordinals: np.ndarray, ids: List[str]) -> 'DeadlineIndex':
+        """Build the index for many tasks with one sort"""
+        index = cls()
+        order = np.argsort(ordinals, kind="stable")
+        index._ordinals = ordinals[order].tolist()
+        index._ids = [ids[i] for i in order.tolist()]
+        index._keys = dict(zip(index._ids, index._ordinals))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._keys
+
+    def add(self, task_id: str, deadline: date) -> None:
+        """Insert a task, or move it if its deadline changed"""
+        ordinal = deadline.toordinal()
+        if self._keys.get(task_id) == ordinal:
+            return
+        self.remove(task_id)
+        position = bisect_right(self._ordinals, ordinal)
+        self._ordinals.insert(position, ordinal)
+        self._ids.insert(position, task_id)
+        self._keys[task_id] = ordinal
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task (no-op if it is not indexed)"""
+        ordinal = self._keys.pop(task_id, None)
+        if ordinal is None:
+            return
+        lo = bisect_left(self._ordinals, ordinal)
+        hi = bisect_right(self._ordinals, ordinal, lo)
+        position = self._ids.index(task_id, lo, hi)
+        del self._ordinals[position]
+        del self._ids[position]
+
+    def range(self, start: Optional[date] = None, end: Optional[date] = None) -> List[str]:
+        """IDs of tasks with start <= deadline <= end in deadline order; None leaves a side open"""
+        lo = bisect_left(self._ordinals, start.toordinal()) if start is not None else 0
+        hi = bisect_right(self._ordinals, end.toordinal()) if end is not None else len(self._ordinals)
+        return self._ids[lo:hi]
@@ -0,0 +1,145 @@
+import os
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Dict, Iterator, Optional
+import numpy as np
+
+# pandas is imported on the first load, not when the storage modules are imported
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+DEFAULT_CHUNKSIZE = 10000
+
+
+def _column(df: 'pd.DataFrame', name: str) -> 'pd.Series':
+    """Stripped string column, empty when the column is missing"""
+    import pandas as pd
+    if name not in df:
+        return pd.Series("", index=df.index)
+    return df[name].str.strip()
+
+
+def _parse_dates(series: 'pd.Series', fmt: str, unit: str) -> List:
+    """Parse a whole column at once; invalid or empty values become None"""
+    import pandas as pd
+    parsed = pd.to_datetime(series, format=fmt, errors="coerce")
+    values = parsed.to_numpy(dtype=f"datetime64[{unit}]").astype(object)
+    # pandas only holds 1677-2262: parse the rest of the non-empty values like Task.from_dict
+    for i in np.flatnonzero((parsed.isna() & (series != "")).to_numpy()).tolist():
+        try:
+            value = datetime.strptime(series.iat[i], fmt)
+            values[i] = value.date() if unit == "D" else value
+        except ValueError:
+            pass
+    # Share one object per distinct value, like interned strings
+    cache: Dict = {}
+    return [cache.setdefault(v, v) if v is not None else None for v in values]
+
+
+def _parse_floats(series: 'pd.Series', defaults: np.ndarray) -> np.ndarray:
+    """Parse a whole column at once like float(); empty or invalid values take the default"""
+    import pandas as pd
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+    failed = np.isnan(values)
+    values = np.where(failed, defaults, values)
+    # NaN from pandas is either a failed parse or a literal "nan", which float() keeps
+    for i in np.flatnonzero(failed & (series != "").to_numpy()).tolist():
+        try:
+            values[i] = float(series.iat[i])
+        except ValueError:
+            pass
+    return values
+
+
+def _parse_chunk(df: 'pd.DataFrame', task_class: type, stats: Optional[Dict]) -> List:
+    """Build tasks from a chunk of raw CSV rows with Task.from_dict recovery semantics"""
+    df = df.fillna("")
+    n = len(df)
+    nama = _column(df, "Nama")
+    deskripsi = _column(df, "Deskripsi").tolist()
+    prioritas = _column(df, "Prioritas")
+    ids = _column(df, "ID").tolist()
+
+    deadlines = _parse_dates(_column(df, "Deadline"), "%Y-%m-%d", "D")
+    selesai = (_column(df, "Selesai").str.lower() == "true").to_numpy()
+    tanggal_selesai = _parse_dates(_column(df, "Tanggal_Selesai"), "%Y-%m-%d", "D")
+    has_tanggal = np.fromiter((d is not None for d in tanggal_selesai), dtype=bool, count=n)
+    # Completed without a valid completion date is auto-corrected to not completed
+    selesai &= has_tanggal
+
+    default_durations = prioritas.map(task_class.PRIORITY_DURATIONS).fillna(2.0).to_numpy()
+    durasi_aktual = _parse_floats(_column(df, "Durasi_Aktual"), default_durations)
+    durasi_estimasi = _parse_floats(_column(df, "Durasi_Estimasi"), default_durations)
+    waktu_rekomendasi = _parse_dates(_column(df, "Waktu_Rekomendasi"), "%Y-%m-%d %H:%M", "m")
+
+    # Rows that from_dict would send to its recovery path
+    recover = np.fromiter((d is None for d in deadlines), dtype=bool, count=n)
+    for required in ("Nama", "Prioritas"):
+        if required not in df:
+            recover[:] = True
+
+    missing_ids = 0
+    for i, task_id in enumerate(ids):
+        if not task_id:
+            ids[i] = uuid.uuid4().hex
+            missing_ids += 1
+
+    today = datetime.now().date()
+    nama = nama.tolist() if "Nama" in df else ["Task Recovery"] * n
+    prioritas = prioritas.tolist() if "Prioritas" in df else ["Sedang"] * n
+    selesai = selesai.tolist()
+    durasi_aktual = durasi_aktual.tolist()
+    durasi_estimasi = durasi_estimasi.tolist()
+    recover = recover.tolist()
+
+    tasks = []
+    for i in range(n):
+        if recover[i]:
+            tasks.append(task_class(
+                nama=nama[i], deskripsi=deskripsi[i], prioritas=prioritas[i],
+                deadline=today, selesai=False, id=ids[i]
+            ))
+            continue
+        task = task_class(
+            nama=nama[i],
+            deskripsi=deskripsi[i],
+            prioritas=prioritas[i],
+            deadline=deadlines[i],
+            selesai=selesai[i],
+            tanggal_selesai=tanggal_selesai[i] if selesai[i] else None,
+            durasi_aktual=durasi_aktual[i] if selesai[i] else None,
+            waktu_rekomendasi=waktu_rekomendasi[i],
+            id=ids[i]
+        )
+        task.durasi_estimasi = durasi_estimasi[i]
+        tasks.append(task)
+
+    if stats is not None:
+        stats["rows"] = stats.get("rows", 0) + n
+        stats["recovered"] = stats.get("recovered", 0) + sum(recover)
+        stats["missing_ids"] = stats.get("missing_ids", 0) + missing_ids
+    return tasks
+
+
+def iter_task_chunks(path: str, task_class: type, chunksize: int = DEFAULT_CHUNKSIZE,
+                     stats: Optional[Dict] = None) -> Iterator[List]:
+    """Lazily yield tasks from a CSV file in chunks of at most chunksize tasks"""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    import pandas as pd
+    reader = pd.read_csv(
+        path, dtype=str, keep_default_na=False, chunksize=chunksize,
+        encoding="utf-8", on_bad_lines="warn"
+    )
+    with reader:
+        for chunk in reader:
+            yield _parse_chunk(chunk, task_class, stats)
+
+
+def load_tasks_bulk(path: str, task_class: type, stats: Optional[Dict] = None) -> List:
+    """Load every task from a CSV file using column-wise parsing"""
+    tasks = []
+    for chunk in iter_task_chunks(path, task_class, stats=stats):
+        tasks.extend(chunk)
+    return tasks
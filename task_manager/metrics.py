@@ -0,0 +1,203 @@
+import functools
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+# Histogram bucket i holds durations up to 2**i microseconds (~1 µs to ~36 min)
+N_BUCKETS = 32
+_BUCKET_UNIT = 1e-6
+
+
+class Histogram:
+    """Latency histogram with power-of-two buckets.
+
+    Recording is one frexp call and a few additions, and memory stays at
+    N_BUCKETS counters however many samples arrive. Percentiles are
+    reported as the upper bound of the bucket they fall in (capped at the
+    largest sample), so they are accurate to within a factor of two.
+    """
+
+    def __init__(self):
+        self.counts = [0] * N_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        exponent = 0
+        if seconds > _BUCKET_UNIT:
+            mantissa, exponent = math.frexp(seconds / _BUCKET_UNIT)
+            if mantissa == 0.5:
+                exponent -= 1  # An exact power of two is the upper bound of the bucket below
+        self.counts[min(exponent, N_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    @staticmethod
+    def bucket_bound(i: int) -> float:
+        """Upper bound of bucket i in seconds"""
+        return _BUCKET_UNIT * 2 ** i
+
+    def percentile(self, q: float) -> float:
+        """Approximate q-th percentile (0-100) in seconds"""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * q / 100) or 1
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                # The last bucket also holds everything above its bound
+                return self.max if i == N_BUCKETS - 1 else min(self.bucket_bound(i), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": [[self.bucket_bound(i), count] for i, count in enumerate(self.counts) if count],
+        }
+
+
+class Metrics:
+    """Process-wide latency histograms and counters, collected only while enabled.
+
+    Instrumented code checks ``enabled`` before reading the clock, so a
+    disabled registry costs one attribute lookup per call. Recording takes
+    a lock because the model trainer reports from its worker thread.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.time()
+        self._timers: Dict[str, Histogram] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._timers.get(name)
+            if histogram is None:
+                histogram = self._timers[name] = Histogram()
+            histogram.record(seconds)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to a counter (no-op while disabled)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    @contextmanager
+    def _timing(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timer(self, name: str):
+        """Context manager recording the duration of its block under name"""
+        return self._timing(name) if self.enabled else nullcontext()
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator recording every call of a function (under its qualified name by default)"""
+        def decorator(fn: Callable) -> Callable:
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(label, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of every histogram and counter"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "started": self.started,
+                "taken": time.time(),
+                "timers": {name: h.to_dict() for name, h in sorted(self._timers.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+
+# Diagnostics are opt-in: TASK_MANAGER_METRICS=1 starts collection and shows the Diagnostik page
+METRICS_OPT_IN = os.environ.get("TASK_MANAGER_METRICS", "") not in ("", "0")
+metrics = Metrics(enabled=METRICS_OPT_IN)
+timer = metrics.timer
+timed = metrics.timed
+count = metrics.count
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Current and peak resident set size of this process in bytes (None where unavailable)"""
+    current = peak = None
+    try:
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024  # Reported in KiB on Linux
+    except (ImportError, OSError):
+        pass
+    return {"rss": current, "peak_rss": peak}
+
+
+def deep_sizeof(obj, exclude: Optional[set] = None) -> int:
+    """Approximate bytes held by obj and the containers and objects it references.
+
+    Objects are counted once, and the IDs in exclude (shared objects such
+    as the process-wide task manager) are not followed.
+    """
+    seen = set(exclude or ())
+    size = 0
+    stack: List = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__"):
+            stack.append(current.__dict__)
+        elif hasattr(current, "__slots__"):
+            slots = current.__slots__
+            slots = (slots,) if isinstance(slots, str) else slots
+            stack.extend(getattr(current, slot) for slot in slots if hasattr(current, slot))
+    return size
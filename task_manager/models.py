@@ -1,12 +1,18 @@
-import csv
 import os
+import sys
+import uuid
+from contextlib import contextmanager
 from datetime import datetime, date, timedelta
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
-from collections import Counter
+from typing import Collection, List, Dict, Iterable, Iterator, Optional, Tuple
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from .storage import TaskStorage, CSVStorage
+from .columnar import TaskColumns, PRIORITIES, PRIORITY_CODES
+from .snapshot import TaskSnapshot
+from .scheduler import Schedule, build_schedule
+from .deadlines import DeadlineIndex
+from .search import SearchIndex
+from .metrics import count, timed
 
 
 @dataclass
@@ -27,6 +33,7 @@ class Task:
     durasi_aktual: Optional[float] = None
     durasi_estimasi: float = field(init=False)
     waktu_rekomendasi: Optional[datetime] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
 
     def __post_init__(self):
         self.durasi_estimasi = self._estimate_initial_duration()
@@ -66,12 +73,15 @@ class Task:
             "Tanggal_Selesai": self.tanggal_selesai.strftime("%Y-%m-%d") if self.tanggal_selesai else "",
             "Durasi_Aktual": str(self.durasi_aktual) if self.durasi_aktual is not None else "",
             "Durasi_Estimasi": str(self.durasi_estimasi),
-            "Waktu_Rekomendasi": self.waktu_rekomendasi.strftime("%Y-%m-%d %H:%M") if self.waktu_rekomendasi else ""
+            "Waktu_Rekomendasi": self.waktu_rekomendasi.strftime("%Y-%m-%d %H:%M") if self.waktu_rekomendasi else "",
+            "ID": self.id
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'Task':
         """Create Task object from dictionary (CSV data) with validation"""
+        # Keep a stored ID so journal records keep pointing at the same task
+        extra = {"id": data["ID"].strip()} if (data.get("ID") or "").strip() else {}
         try:
             # Parse completion status
             selesai = data.get("Selesai", "False").strip().lower() == "true"
@@ -88,22 +98,33 @@ class Task:
             if selesai and not tanggal_selesai:
                 selesai = False
             
+            # Parse duration before construction so completed rows pass validation
+            prioritas = data["Prioritas"].strip()
+            durasi_aktual = None
+            if selesai:
+                try:
+                    durasi_aktual = float(data.get("Durasi_Aktual", "").strip())
+                except ValueError:
+                    durasi_aktual = cls.PRIORITY_DURATIONS.get(prioritas, 2.0)
+            
             # Create task instance
             task = cls(
                 nama=data["Nama"].strip(),
                 deskripsi=data.get("Deskripsi", "").strip(),
-                prioritas=data["Prioritas"].strip(),
+                prioritas=prioritas,
                 deadline=datetime.strptime(data["Deadline"].strip(), "%Y-%m-%d").date(),
                 selesai=selesai,
-                tanggal_selesai=tanggal_selesai
+                tanggal_selesai=tanggal_selesai,
+                durasi_aktual=durasi_aktual,
+                **extra
             )
             
-            # Parse duration if available
-            if selesai and data.get("Durasi_Aktual", "").strip():
+            # Keep a previously refined duration estimate
+            if (data.get("Durasi_Estimasi") or "").strip():
                 try:
-                    task.durasi_aktual = float(data["Durasi_Aktual"].strip())
+                    task.durasi_estimasi = float(data["Durasi_Estimasi"].strip())
                 except ValueError:
-                    task.durasi_aktual = task.durasi_estimasi
+                    pass  # Keep priority-based estimate
             
             # Parse recommended time if available
             if data.get("Waktu_Rekomendasi", "").strip():
@@ -122,127 +143,689 @@ class Task:
                     deskripsi=data.get("Deskripsi", "").strip(),
                     prioritas=data.get("Prioritas", "Sedang").strip(),
                     deadline=datetime.now().date(),
-                    selesai=False
+                    selesai=False,
+                    **extra
                 )
             except Exception:
                 raise ValueError(f"Invalid task data that couldn't be recovered: {str(e)}")
 
 
+# Shared date objects: tasks with the same deadline point at one instance
+_DATE_CACHE: Dict[date, date] = {}
+
+
+def _intern_date(value: Optional[date]) -> Optional[date]:
+    """Return a shared instance of an (immutable) date"""
+    if value is None:
+        return None
+    return _DATE_CACHE.setdefault(value, value)
+
+
+class CompactTask:
+    """Memory-lean Task with the same public attributes and CSV behaviour.
+
+    Instances use ``__slots__`` instead of a per-instance ``__dict__``,
+    priority strings are interned and dates are shared between tasks with
+    the same value, so repeated values cost only a slot pointer. Empty
+    optional fields point at the ``None``/``""`` singletons and allocate
+    nothing. Measured with tracemalloc on CPython 3.11 for 20k tasks loaded
+    with ``from_dict`` (excluding the ``nama``/``deskripsi`` text), a Task
+    costs about 250 bytes and a CompactTask about 160 bytes, of which ~80
+    bytes are the ID string; ``task_footprint`` gives a per-instance
+    estimate.
+    """
+
+    __slots__ = (
+        "nama", "_prioritas", "_deadline", "deskripsi", "selesai",
+        "_tanggal_selesai", "durasi_aktual", "durasi_estimasi",
+        "waktu_rekomendasi", "id"
+    )
+
+    PRIORITY_DURATIONS = Task.PRIORITY_DURATIONS
+
+    def __init__(self, nama: str, prioritas: str, deadline: date, deskripsi: str = "",
+                 selesai: bool = False, tanggal_selesai: Optional[date] = None,
+                 durasi_aktual: Optional[float] = None, waktu_rekomendasi: Optional[datetime] = None,
+                 id: Optional[str] = None):
+        self.nama = nama
+        self.prioritas = prioritas
+        self.deadline = deadline
+        self.deskripsi = deskripsi
+        self.selesai = selesai
+        self.tanggal_selesai = tanggal_selesai
+        self.durasi_aktual = durasi_aktual
+        self.waktu_rekomendasi = waktu_rekomendasi
+        self.id = id or uuid.uuid4().hex
+        self.durasi_estimasi = self._estimate_initial_duration()
+        self._validate_data()
+
+    @property
+    def prioritas(self) -> str:
+        return self._prioritas
+
+    @prioritas.setter
+    def prioritas(self, value: str) -> None:
+        self._prioritas = sys.intern(value)
+
+    @property
+    def deadline(self) -> date:
+        return self._deadline
+
+    @deadline.setter
+    def deadline(self, value: date) -> None:
+        self._deadline = _intern_date(value)
+
+    @property
+    def tanggal_selesai(self) -> Optional[date]:
+        return self._tanggal_selesai
+
+    @tanggal_selesai.setter
+    def tanggal_selesai(self, value: Optional[date]) -> None:
+        self._tanggal_selesai = _intern_date(value)
+
+    _FIELDS = (
+        "nama", "prioritas", "deadline", "deskripsi", "selesai", "tanggal_selesai",
+        "durasi_aktual", "durasi_estimasi", "waktu_rekomendasi", "id"
+    )
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._FIELDS)
+
+    __hash__ = None  # Mutable, like the dataclass Task
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self._FIELDS)
+        return f"CompactTask({fields})"
+
+    _estimate_initial_duration = Task._estimate_initial_duration
+    _validate_data = Task._validate_data
+    mark_completed = Task.mark_completed
+    to_dict = Task.to_dict
+    from_dict = classmethod(Task.from_dict.__func__)
+
+
+def task_footprint(task) -> int:
+    """Approximate bytes owned by one task instance, excluding shared objects"""
+    size = sys.getsizeof(task)
+    if hasattr(task, "__dict__"):
+        size += sys.getsizeof(task.__dict__)
+    for name in CompactTask._FIELDS:
+        value = getattr(task, name)
+        # Interned or singleton values are shared with other tasks
+        if value is None or value is True or value is False or value == "":
+            continue
+        if name == "prioritas" and value is sys.intern(value):
+            continue
+        if name in ("deadline", "tanggal_selesai") and _DATE_CACHE.get(value) is value:
+            continue
+        if name == "durasi_estimasi" and value in Task.PRIORITY_DURATIONS.values():
+            continue
+        if name in ("nama", "deskripsi"):
+            continue  # Text content is the same for both representations
+        size += sys.getsizeof(value)
+    return size
+
+
+def blend_duration(estimate: float, similar_durations: List[float]) -> float:
+    """Duration estimate pulled towards the mean actual duration of similar completed tasks"""
+    if not similar_durations:
+        return estimate
+    return (np.mean(similar_durations) * 0.7) + (estimate * 0.3)
+
+
+def _priority_rank(prioritas: str) -> int:
+    """Sort rank of a priority, unknown values last"""
+    return PRIORITY_CODES.get(prioritas, len(PRIORITIES))
+
+
+# Sort keys of the task list orders; the status order lists active tasks first
+TASK_ORDERS = {
+    "deadline": lambda task: (task.deadline, _priority_rank(task.prioritas)),
+    "prioritas": lambda task: (_priority_rank(task.prioritas), task.deadline),
+    "status": lambda task: (task.selesai, task.deadline),
+}
+
+
 class TaskManager:
     """Main class for managing tasks and their operations"""
     
-    def __init__(self):
-        self.tasks: List[Task] = []
-        self.vectorizer = TfidfVectorizer(stop_words="english")
-        self._load_from_csv()
+    def __init__(self, storage: Optional[TaskStorage] = None, task_class: type = Task, lazy: bool = False,
+                 snapshot: bool = False, defer_estimates: bool = False):
+        self.storage = storage or CSVStorage("tugas.csv")
+        self.task_class = task_class
+        self._similarity = None
+        self._similarity_synced = False
+        # Leave the first similarity sync to a ModelTrainer instead of the first new task
+        self.defer_estimates = defer_estimates
+        # Tasks estimated without the similarity index while it was being synced
+        self._provisional: set = set()
+        self._tasks: Optional[List[Task]] = None
+        self._by_id: Dict[str, Task] = {}
+        self._columns: Optional[TaskColumns] = None
+        # Deadline-sorted indexes of all and of active tasks, built on first range query
+        self._deadlines: Optional[DeadlineIndex] = None
+        self._active_deadlines: Optional[DeadlineIndex] = None
+        # Full-text index over names and descriptions, built on first search
+        self._search: Optional[SearchIndex] = None
+        # TimeOptimizer over all tasks, built on first use
+        self._optimizer = None
+        # Row numbers of the columnar view per TASK_ORDERS key, dropped on every change
+        self._orders: Dict[str, np.ndarray] = {}
+        # Changes collected inside a bulk() block, persisted when it ends
+        self._deferred: Optional[List[Tuple[str, Task]]] = None
+        # Binary snapshot next to the CSV file, used while it matches the CSV
+        self.snapshot_path: Optional[str] = None
+        self._snapshot: Optional[TaskSnapshot] = None
+        if snapshot and not self.storage.queryable:
+            self.snapshot_path = f"{os.path.splitext(self.storage.path)[0]}.snapshot"
+            self._snapshot = TaskSnapshot.open(self.snapshot_path, self.storage.path)
+        if not (lazy or self.storage.queryable):
+            self._load_from_csv()
+
+    @property
+    def tasks(self) -> List[Task]:
+        """All tasks; loaded on first access for lazy managers and query-capable storage"""
+        if self._tasks is None:
+            self._load_from_csv()
+        return self._tasks
+
+    @property
+    def similarity(self):
+        """Similarity index over completed tasks, opened (with scikit-learn) on first use"""
+        if self._similarity is None:
+            self._similarity = self.new_similarity_index()
+        return self._similarity
+
+    def new_similarity_index(self):
+        """A SimilarityIndex opened from this manager's index file, not attached to the manager"""
+        from .similarity import SimilarityIndex
+        return SimilarityIndex(f"{os.path.splitext(self.storage.path)[0]}.similarity.npz")
+
+    @property
+    def similarity_ready(self) -> bool:
+        """Whether duration estimates use the similarity index"""
+        return self._similarity_synced
+
+    def sync_similarity(self) -> None:
+        """Reconcile the similarity index with the completed tasks"""
+        self.similarity.sync(self.get_valid_completed_tasks())
+        self._similarity_synced = True
+
+    def install_similarity(self, index) -> List[Task]:
+        """Attach an index synced elsewhere and return the active tasks estimated without it"""
+        self._similarity = index
+        self.sync_similarity()
+        provisional = [self.get_task(task_id) for task_id in self._provisional]
+        self._provisional.clear()
+        return [task for task in provisional if task is not None and not task.selesai]
+
+    @property
+    def optimizer(self):
+        """Long-lived TimeOptimizer over all tasks, built (with scikit-learn) on first use"""
+        if self._optimizer is None:
+            from .recommendations import TimeOptimizer
+            self._optimizer = TimeOptimizer([task for chunk in self.iter_task_chunks() for task in chunk])
+        return self._optimizer
+
+    @property
+    def optimizer_ready(self) -> bool:
+        """Whether the optimizer can answer without being built first"""
+        return self._optimizer is not None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether all tasks are in memory"""
+        return self._tasks is not None
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Look up a task by ID"""
+        if task_id not in self._by_id and self._tasks is None:
+            if self.storage.queryable:
+                self._fetch([task_id])
+            else:
+                self._load_from_csv()
+        return self._by_id.get(task_id)
+
+    def find_tasks(self, task_ids: List[str]) -> Dict[str, Task]:
+        """Stored tasks with the given IDs keyed by ID, looked up in one storage query if needed"""
+        if self._tasks is None:
+            if self.storage.queryable:
+                self._fetch(task_ids)
+            else:
+                self._load_from_csv()
+        return {task_id: self._by_id[task_id] for task_id in task_ids if task_id in self._by_id}
 
+    def _fetch(self, task_ids: List[str]) -> None:
+        """Bring stored tasks into the identity map by ID; query-capable storage maps only what was queried"""
+        if self._tasks is None and self.storage.queryable:
+            missing = [task_id for task_id in task_ids if task_id not in self._by_id]
+            if missing:
+                self._materialize(self.storage.get_many(missing))
+
+    def replace_task(self, old: Task, new: Task) -> None:
+        """Swap in another instance of the same task (same ID), e.g. an edited copy"""
+        if self._tasks is not None:
+            for i, task in enumerate(self._tasks):
+                if task is old:
+                    self._tasks[i] = new
+                    break
+        self._by_id[new.id] = new
+
+    @property
+    def columns(self) -> TaskColumns:
+        """Columnar NumPy view of all tasks, kept in sync on every mutation"""
+        if self._columns is None:
+            if self._tasks is None and self._snapshot is not None:
+                self._columns = self._snapshot_columns()
+            else:
+                self._columns = TaskColumns.from_tasks(self.tasks)
+        return self._columns
+
+    def _sync_indexes(self, task: Task, deleted: bool = False) -> None:
+        """Keep the columnar view, deadline/search indexes and optimizer in step with a changed task"""
+        self._orders.clear()
+        if self._columns is not None:
+            if deleted:
+                self._columns.remove(task.id)
+            else:
+                self._columns.update(task)
+        if self._deadlines is not None:
+            if deleted:
+                self._deadlines.remove(task.id)
+                self._active_deadlines.remove(task.id)
+            else:
+                self._deadlines.add(task.id, task.deadline)
+                if task.selesai:
+                    self._active_deadlines.remove(task.id)
+                else:
+                    self._active_deadlines.add(task.id, task.deadline)
+        if self._search is not None:
+            if deleted:
+                self._search.remove(task.id)
+            else:
+                self._search.add(task)
+        if self._optimizer is not None:
+            if deleted:
+                self._optimizer.remove(task.id)
+            else:
+                self._optimizer.add(task)
+
+    @property
+    def deadline_indexed(self) -> bool:
+        """Whether range queries can be answered without building anything first"""
+        return self._deadlines is not None or self.storage.queryable
+
+    def _ensure_deadline_indexes(self) -> None:
+        """Build both deadline indexes from the columnar view"""
+        if self._deadlines is None:
+            columns = self.columns
+            ids = columns.ids
+            self._deadlines = DeadlineIndex.from_arrays(columns.deadline, ids)
+            active = np.flatnonzero(~columns.selesai)
+            self._active_deadlines = DeadlineIndex.from_arrays(
+                columns.deadline[active], [ids[i] for i in active.tolist()]
+            )
+
+    @property
+    def search_indexed(self) -> bool:
+        """Whether searches can be answered without building the index first"""
+        return self._search is not None
+
+    def _ensure_search_index(self) -> None:
+        """Build the search index, streaming tasks from storage if they are not loaded"""
+        if self._search is None:
+            index = SearchIndex()
+            for chunk in self.iter_task_chunks():
+                for task in chunk:
+                    index.add(task)
+            self._search = index
+
+    def task_order_cached(self, order: str) -> bool:
+        """Whether get_task_page() can use an already sorted order"""
+        return order in self._orders
+
+    def _task_order(self, order: str) -> np.ndarray:
+        """Rows of the columnar view sorted like TASK_ORDERS[order], cached until the next change"""
+        rows = self._orders.get(order)
+        if rows is None:
+            columns = self.columns
+            rank = np.where(columns.prioritas >= 0, columns.prioritas, len(PRIORITIES))
+            # np.lexsort sorts by the last key first
+            keys = {
+                "deadline": (rank, columns.deadline),
+                "prioritas": (columns.deadline, rank),
+                "status": (columns.deadline, columns.selesai),
+            }[order]
+            rows = self._orders[order] = np.lexsort(keys)
+        return rows
+
+    def _snapshot_columns(self) -> TaskColumns:
+        """Columns straight from the binary snapshot plus journaled changes"""
+        columns = self._snapshot.columns()
+        for task_id, row in self.storage.replay_journal().items():
+            if row is None:
+                columns.remove(task_id)
+                continue
+            try:
+                columns.update(self.task_class.from_dict(row))
+            except ValueError as e:
+                print(f"Warning: Skipping invalid task - {e}")
+        return columns
+
+    @timed("storage.load")
     def _load_from_csv(self) -> None:
-        """Load tasks from CSV file with error recovery"""
-        if not os.path.exists("tugas.csv"):
-            self.tasks = []
+        """Load tasks from storage (snapshot plus journal replay) with error recovery"""
+        if self._snapshot is not None:
+            tasks = self.storage.apply_journal(self._snapshot.load_tasks(self.task_class), self.task_class)
+        else:
+            tasks = self.storage.load_tasks(self.task_class)
+            self._columns = None
+            self._deadlines = self._active_deadlines = None
+            self._search = self._optimizer = None
+            self._orders.clear()
+            self._write_snapshot(tasks)
+        self._tasks = self._register(tasks)
+        count("storage.tasks_loaded", len(tasks))
+
+    def _write_snapshot(self, tasks: List[Task]) -> None:
+        """Refresh the binary snapshot after the CSV file was read or rewritten"""
+        if not self.snapshot_path or self.storage.read_only or not os.path.exists(self.storage.path):
             return
-            
-        self.tasks = []
-        with open("tugas.csv", "r", encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
+        try:
+            TaskSnapshot.write(self.snapshot_path, tasks, self.storage.path)
+            self._snapshot = None  # Tasks are in memory from now on
+        except Exception as e:
+            print(f"Warning: Could not write snapshot - {e}")
+
+    def _register(self, tasks: List[Task]) -> List[Task]:
+        """Add tasks to the identity map, keeping instances that are already loaded"""
+        return [self._by_id.setdefault(task.id, task) for task in tasks]
+
+    def iter_task_chunks(self, chunksize: int = 1000) -> Iterator[List[Task]]:
+        """Yield tasks in chunks, streaming from storage if they are not loaded yet"""
+        if self._tasks is not None:
+            for start in range(0, len(self._tasks), chunksize):
+                yield self._tasks[start:start + chunksize]
+            return
+        for chunk in self.storage.iter_task_chunks(self.task_class, chunksize):
+            yield self._register(chunk)
+
+    def _materialize(self, rows: List[Dict]) -> List[Task]:
+        """Build Task objects from rows, reusing already loaded instances by ID"""
+        tasks = []
+        for row in rows:
+            task = self._by_id.get((row.get("ID") or "").strip())
+            if task is None:
                 try:
-                    task = Task.from_dict(row)
-                    self.tasks.append(task)
+                    task = self.task_class.from_dict(row)
                 except ValueError as e:
                     print(f"Warning: Skipping invalid task - {e}")
                     continue
+                self._by_id[task.id] = task
+            tasks.append(task)
+        return tasks
 
+    def _task_count(self) -> int:
+        """Number of tasks without forcing a full load"""
+        if self._tasks is None and self.storage.queryable:
+            return self.storage.count()
+        return len(self.tasks)
+
+    @timed("storage.save")
     def save_to_csv(self):
         """Save tasks to CSV file with data validation"""
         try:
-            with open("tugas.csv", "w", newline="", encoding='utf-8') as f:
-                fieldnames = [
-                    "Nama", "Deskripsi", "Prioritas", "Deadline", 
-                    "Selesai", "Tanggal_Selesai", "Durasi_Aktual", 
-                    "Durasi_Estimasi", "Waktu_Rekomendasi"
-                ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for task in self.tasks:
-                    try:
-                        # Ensure completed tasks have valid data
-                        if task.selesai:
-                            if not task.tanggal_selesai:
-                                task.selesai = False
-                            if task.durasi_aktual is None:
-                                task.durasi_aktual = task.durasi_estimasi
-                        
-                        writer.writerow(task.to_dict())
-                    except Exception as e:
-                        print(f"Error saving task {task.nama}: {e}")
-                        continue
-                        
+            rows = []
+            for task in self.tasks:
+                try:
+                    self._ensure_valid_completion(task)
+                    rows.append(task.to_dict())
+                except Exception as e:
+                    print(f"Error saving task {task.nama}: {e}")
+                    continue
+            
+            self.storage.save_all(rows)
+            self._write_snapshot(self.tasks)
             return True
         except Exception as e:
             print(f"Error saving to CSV: {e}")
             return False
 
-    def get_valid_completed_tasks(self) -> List[Task]:
-        """Get list of properly completed tasks (with all required data)"""
-        return [
-            t for t in self.tasks 
-            if t.selesai and t.tanggal_selesai and t.durasi_aktual is not None
-        ]
+    @staticmethod
+    def _ensure_valid_completion(task: Task) -> None:
+        """Ensure completed tasks have valid data before they are stored"""
+        if task.selesai:
+            if not task.tanggal_selesai:
+                task.selesai = False
+            if task.durasi_aktual is None:
+                task.durasi_aktual = task.durasi_estimasi
+
+    def _persist(self, op: str, task: Task) -> bool:
+        """Persist a single change, journaling it when the storage supports it"""
+        return self._persist_many([(op, task)])
+
+    @timed("storage.persist")
+    def _persist_many(self, changes: List[Tuple[str, Task]]) -> bool:
+        """Persist (op, task) changes with a single storage write"""
+        if self._deferred is not None:
+            self._deferred.extend(changes)
+            return True
+        if not self.storage.incremental:
+            return self.save_to_csv()
+        
+        try:
+            records = []
+            for op, task in changes:
+                self._ensure_valid_completion(task)
+                records.append((op, task.to_dict()))
+            self.storage.append_many(records)
+            if self.storage.needs_compaction():
+                return self.save_to_csv()
+            return True
+        except Exception as e:
+            print(f"Error saving {len(changes)} task changes: {e}")
+            return False
+
+    @contextmanager
+    def bulk(self):
+        """Collect the changes made inside the block and persist them once at the end"""
+        if self._deferred is not None:
+            yield  # Nested block: the outer one persists
+            return
+        self._deferred = []
+        try:
+            yield
+        finally:
+            changes, self._deferred = self._deferred, None
+            if changes:
+                self._persist_many(changes)
 
     def add_task(self, nama: str, deskripsi: str, prioritas: str, deadline: str) -> tuple:
         """Add new task with validation and time recommendation"""
         try:
             deadline_date = datetime.strptime(deadline, "%Y-%m-%d").date()
-            task = Task(nama, prioritas, deadline_date, deskripsi=deskripsi)
+            task = self.task_class(nama, prioritas, deadline_date, deskripsi=deskripsi)
             self._generate_time_recommendation(task)
-            self.tasks.append(task)
-            self.save_to_csv()
+            if self._tasks is not None or not self.storage.queryable:
+                self.tasks.append(task)
+            self._by_id[task.id] = task
+            self._sync_indexes(task)
+            self._persist("add", task)
             return True, task
         except ValueError:
             return False, "Format tanggal salah!"
 
+    def update_task(self, task: Task, nama: str, deskripsi: str, prioritas: str, deadline: date) -> bool:
+        """Edit task fields, refresh its recommendation and persist the change"""
+        task.nama = nama
+        task.deskripsi = deskripsi
+        task.prioritas = prioritas
+        task.deadline = deadline
+        self._generate_time_recommendation(task)
+        if task.selesai and self._similarity_synced:
+            self.similarity.add(task)
+        self._sync_indexes(task)
+        return self._persist("update", task)
+
+    def complete_task(self, task: Task, tanggal_selesai: Optional[date] = None,
+                      durasi_aktual: Optional[float] = None) -> bool:
+        """Mark task as completed and persist the change"""
+        task.mark_completed(tanggal_selesai=tanggal_selesai, durasi_aktual=durasi_aktual)
+        if self._similarity_synced:
+            self.similarity.add(task)
+        self._sync_indexes(task)
+        return self._persist("update", task)
+
+    def add_tasks(self, tasks: Iterable[Task]) -> List[Task]:
+        """Add many tasks with one recommendation pass and a single write.
+
+        Tasks whose ID is already known are skipped; use update_tasks() for
+        those. Active tasks without a recommended time get one.
+        """
+        tasks = list(tasks)
+        known = self.find_tasks([task.id for task in tasks])
+        added, seen = [], set()
+        for task in tasks:
+            if task.id in seen or task.id in known:
+                print(f"Warning: Skipping duplicate task {task.id}")
+                continue
+            seen.add(task.id)
+            added.append(task)
+        if not added:
+            return []
+
+        self._generate_time_recommendations(
+            [t for t in added if not t.selesai and t.waktu_rekomendasi is None]
+        )
+        if self._tasks is not None or not self.storage.queryable:
+            self.tasks.extend(added)
+        for task in added:
+            self._by_id[task.id] = task
+            self._sync_indexes(task)
+            if task.selesai and self._similarity_synced:
+                self.similarity.add(task)
+        self._persist_many([("add", task) for task in added])
+        return added
+
+    def update_tasks(self, tasks: Iterable[Task]) -> int:
+        """Store changed tasks (edited in place or new instances with known IDs) in one write"""
+        tasks = list(tasks)
+        known = self.find_tasks([task.id for task in tasks])
+        updated, replaced = [], {}
+        for task in tasks:
+            current = known.get(task.id)
+            if current is None:
+                print(f"Warning: Skipping unknown task {task.id}")
+                continue
+            if current is not task:
+                replaced[task.id] = task
+            self._by_id[task.id] = task
+            updated.append(task)
+        if not updated:
+            return 0
+        if replaced and self._tasks is not None:
+            self._tasks[:] = [replaced.get(t.id, t) for t in self._tasks]
+
+        self._generate_time_recommendations(
+            [t for t in updated if not t.selesai and t.waktu_rekomendasi is None]
+        )
+        for task in updated:
+            self._sync_indexes(task)
+            if self._similarity is not None:
+                if task.selesai and task.durasi_aktual is not None and self._similarity_synced:
+                    self.similarity.add(task)
+                elif not task.selesai:
+                    self.similarity.remove(task.id)
+        self._persist_many([("update", task) for task in updated])
+        return len(updated)
+
+    def delete_tasks(self, tasks: Iterable[Task]) -> int:
+        """Remove many tasks and persist the deletions in one write"""
+        removed = {task.id: task for task in tasks}
+        if not removed:
+            return 0
+        if self._tasks is not None or not self.storage.queryable:
+            self.tasks[:] = [t for t in self.tasks if t.id not in removed]
+        for task_id in removed:
+            self._by_id.pop(task_id, None)
+            if self._similarity is not None:
+                self.similarity.remove(task_id)
+            self._sync_indexes(removed[task_id], deleted=True)
+        self._persist_many([("delete", task) for task in removed.values()])
+        return len(removed)
+
+    def schedule_active_tasks(self, tasks: Optional[List[Task]] = None,
+                              now: Optional[datetime] = None) -> Schedule:
+        """Pack active tasks into working hours and store all recommended times in one write"""
+        if tasks is None:
+            tasks = self.get_active_tasks()
+        schedule = build_schedule(tasks, now=now)
+        for task in tasks:
+            task.waktu_rekomendasi = schedule.start(task.id)
+        self.update_tasks(tasks)
+        return schedule
+
+    def delete_task(self, task: Task) -> bool:
+        """Remove task and persist the deletion"""
+        if self._tasks is not None or not self.storage.queryable:
+            self.tasks.remove(task)
+        self._by_id.pop(task.id, None)
+        if self._similarity is not None:
+            self.similarity.remove(task.id)  # Otherwise the first sync drops it
+        self._sync_indexes(task, deleted=True)
+        return self._persist("delete", task)
+
     def _generate_time_recommendation(self, task: Task) -> None:
         """Generate optimal working time recommendation for task"""
-        if not self.tasks:
-            task.waktu_rekomendasi = datetime.now() + timedelta(hours=1)
+        self._generate_time_recommendations([task])
+
+    def _generate_time_recommendations(self, tasks: List[Task]) -> None:
+        """Recommendations for many tasks with one similarity query and one slot search"""
+        if not tasks:
+            return
+        if not self._task_count():
+            for task in tasks:
+                task.waktu_rekomendasi = datetime.now() + timedelta(hours=1)
             return
         
-        task.durasi_estimasi = self._estimate_duration(task)
-        task.waktu_rekomendasi = self._find_optimal_time_slot(task)
-        self._adjust_for_deadline(task)
+        slot = self._find_optimal_time_slot(tasks[0])
+        for task, duration in zip(tasks, self._estimate_durations(tasks)):
+            task.durasi_estimasi = duration
+            task.waktu_rekomendasi = slot
+            self._adjust_for_deadline(task)
 
     def _estimate_duration(self, new_task: Task) -> float:
         """Estimate duration based on similar completed tasks"""
-        completed_tasks = [t for t in self.tasks if t.selesai and t.durasi_aktual]
-        
-        if not completed_tasks:
-            return new_task.durasi_estimasi
-            
-        texts = [f"{t.nama} {t.deskripsi}" for t in completed_tasks]
-        texts.append(f"{new_task.nama} {new_task.deskripsi}")
+        return self._estimate_durations([new_task])[0]
 
-        tfidf_matrix = self.vectorizer.fit_transform(texts)
-        similarities = cosine_similarity(tfidf_matrix[-1:], tfidf_matrix[:-1])[0]
-        
-        similar_indices = np.argsort(similarities)[-3:]
-        similar_tasks = [completed_tasks[i] for i in similar_indices]
+    def _estimate_durations(self, new_tasks: List[Task]) -> List[float]:
+        """Estimate durations of several tasks with a single similarity query"""
+        if not self._similarity_synced:
+            if self.defer_estimates:
+                # Keep the priority-based estimate until a ModelTrainer has synced the index
+                self._provisional.update(task.id for task in new_tasks)
+                return [task.durasi_estimasi for task in new_tasks]
+            # One-off reconciliation with tasks changed outside this manager
+            self.sync_similarity()
         
-        avg_duration = np.mean([t.durasi_aktual for t in similar_tasks])
-        return (avg_duration * 0.7) + (new_task.durasi_estimasi * 0.3)
+        neighbours = self.similarity.nearest_many([f"{t.nama} {t.deskripsi}" for t in new_tasks], k=3)
+        return [
+            blend_duration(task.durasi_estimasi, [self.similarity.duration(i) for i in similar_ids])
+            for task, similar_ids in zip(new_tasks, neighbours)
+        ]
 
     def _find_optimal_time_slot(self, task: Task) -> datetime:
         """Find optimal time slot based on user's productivity patterns"""
-        completed_tasks = [t for t in self.tasks if t.selesai and t.tanggal_selesai]
+        completions_per_day = self.columns.stats.weekday.count
         
-        if not completed_tasks:
+        if not completions_per_day.any():
             return datetime.now().replace(
                 hour=9, minute=0, second=0, microsecond=0
             ) + timedelta(days=1)
             
-        completion_days = [t.tanggal_selesai.weekday() for t in completed_tasks]
-        most_productive_day = Counter(completion_days).most_common(1)[0][0]
+        most_productive_day = int(completions_per_day.argmax())
         
         today = datetime.now()
         days_ahead = (most_productive_day - today.weekday()) % 7
@@ -266,19 +849,78 @@ class TaskManager:
 
     def get_active_tasks(self) -> List[Task]:
         """Get list of incomplete tasks"""
+        if self.storage.queryable:
+            return self._materialize(self.storage.query(selesai=False))
         return [t for t in self.tasks if not t.selesai]
 
     def get_completed_tasks(self) -> List[Task]:
         """Get list of completed tasks"""
+        if self.storage.queryable:
+            return self._materialize(self.storage.query(selesai=True))
         return [t for t in self.tasks if t.selesai]
 
-    def get_tasks_by_deadline(self, days: int = 7) -> Dict[datetime.date, List[Task]]:
-        """Get tasks grouped by deadline for the next specified days"""
-        today = datetime.now().date()
-        calendar = {today + timedelta(days=i): [] for i in range(days)}
-        
-        for task in self.tasks:
-            if task.deadline in calendar:
-                calendar[task.deadline].append(task)
-                
+    def get_valid_completed_tasks(self) -> List[Task]:
+        """Get list of properly completed tasks (with all required data)"""
+        if self.storage.queryable:
+            return self._materialize(self.storage.query(valid_completed=True))
+        return [
+            t for t in self.tasks 
+            if t.selesai and t.tanggal_selesai and t.durasi_aktual is not None
+        ]
+
+    def get_tasks_in_range(self, start: Optional[date], end: Optional[date],
+                           active_only: bool = False) -> List[Task]:
+        """Tasks with start <= deadline <= end (either side may be open), ordered by deadline"""
+        if self.storage.queryable:
+            return self._materialize(self.storage.query(
+                selesai=False if active_only else None, deadline_from=start, deadline_to=end
+            ))
+        self._ensure_deadline_indexes()
+        index = self._active_deadlines if active_only else self._deadlines
+        ids = index.range(start, end)
+        if ids and not self.loaded:
+            self._load_from_csv()
+        return [self._by_id[task_id] for task_id in ids]
+
+    def search_tasks(self, query: str, selesai: Optional[bool] = None,
+                     prioritas: Optional[Collection[str]] = None, limit: Optional[int] = None) -> List[Task]:
+        """Tasks whose name or description matches every word (or word prefix) of query, best first"""
+        self._ensure_search_index()
+        return [self._by_id[task_id] for task_id in self._search.search(query, selesai, prioritas, limit)]
+
+    def optimize_schedules(self, new_tasks: List[Task]) -> List[Dict]:
+        """Suggested time, priority score and similar tasks for each new task (see TimeOptimizer)"""
+        return self.optimizer.optimize_schedules(new_tasks)
+
+    def get_task_page(self, order: str = "deadline", selesai: Optional[bool] = None,
+                      prioritas: Optional[Collection[str]] = None, offset: int = 0,
+                      limit: int = 20) -> Tuple[List[Task], int]:
+        """One page of the filtered tasks in a TASK_ORDERS order and the number of matching tasks.
+
+        Filters are applied as masks over a cached sort of the columnar view,
+        so only the tasks on the page are looked up.
+        """
+        rows = self._task_order(order)
+        columns = self.columns
+        if selesai is not None or prioritas is not None:
+            mask = np.ones(len(columns), dtype=bool)
+            if selesai is not None:
+                mask &= columns.selesai == selesai
+            if prioritas is not None:
+                mask &= np.isin(columns.prioritas, [PRIORITY_CODES[p] for p in prioritas if p in PRIORITY_CODES])
+            rows = rows[mask[rows]]
+        ids = columns.ids
+        return [self.get_task(ids[row]) for row in rows[offset:offset + limit].tolist()], len(rows)
+
+    def get_overdue_tasks(self, today: Optional[date] = None) -> List[Task]:
+        """Active tasks whose deadline has passed, oldest first"""
+        today = today or datetime.now().date()
+        return self.get_tasks_in_range(None, today - timedelta(days=1), active_only=True)
+
+    def get_tasks_by_deadline(self, days: int = 7, start: Optional[date] = None) -> Dict[date, List[Task]]:
+        """Get tasks grouped by deadline for the specified days from start (default today)"""
+        start = start or datetime.now().date()
+        calendar = {start + timedelta(days=i): [] for i in range(days)}
+        for task in self.get_tasks_in_range(start, start + timedelta(days=days - 1)):
+            calendar[task.deadline].append(task)
         return calendar
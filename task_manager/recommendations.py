@@ -1,48 +1,86 @@
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from .models import Task
 
 
 class TimeOptimizer:
-    """Optimize time allocation for tasks using various algorithms"""
+    """Optimize time allocation for tasks using various algorithms.
+
+    The optimizer is long-lived: task vectors are kept in a SimilarityIndex
+    and refreshed through add() and remove() as tasks change, so a query
+    only weighs the new texts and multiplies them with the stored vectors
+    instead of refitting a vectorizer over every task.
+    """
+    
+    # Number of similar tasks considered per new task
+    N_SIMILAR = 3
+    
+    def __init__(self, tasks: Optional[List[Task]] = None):
+        self._tasks: Dict[str, Task] = {}
+        self._index = None
+        if tasks:
+            self.add_many(tasks)
+    
+    @property
+    def index(self):
+        """In-memory similarity index, created (and scikit-learn imported) on first use"""
+        if self._index is None:
+            from .similarity import SimilarityIndex
+            self._index = SimilarityIndex()
+        return self._index
     
-    def __init__(self, tasks: List[Task]):
-        self.tasks = tasks
-        self.vectorizer = TfidfVectorizer(stop_words="english")
+    @property
+    def tasks(self) -> List[Task]:
+        return list(self._tasks.values())
+    
+    def add(self, task: Task) -> None:
+        """Add a task, or refresh it after it changed"""
+        self._tasks[task.id] = task
+        self.index.add(task)
+    
+    def add_many(self, tasks: List[Task]) -> None:
+        """Add or refresh many tasks with one vectorizer pass"""
+        for task in tasks:
+            self._tasks[task.id] = task
+        self.index.add_many(tasks)
+    
+    def remove(self, task_id: str) -> None:
+        """Forget a task (no-op if it is unknown)"""
+        if self._tasks.pop(task_id, None) is not None:
+            self.index.remove(task_id)
     
     def optimize_schedule(self, new_task: Task) -> Dict:
         """Generate optimal schedule for new task considering existing tasks"""
-        # Content-based similarity
-        similar_tasks = self._find_similar_tasks(new_task)
-        
-        # Time optimization
-        optimal_time = self._find_optimal_time(new_task, similar_tasks)
-        
-        # Priority adjustment
-        priority_score = self._calculate_priority_score(new_task, similar_tasks)
-        
-        return {
-            'optimal_time': optimal_time,
-            'priority_score': priority_score,
-            'similar_tasks': similar_tasks
-        }
+        return self.optimize_schedules([new_task])[0]
+    
+    def optimize_schedules(self, new_tasks: List[Task]) -> List[Dict]:
+        """Schedules for many new tasks with one similarity query"""
+        schedules = []
+        for new_task, similar_tasks in zip(new_tasks, self.find_similar_tasks(new_tasks)):
+            schedules.append({
+                'optimal_time': self._find_optimal_time(new_task, similar_tasks),
+                'priority_score': self._calculate_priority_score(new_task, similar_tasks),
+                'similar_tasks': similar_tasks
+            })
+        return schedules
     
     def _find_similar_tasks(self, new_task: Task) -> List[Task]:
         """Find similar tasks using content-based filtering"""
-        if not self.tasks:
-            return []
-            
-        texts = [f"{t.nama} {t.deskripsi}" for t in self.tasks]
-        texts.append(f"{new_task.nama} {new_task.deskripsi}")
-        
-        tfidf_matrix = self.vectorizer.fit_transform(texts)
-        similarities = cosine_similarity(tfidf_matrix[-1:], tfidf_matrix[:-1])[0]
+        return self.find_similar_tasks([new_task])[0]
+    
+    def find_similar_tasks(self, new_tasks: List[Task], k: int = N_SIMILAR) -> List[List[Task]]:
+        """The k most similar known tasks for each new task, most similar first"""
+        if not self._tasks:
+            return [[] for _ in new_tasks]
         
-        similar_indices = np.argsort(similarities)[-3:]  # Top 3 similar tasks
-        return [self.tasks[i] for i in similar_indices]
+        texts = [f"{t.nama} {t.deskripsi}" for t in new_tasks]
+        # One extra neighbour in case a new task is already known and finds itself
+        neighbours = self.index.nearest_many(texts, k + 1)
+        return [
+            [self._tasks[task_id] for task_id in ids if task_id != new_task.id][:k]
+            for new_task, ids in zip(new_tasks, neighbours)
+        ]
     
     def _find_optimal_time(self, new_task: Task, similar_tasks: List[Task]) -> datetime:
         """Find optimal time slot considering similar tasks"""
@@ -0,0 +1,153 @@
+import heapq
+import math
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+from .columnar import PRIORITIES, PRIORITY_CODES
+
+
+Interval = Tuple[datetime, datetime]
+
+WORK_START = 9
+WORK_END = 17
+WORKDAYS = (0, 1, 2, 3, 4)
+SLOT_MINUTES = 30
+
+# Days by which a priority pulls a task forward in earliest-deadline-first order
+PRIORITY_SLACK = {"Tinggi": 2, "Sedang": 1, "Rendah": 0}
+# Hours planned for a task whose estimate is not a finite number (the default estimate of a task)
+FALLBACK_HOURS = 2.0
+
+
+class FreeTime:
+    """Free working time from a start moment onwards, minus busy intervals.
+
+    Working hours form one window per working day. Busy intervals are
+    merged and kept sorted, so the part of each window they cover is
+    found with a bisect lookup. take() consumes time from the front of
+    the timeline, so packing n tasks walks it only once.
+    """
+
+    def __init__(self, start: datetime, busy: Iterable[Interval] = (), work_start: int = WORK_START,
+                 work_end: int = WORK_END, workdays: Sequence[int] = WORKDAYS):
+        if not workdays or work_end <= work_start or not set(workdays) <= set(range(7)):
+            raise ValueError("Jam kerja tidak valid")
+        self.work_start = work_start
+        self.work_end = work_end
+        self.workdays = set(workdays)
+        self._busy = self._merge(busy)
+        self._busy_ends = [end for _, end in self._busy]
+        self._free = self._windows(self._round_up(start))
+        self._current: Optional[Interval] = None
+
+    @staticmethod
+    def _merge(intervals: Iterable[Interval]) -> List[Interval]:
+        """Sorted, non-overlapping union of intervals"""
+        merged: List[Interval] = []
+        for start, end in sorted(i for i in intervals if i[1] > i[0]):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    @staticmethod
+    def _round_up(moment: datetime) -> datetime:
+        """Next slot boundary at or after moment"""
+        moment = moment.replace(second=0, microsecond=0)
+        return moment + timedelta(minutes=-moment.minute % SLOT_MINUTES)
+
+    def _windows(self, start: datetime) -> Iterator[Interval]:
+        """Free intervals in chronological order, without end"""
+        day = start.date()
+        while True:
+            if day.weekday() in self.workdays:
+                window_start = max(start, datetime.combine(day, time(self.work_start)))
+                window_end = datetime.combine(day, time(self.work_end))
+                if window_start < window_end:
+                    yield from self._subtract_busy(window_start, window_end)
+            day += timedelta(days=1)
+
+    def _subtract_busy(self, start: datetime, end: datetime) -> Iterator[Interval]:
+        """Parts of [start, end) not covered by a busy interval"""
+        i = bisect_left(self._busy_ends, start)
+        while i < len(self._busy) and self._busy[i][0] < end:
+            busy_start, busy_end = self._busy[i]
+            if busy_start > start:
+                yield (start, busy_start)
+            start = max(start, busy_end)
+            i += 1
+        if start < end:
+            yield (start, end)
+
+    def take(self, hours: float) -> List[Interval]:
+        """Reserve the next hours of free time, split over windows when needed"""
+        if not math.isfinite(hours):
+            raise ValueError("Durasi harus berupa angka")
+        if self._current is None:
+            self._current = next(self._free)
+        remaining = timedelta(hours=max(hours, 0.0))
+        if not remaining:
+            return [(self._current[0], self._current[0])]
+
+        pieces = []
+        while remaining:
+            start, end = self._current
+            used = min(remaining, end - start)
+            pieces.append((start, start + used))
+            remaining -= used
+            self._current = (start + used, end) if start + used < end else next(self._free)
+        return pieces
+
+
+@dataclass
+class Schedule:
+    """Result of packing tasks: reserved intervals per task ID and the tasks that end too late"""
+    blocks: Dict[str, List[Interval]] = field(default_factory=dict)
+    late: List = field(default_factory=list)
+
+    def start(self, task_id: str) -> datetime:
+        return self.blocks[task_id][0][0]
+
+    def finish(self, task_id: str) -> datetime:
+        return self.blocks[task_id][-1][1]
+
+    @property
+    def late_ids(self) -> set:
+        return {task.id for task in self.late}
+
+
+def build_schedule(tasks: List, now: Optional[datetime] = None, busy: Iterable[Interval] = (),
+                   work_start: int = WORK_START, work_end: int = WORK_END,
+                   workdays: Sequence[int] = WORKDAYS) -> Schedule:
+    """Pack tasks into working hours by earliest deadline first with priority weighting.
+
+    A task's key is its deadline moved forward by PRIORITY_SLACK days, so
+    urgent high-priority work goes first; ties go to the higher priority,
+    then to the shorter task. Each task gets its durasi_estimasi hours of
+    the remaining free time, and is late when that ends after the working
+    hours of its deadline day. A NaN or infinite estimate is planned as
+    FALLBACK_HOURS.
+    """
+    free = FreeTime(now or datetime.now(), busy, work_start, work_end, workdays)
+    queue = [
+        (
+            task.deadline.toordinal() - PRIORITY_SLACK.get(task.prioritas, 0),
+            PRIORITY_CODES.get(task.prioritas, len(PRIORITIES)),
+            task.durasi_estimasi if math.isfinite(task.durasi_estimasi) else FALLBACK_HOURS,
+            i,
+            task
+        )
+        for i, task in enumerate(tasks)
+    ]
+    heapq.heapify(queue)
+
+    schedule = Schedule()
+    while queue:
+        _, _, hours, _, task = heapq.heappop(queue)
+        pieces = free.take(hours)
+        schedule.blocks[task.id] = pieces
+        if pieces[-1][1] > datetime.combine(task.deadline, time(work_end)):
+            schedule.late.append(task)
+    return schedule
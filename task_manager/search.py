@@ -0,0 +1,160 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from typing import Collection, Dict, List, Optional, Set, Tuple
+
+
+_TOKEN = re.compile(r"\w+")
+
+# Weight of a term occurrence in the task name relative to the description
+NAME_WEIGHT = 2.0
+# Score factors for a query term that is a prefix of, or inside, an indexed token
+PREFIX_FACTOR = 0.75
+INFIX_FACTOR = 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text"""
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """Inverted index over task names and descriptions.
+
+    Each token maps to the IDs of the tasks containing it with a weight
+    (name occurrences count NAME_WEIGHT, description occurrences 1). A
+    query term matches tokens equal to it, starting with it (found by
+    bisect in the sorted vocabulary) or, from three characters, containing
+    it (found through a trigram index over the vocabulary). Every term
+    must match; tasks are ranked by the summed weights scaled by match
+    kind and inverse document frequency. Status and priority are stored
+    per task so filters cost one lookup per candidate, and the work of a
+    query depends on the postings of its terms, not on the number of tasks.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+        self._grams: Dict[str, Set[str]] = {}
+        self._docs: Dict[str, Tuple[Dict[str, float], bool, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._docs
+
+    @staticmethod
+    def _weights(task) -> Dict[str, float]:
+        weights: Dict[str, float] = {}
+        for token in tokenize(task.nama):
+            weights[token] = weights.get(token, 0.0) + NAME_WEIGHT
+        for token in tokenize(task.deskripsi):
+            weights[token] = weights.get(token, 0.0) + 1.0
+        return weights
+
+    def add(self, task) -> None:
+        """Index a task, or refresh it if it is already indexed"""
+        weights = self._weights(task)
+        current = self._docs.get(task.id)
+        if current is not None and current[0] == weights:
+            self._docs[task.id] = (weights, task.selesai, task.prioritas)
+            return
+        self.remove(task.id)
+        self._docs[task.id] = (weights, task.selesai, task.prioritas)
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._vocabulary, token)
+                for gram in _trigrams(token):
+                    self._grams.setdefault(gram, set()).add(token)
+            postings[task.id] = weight
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task (no-op if it is not indexed)"""
+        doc = self._docs.pop(task_id, None)
+        if doc is None:
+            return
+        for token in doc[0]:
+            postings = self._postings[token]
+            del postings[task_id]
+            if postings:
+                continue
+            del self._postings[token]
+            del self._vocabulary[bisect_left(self._vocabulary, token)]
+            for gram in _trigrams(token):
+                tokens = self._grams[gram]
+                tokens.discard(token)
+                if not tokens:
+                    del self._grams[gram]
+
+    def _matches(self, term: str) -> Dict[str, float]:
+        """Indexed tokens matching a query term with their score factor"""
+        matches = {}
+        i = bisect_left(self._vocabulary, term)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(term):
+            token = self._vocabulary[i]
+            matches[token] = 1.0 if token == term else PREFIX_FACTOR
+            i += 1
+        grams = sorted((self._grams.get(gram, set()) for gram in _trigrams(term)), key=len)
+        if grams:
+            for token in grams[0].intersection(*grams[1:]):
+                if token not in matches and term in token:
+                    matches[token] = INFIX_FACTOR
+        return matches
+
+    def search(self, query: str, selesai: Optional[bool] = None,
+               prioritas: Optional[Collection[str]] = None, limit: Optional[int] = None) -> List[str]:
+        """IDs of tasks matching every term of query, best match first"""
+        terms = []
+        for term in dict.fromkeys(tokenize(query)):
+            matches = self._matches(term)
+            if not matches:
+                return []
+            size = sum(len(self._postings[token]) for token in matches)
+            terms.append((size, matches))
+        if not terms:
+            return []
+        terms.sort(key=lambda item: item[0])  # Most selective term first
+
+        total = len(self._docs)
+        scores: Optional[Dict[str, float]] = None
+        for _, matches in terms:
+            term_scores: Dict[str, float] = {}
+            for token, factor in matches.items():
+                postings = self._postings[token]
+                idf = math.log(1 + total / len(postings))
+                if scores is None:
+                    candidates = postings.items()
+                elif len(scores) < len(postings):
+                    # Later terms only narrow the candidates, so walk whichever side is smaller
+                    candidates = ((task_id, postings[task_id]) for task_id in scores if task_id in postings)
+                else:
+                    candidates = ((task_id, weight) for task_id, weight in postings.items() if task_id in scores)
+                for task_id, weight in candidates:
+                    if scores is None:
+                        _, done, priority = self._docs[task_id]
+                        if selesai is not None and done != selesai:
+                            continue
+                        if prioritas is not None and priority not in prioritas:
+                            continue
+                    score = weight * factor * idf
+                    if score > term_scores.get(task_id, 0.0):
+                        term_scores[task_id] = score
+            if scores is not None:
+                term_scores = {task_id: scores[task_id] + score for task_id, score in term_scores.items()}
+            scores = term_scores
+            if not scores:
+                return []
+
+        if limit is not None:
+            ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        else:
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [task_id for task_id, _ in ranked]
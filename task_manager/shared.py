@@ -0,0 +1,254 @@
+import copy
+import threading
+from contextlib import contextmanager
+from datetime import date
+from typing import Collection, List, Dict, Iterable, Optional, TextIO, Tuple
+from .models import Task, TaskManager
+from .scheduler import Schedule
+from .columnar import TaskColumns
+from . import transfer
+
+
+class ReadWriteLock:
+    """Many concurrent readers or a single writer; waiting writers block new readers"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class SharedTaskManager:
+    """One TaskManager shared by every session of the process.
+
+    Writes are serialized by a read-write lock and bump ``version``. Edits
+    are copy-on-write: the stored task is replaced by an edited copy, so
+    a task list handed out earlier never changes underneath its reader.
+    ``tasks`` and ``columns`` return views that are built once per version
+    and shared by all sessions, so memory does not grow with the number of
+    sessions and no write is lost to a concurrent save.
+    """
+
+    def __init__(self, manager: TaskManager):
+        self._manager = manager
+        self._lock = ReadWriteLock()
+        self.version = 0
+        self._tasks_view: Optional[Tuple[int, Tuple[Task, ...]]] = None
+        self._columns_view: Optional[Tuple[int, TaskColumns]] = None
+
+    @property
+    def storage(self):
+        return self._manager.storage
+
+    @contextmanager
+    def _reading(self, ready: bool = True):
+        """Lock for read paths; query-capable storage shares one connection and identity map.
+
+        Pass ready=False when the read would first build lazy manager state.
+        """
+        if not ready or self._manager.storage.queryable or not self._manager.loaded:
+            with self._lock.write():
+                yield
+        else:
+            with self._lock.read():
+                yield
+
+    def _bump(self) -> None:
+        self.version += 1
+
+    @property
+    def tasks(self) -> Tuple[Task, ...]:
+        """Immutable view of all tasks for the current version"""
+        view = self._tasks_view
+        if view is None or view[0] != self.version:
+            with self._reading():
+                view = (self.version, tuple(self._manager.tasks))
+            self._tasks_view = view
+        return view[1]
+
+    @property
+    def columns(self) -> TaskColumns:
+        """Columnar view for the current version, never mutated after it is handed out"""
+        view = self._columns_view
+        if view is None or view[0] != self.version:
+            with self._lock.write():
+                view = (self.version, self._manager.columns.copy())
+            self._columns_view = view
+        return view[1]
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        with self._reading():
+            return self._manager.get_task(task_id)
+
+    def optimize_schedules(self, new_tasks: List[Task]) -> List[Dict]:
+        with self._reading(self._manager.optimizer_ready):
+            return self._manager.optimize_schedules(new_tasks)
+
+    def get_task_page(self, order: str = "deadline", selesai: Optional[bool] = None,
+                      prioritas: Optional[Collection[str]] = None, offset: int = 0,
+                      limit: int = 20) -> Tuple[List[Task], int]:
+        with self._reading(self._manager.task_order_cached(order)):
+            return self._manager.get_task_page(order, selesai, prioritas, offset, limit)
+
+    def get_active_tasks(self) -> List[Task]:
+        with self._reading():
+            return self._manager.get_active_tasks()
+
+    def get_completed_tasks(self) -> List[Task]:
+        with self._reading():
+            return self._manager.get_completed_tasks()
+
+    def get_valid_completed_tasks(self) -> List[Task]:
+        with self._reading():
+            return self._manager.get_valid_completed_tasks()
+
+    def get_tasks_by_deadline(self, days: int = 7, start: Optional[date] = None) -> Dict[date, List[Task]]:
+        with self._reading(self._manager.deadline_indexed):
+            return self._manager.get_tasks_by_deadline(days, start)
+
+    def get_tasks_in_range(self, start: Optional[date], end: Optional[date],
+                           active_only: bool = False) -> List[Task]:
+        with self._reading(self._manager.deadline_indexed):
+            return self._manager.get_tasks_in_range(start, end, active_only)
+
+    def get_overdue_tasks(self, today: Optional[date] = None) -> List[Task]:
+        with self._reading(self._manager.deadline_indexed):
+            return self._manager.get_overdue_tasks(today)
+
+    def search_tasks(self, query: str, selesai: Optional[bool] = None,
+                     prioritas: Optional[Collection[str]] = None, limit: Optional[int] = None) -> List[Task]:
+        with self._reading(self._manager.search_indexed):
+            return self._manager.search_tasks(query, selesai, prioritas, limit)
+
+    def add_task(self, nama: str, deskripsi: str, prioritas: str, deadline: str) -> tuple:
+        with self._lock.write():
+            result = self._manager.add_task(nama, deskripsi, prioritas, deadline)
+            self._bump()
+            return result
+
+    def _draft(self, task: Task) -> Optional[Task]:
+        """Replace the stored task by a copy that can be edited without affecting readers"""
+        current = self._manager.get_task(task.id)
+        if current is None:
+            return None
+        draft = copy.copy(current)
+        self._manager.replace_task(current, draft)
+        return draft
+
+    def update_task(self, task: Task, **fields) -> bool:
+        with self._lock.write():
+            draft = self._draft(task)
+            if draft is None:
+                return False
+            result = self._manager.update_task(draft, **fields)
+            self._bump()
+            return result
+
+    def complete_task(self, task: Task, **fields) -> bool:
+        with self._lock.write():
+            draft = self._draft(task)
+            if draft is None:
+                return False
+            result = self._manager.complete_task(draft, **fields)
+            self._bump()
+            return result
+
+    def delete_task(self, task: Task) -> bool:
+        with self._lock.write():
+            current = self._manager.get_task(task.id)
+            if current is None:
+                return False
+            result = self._manager.delete_task(current)
+            self._bump()
+            return result
+
+    def add_tasks(self, tasks: Iterable[Task]) -> List[Task]:
+        with self._lock.write():
+            added = self._manager.add_tasks(tasks)
+            self._bump()
+            return added
+
+    def update_tasks(self, tasks: Iterable[Task]) -> int:
+        """Store edited copies of tasks; instances handed out by this class must not be edited"""
+        with self._lock.write():
+            result = self._manager.update_tasks(tasks)
+            self._bump()
+            return result
+
+    def delete_tasks(self, tasks: Iterable[Task]) -> int:
+        with self._lock.write():
+            current = [self._manager.get_task(task.id) for task in tasks]
+            result = self._manager.delete_tasks(t for t in current if t is not None)
+            self._bump()
+            return result
+
+    def schedule_active_tasks(self) -> Schedule:
+        """Reschedule every active task, replacing them by rescheduled copies"""
+        with self._lock.write():
+            drafts = [copy.copy(task) for task in self._manager.get_active_tasks()]
+            schedule = self._manager.schedule_active_tasks(drafts)
+            self._bump()
+            return schedule
+
+    def import_tasks(self, stream: TextIO, fmt: str) -> Dict[str, int]:
+        """Import a CSV or JSON Lines stream as one write"""
+        with self._lock.write():
+            stats = transfer.import_tasks(self._manager, stream, fmt)
+            self._bump()
+            return stats
+
+    def export_tasks(self, stream: TextIO, fmt: str) -> int:
+        """Write all tasks to a CSV or JSON Lines stream"""
+        with self._reading():
+            return transfer.export_tasks(self._manager, stream, fmt)
+
+    @property
+    def similarity_ready(self) -> bool:
+        return self._manager.similarity_ready
+
+    def new_similarity_index(self):
+        return self._manager.new_similarity_index()
+
+    def install_similarity(self, index) -> int:
+        """Attach an index synced off-lock and re-estimate the tasks added meanwhile, returns their number"""
+        with self._lock.write():
+            drafts = [copy.copy(task) for task in self._manager.install_similarity(index)]
+            for draft in drafts:
+                draft.waktu_rekomendasi = None  # update_tasks() generates a fresh one
+            self._manager.update_tasks(drafts)
+            self._bump()
+            return len(drafts)
+
+    def save_to_csv(self) -> bool:
+        with self._lock.write():
+            return self._manager.save_to_csv()
@@ -0,0 +1,306 @@
+import os
+from typing import List, Dict, Optional, Set
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from .metrics import timed
+
+
+class SimilarityIndex:
+    """Incremental, persisted TF-IDF index over completed tasks.
+
+    Task text is hashed into a fixed feature space, so no vocabulary has to
+    be refitted when tasks are added. Document frequencies are kept as
+    running counts and each vector is IDF-weighted with the statistics at
+    insertion time. New vectors are buffered and merged into the main matrix
+    in batches, and the merged index is written to an ``.npz`` file so it
+    survives restarts.
+    """
+
+    N_FEATURES = 2 ** 18
+    MERGE_EVERY = 256
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.vectorizer = HashingVectorizer(
+            n_features=self.N_FEATURES, alternate_sign=False, norm=None, stop_words="english"
+        )
+        self._reset()
+        if path and os.path.exists(path):
+            try:
+                self._load()
+            except Exception as e:
+                print(f"Warning: Rebuilding similarity index - {e}")
+                self._reset()
+
+    def _reset(self) -> None:
+        """Start from an empty index"""
+        self._matrix = sp.csr_matrix((0, self.N_FEATURES), dtype=np.float64)
+        self._columns = self._matrix.tocsc()
+        self._pending: List[sp.csr_matrix] = []
+        # Transposed stack of the pending vectors, built on first query
+        self._pending_stack: Optional[sp.csr_matrix] = None
+        self._ids: List[str] = []
+        self._stamps: List[str] = []
+        self._durations: List[float] = []
+        self._alive: List[bool] = []
+        # Positions of removed rows, dropped at the next merge
+        self._dead: Set[int] = set()
+        self._positions: Dict[str, int] = {}
+        self._df = np.zeros(self.N_FEATURES, dtype=np.int64)
+        self._n_docs = 0
+
+    @staticmethod
+    def _text(task) -> str:
+        return f"{task.nama} {task.deskripsi}"
+
+    @classmethod
+    def _stamp(cls, task) -> str:
+        """Fingerprint of the indexed fields, used to detect stale entries"""
+        return f"{cls._text(task)}\x1f{task.durasi_aktual}"
+
+    def _idf(self, indices: np.ndarray) -> np.ndarray:
+        """Smoothed IDF (as in TfidfVectorizer) for the given features"""
+        return np.log((1 + self._n_docs) / (1 + self._df[indices])) + 1
+
+    def _weigh(self, text: str) -> sp.csr_matrix:
+        """Hashed term counts of text as an L2-normalized TF-IDF row"""
+        return self._weigh_many([text])
+
+    def _weigh_many(self, texts: List[str]) -> sp.csr_matrix:
+        """L2-normalized TF-IDF rows for several texts at once"""
+        rows = self.vectorizer.transform(texts).tocsr()
+        rows.data = rows.data * self._idf(rows.indices)
+        lengths = np.diff(rows.indptr)
+        row_of = np.repeat(np.arange(len(lengths)), lengths)
+        norms = np.sqrt(np.bincount(row_of, weights=rows.data ** 2, minlength=len(lengths)))
+        norms[norms == 0] = 1.0
+        rows.data /= norms[row_of]
+        return rows
+
+    def _row_indices(self, position: int) -> np.ndarray:
+        """Feature indices stored for the row at position"""
+        main_rows = self._matrix.shape[0]
+        if position < main_rows:
+            start, end = self._matrix.indptr[position], self._matrix.indptr[position + 1]
+            return self._matrix.indices[start:end]
+        return self._pending[position - main_rows].indices
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, task) -> None:
+        """Add or refresh a completed task's vector"""
+        if task.id in self._positions:
+            if self._stamps[self._positions[task.id]] == self._stamp(task):
+                return
+            self.remove(task.id)
+
+        counts = self.vectorizer.transform([self._text(task)])
+        self._df[counts.indices] += 1
+        self._n_docs += 1
+
+        self._positions[task.id] = len(self._ids)
+        self._ids.append(task.id)
+        self._stamps.append(self._stamp(task))
+        self._durations.append(self._duration_of(task))
+        self._alive.append(True)
+        self._pending.append(self._weigh(self._text(task)))
+        self._pending_stack = None
+
+        if len(self._pending) >= self.MERGE_EVERY:
+            self.save()
+
+    @staticmethod
+    def _duration_of(task) -> float:
+        return float(task.durasi_aktual) if task.durasi_aktual is not None else np.nan
+
+    @timed("similarity.fit")
+    def add_many(self, tasks: List) -> None:
+        """Add or refresh many tasks with one vectorizer pass and one merge"""
+        fresh = {}
+        for task in tasks:
+            position = self._positions.get(task.id)
+            if position is not None:
+                if self._stamps[position] == self._stamp(task):
+                    continue
+                self.remove(task.id)
+            fresh[task.id] = task
+        if not fresh:
+            return
+
+        texts = [self._text(task) for task in fresh.values()]
+        counts = self.vectorizer.transform(texts).tocsr()
+        self._df += np.bincount(counts.indices, minlength=self.N_FEATURES)
+        self._n_docs += len(fresh)
+        rows = self._weigh_many(texts)
+
+        self._merge()
+        for task in fresh.values():
+            self._positions[task.id] = len(self._ids)
+            self._ids.append(task.id)
+            self._stamps.append(self._stamp(task))
+            self._durations.append(self._duration_of(task))
+        self._alive = [True] * len(self._ids)
+        self._matrix = sp.vstack([self._matrix, rows], format="csr")
+        self._columns = self._matrix.tocsc()
+
+    def remove(self, task_id: str) -> None:
+        """Drop a task from the index (no-op if it is not indexed)"""
+        position = self._positions.pop(task_id, None)
+        if position is None:
+            return
+        self._alive[position] = False
+        self._dead.add(position)
+        self._df[self._row_indices(position)] -= 1
+        self._n_docs -= 1
+
+    @timed("similarity.sync")
+    def sync(self, completed_tasks: List) -> bool:
+        """Reconcile the index with the current completed tasks, returns True if changed.
+
+        Missing and stale tasks are vectorized in one add_many() call and the
+        index is saved once, so a cold sync costs one pass over the tasks.
+        """
+        current = {t.id: t for t in completed_tasks}
+        gone = [task_id for task_id in self._positions if task_id not in current]
+        for task_id in gone:
+            self.remove(task_id)
+        fresh = [
+            task for task_id, task in current.items()
+            if task_id not in self._positions or self._stamps[self._positions[task_id]] != self._stamp(task)
+        ]
+        if fresh:
+            self.add_many(fresh)
+        changed = bool(gone or fresh)
+        if changed:
+            self.save()
+        return changed
+
+    def _merge(self) -> None:
+        """Fold pending vectors into the main matrix and drop removed rows"""
+        if not self._pending and not self._dead:
+            return
+        matrix = sp.vstack([self._matrix] + self._pending, format="csr") if self._pending else self._matrix
+        keep = np.flatnonzero(self._alive)
+        if len(keep) < matrix.shape[0]:
+            matrix = matrix[keep]
+        self._matrix = matrix
+        self._columns = matrix.tocsc()
+        self._pending = []
+        self._pending_stack = None
+        self._ids = [self._ids[i] for i in keep]
+        self._stamps = [self._stamps[i] for i in keep]
+        self._durations = [self._durations[i] for i in keep]
+        self._alive = [True] * len(keep)
+        self._dead = set()
+        self._positions = {task_id: i for i, task_id in enumerate(self._ids)}
+
+    def nearest(self, text: str, k: int = 3) -> List[str]:
+        """IDs of the k most similar indexed tasks"""
+        if not self._positions:
+            return []
+
+        query = self._weigh(text)
+        scores = np.zeros(len(self._ids))
+        main_rows = self._matrix.shape[0]
+        if main_rows and query.nnz:
+            # Only the columns of the query terms take part in the dot product
+            scores[:main_rows] = self._columns[:, query.indices] @ query.data
+        for i, row in enumerate(self._pending):
+            scores[main_rows + i] = row.multiply(query).sum()
+        scores[~np.asarray(self._alive)] = -np.inf
+
+        k = min(k, len(self._positions))
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [self._ids[i] for i in top]
+
+    @timed("similarity.query")
+    def nearest_many(self, texts: List[str], k: int = 3) -> List[List[str]]:
+        """IDs of the k most similar indexed tasks for each text, most similar first.
+
+        The queries are multiplied with the transposed index, so only rows
+        sharing a term with a query are touched. Vectors added since the
+        last merge are scored separately and removed rows are skipped, so
+        querying never forces a merge.
+        """
+        if not self._positions:
+            return [[] for _ in texts]
+
+        queries = self._weigh_many(texts)
+        scores = (queries @ self._columns.T).tocsr()
+        main_rows = self._matrix.shape[0]
+        if self._pending:
+            if self._pending_stack is None:
+                # Stored transposed, like the main matrix, so products only visit query terms
+                self._pending_stack = sp.vstack(self._pending, format="csr").T.tocsr()
+            pending_scores = queries @ self._pending_stack
+        dead = np.fromiter(self._dead, dtype=np.int64, count=len(self._dead))
+        k = min(k, len(self._positions))
+        results = []
+        for i in range(len(texts)):
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            rows, values = scores.indices[start:end], scores.data[start:end]
+            if self._pending:
+                start, end = pending_scores.indptr[i], pending_scores.indptr[i + 1]
+                rows = np.concatenate([rows, pending_scores.indices[start:end] + main_rows])
+                values = np.concatenate([values, pending_scores.data[start:end]])
+            if len(dead):
+                alive = ~np.isin(rows, dead)
+                rows, values = rows[alive], values[alive]
+            if len(rows) > k:
+                best = np.argpartition(-values, k - 1)[:k]
+                rows, values = rows[best], values[best]
+            top = rows[np.argsort(-values, kind="stable")].tolist()
+            # Fewer than k overlapping tasks: fill up with zero-score ones
+            chosen = set(top)
+            for row in range(len(self._ids)):
+                if len(top) >= k:
+                    break
+                if self._alive[row] and row not in chosen:
+                    top.append(row)
+            results.append([self._ids[row] for row in top])
+        return results
+
+    def duration(self, task_id: str) -> float:
+        """Actual duration stored for an indexed task"""
+        return self._durations[self._positions[task_id]]
+
+    def save(self) -> None:
+        """Merge pending vectors and persist the index atomically"""
+        self._merge()
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                data=self._matrix.data,
+                indices=self._matrix.indices,
+                indptr=self._matrix.indptr,
+                ids=np.array(self._ids, dtype=str),
+                stamps=np.array(self._stamps, dtype=str),
+                durations=np.array(self._durations, dtype=np.float64),
+                df=self._df,
+                n_docs=np.array(self._n_docs)
+            )
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        """Restore a previously saved index"""
+        with np.load(self.path) as data:
+            self._matrix = sp.csr_matrix(
+                (data["data"], data["indices"], data["indptr"]),
+                shape=(len(data["indptr"]) - 1, self.N_FEATURES)
+            )
+            self._ids = data["ids"].tolist()
+            self._stamps = data["stamps"].tolist()
+            self._durations = data["durations"].tolist()
+            self._df = data["df"]
+            self._n_docs = int(data["n_docs"])
+        self._columns = self._matrix.tocsc()
+        self._pending = []
+        self._pending_stack = None
+        self._alive = [True] * len(self._ids)
+        self._dead = set()
+        self._positions = {task_id: i for i, task_id in enumerate(self._ids)}
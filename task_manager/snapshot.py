@@ -0,0 +1,218 @@
+import json
+import os
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+import numpy as np
+from .columnar import TaskColumns, PRIORITIES, PRIORITY_CODES, EPOCH_ORDINAL
+
+
+MAGIC = b"TMSNAP01"
+ALIGNMENT = 64
+
+# Minutes since the epoch; NO_TIME marks an empty waktu_rekomendasi
+NO_TIME = np.iinfo(np.int64).min
+
+_NUMERIC_FIELDS = [
+    ("deadline", "<i4"),
+    ("tanggal_selesai", "<i4"),
+    ("durasi_estimasi", "<f8"),
+    ("durasi_aktual", "<f8"),
+    ("selesai", "?"),
+    ("prioritas", "i1"),
+    ("hour", "i1"),
+    ("waktu", "<i8"),
+]
+
+
+def _source_stamp(path: str) -> Optional[List[int]]:
+    """Size and modification time identifying one version of the source file"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _dtype(descr) -> np.dtype:
+    """Rebuild a dtype from its JSON-serialized description"""
+    if isinstance(descr, list):
+        return np.dtype([tuple(field) for field in descr])
+    return np.dtype(descr)
+
+
+def _data_start(header_len: int) -> int:
+    """Aligned file offset where the first section begins"""
+    end = len(MAGIC) + 8 + header_len
+    return end + (-end % ALIGNMENT)
+
+
+def _encode_text(values: List[str]) -> tuple:
+    """Concatenate UTF-8 encoded strings and return (blob, byte offsets)"""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class TaskSnapshot:
+    """Memory-mapped binary snapshot of a task CSV file.
+
+    The file holds a JSON header followed by aligned sections: one structured
+    array with the numeric columns and IDs, and a UTF-8 blob plus offsets for
+    each text field. Opening only reads the header and maps the sections, so
+    it takes constant time; text is decoded when tasks are materialized.
+    A snapshot is only used while the size and mtime of the source CSV match
+    the stamp recorded when it was written.
+    """
+
+    def __init__(self, path: str, header: Dict, data_start: int):
+        self.path = path
+        self.header = header
+        self.count = header["count"]
+        self._sections = {}
+        for name, (offset, descr, length) in header["sections"].items():
+            dtype = _dtype(descr)
+            if length:
+                self._sections[name] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=data_start + offset, shape=(length,)
+                )
+            else:
+                self._sections[name] = np.zeros(0, dtype=dtype)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @classmethod
+    def open(cls, path: str, source_path: str) -> Optional['TaskSnapshot']:
+        """Open a snapshot if it exists and still matches the source file"""
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                header_len = int.from_bytes(f.read(8), "little")
+                header = json.loads(f.read(header_len))
+        except (OSError, ValueError):
+            return None
+        if header.get("source") != _source_stamp(source_path):
+            return None
+        return cls(path, header, _data_start(header_len))
+
+    @staticmethod
+    def write(path: str, tasks: List, source_path: str) -> None:
+        """Write tasks to a snapshot of source_path, atomically replacing any old one"""
+        n = len(tasks)
+        # UTF-8 in a fixed-width field, whose NUL padding only a trailing NUL could be mistaken for
+        ids = [t.id.encode("utf-8") for t in tasks]
+        if any(i.endswith(b"\0") for i in ids):
+            raise ValueError("ID tugas tidak boleh diakhiri karakter NUL")
+        id_width = max([len(i) for i in ids] + [1])
+        dtype = np.dtype(_NUMERIC_FIELDS + [("id", f"S{id_width}")])
+
+        columns = TaskColumns.from_tasks(tasks)
+        numeric = np.zeros(n, dtype=dtype)
+        for name, _ in _NUMERIC_FIELDS:
+            if name != "waktu":
+                numeric[name] = getattr(columns, name)
+        epoch = datetime(1970, 1, 1)
+        numeric["waktu"] = [
+            (t.waktu_rekomendasi - epoch) // timedelta(minutes=1) if t.waktu_rekomendasi else NO_TIME
+            for t in tasks
+        ]
+        numeric["id"] = ids
+
+        sections = {"numeric": numeric}
+        for field in ("nama", "deskripsi"):
+            blob, offsets = _encode_text([getattr(t, field) for t in tasks])
+            sections[field] = blob
+            sections[f"{field}_offsets"] = offsets
+
+        # Priorities outside PRIORITIES keep their text in a separate section
+        unknown = [i for i, t in enumerate(tasks) if t.prioritas not in PRIORITY_CODES]
+        blob, offsets = _encode_text([tasks[i].prioritas for i in unknown])
+        sections["prioritas_lain"] = blob
+        sections["prioritas_lain_offsets"] = offsets
+        sections["prioritas_lain_rows"] = np.array(unknown, dtype=np.int64)
+
+        header = {"version": 1, "count": n, "source": _source_stamp(source_path), "sections": {}}
+        offset = 0
+        for name, array in sections.items():
+            offset += -offset % ALIGNMENT
+            descr = array.dtype.descr if array.dtype.names else array.dtype.str
+            header["sections"][name] = [offset, descr, len(array)]
+            offset += array.nbytes
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = _data_start(len(header_bytes))
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header_bytes).to_bytes(8, "little"))
+            f.write(header_bytes)
+            for name, array in sections.items():
+                f.write(b"\0" * (data_start + header["sections"][name][0] - f.tell()))
+                f.write(array.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def columns(self) -> TaskColumns:
+        """Columnar view built from the mapped arrays, without creating tasks"""
+        numeric = self._sections["numeric"]
+        arrays = {name: numeric[name] for name, _ in _NUMERIC_FIELDS if name != "waktu"}
+        return TaskColumns.from_arrays(arrays, numeric["id"])
+
+    def _text(self, field: str) -> List[str]:
+        """Decode one text field for every entry of its section"""
+        raw = self._sections[field].tobytes()
+        offsets = self._sections[f"{field}_offsets"].tolist()
+        return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def text(self, field: str, index: int) -> str:
+        """Decode one text field of a single task"""
+        offsets = self._sections[f"{field}_offsets"]
+        return self._sections[field][offsets[index]:offsets[index + 1]].tobytes().decode("utf-8")
+
+    def load_tasks(self, task_class: type) -> List:
+        """Materialize every task, decoding its text fields"""
+        numeric = self._sections["numeric"]
+        n = self.count
+        nama = self._text("nama")
+        deskripsi = self._text("deskripsi")
+        ids = [i.decode("utf-8") for i in numeric["id"].tolist()]
+
+        prioritas = [PRIORITIES[c] if c >= 0 else None for c in numeric["prioritas"].tolist()]
+        for row, value in zip(self._sections["prioritas_lain_rows"].tolist(), self._text("prioritas_lain")):
+            prioritas[row] = value
+
+        cache: Dict = {}
+        def _dates(ordinals: np.ndarray) -> List:
+            values = (ordinals.astype(np.int64) - EPOCH_ORDINAL).astype("datetime64[D]").astype(object)
+            return [cache.setdefault(v, v) for v in values]
+
+        deadlines = _dates(numeric["deadline"])
+        completion = numeric["tanggal_selesai"]
+        tanggal_selesai = _dates(np.where(completion > 0, completion, 1))
+        has_completion = (completion > 0).tolist()
+        waktu = numeric["waktu"]
+        waktu_rekomendasi = np.where(waktu == NO_TIME, 0, waktu).astype("datetime64[m]").astype(object).tolist()
+        has_waktu = (waktu != NO_TIME).tolist()
+        selesai = numeric["selesai"].tolist()
+        aktual = numeric["durasi_aktual"].tolist()
+        estimasi = numeric["durasi_estimasi"].tolist()
+
+        tasks = []
+        for i in range(n):
+            task = task_class(
+                nama=nama[i],
+                deskripsi=deskripsi[i],
+                prioritas=prioritas[i],
+                deadline=deadlines[i],
+                selesai=selesai[i],
+                tanggal_selesai=tanggal_selesai[i] if has_completion[i] else None,
+                durasi_aktual=aktual[i] if aktual[i] == aktual[i] else None,  # NaN means empty
+                waktu_rekomendasi=waktu_rekomendasi[i] if has_waktu[i] else None,
+                id=ids[i]
+            )
+            task.durasi_estimasi = estimasi[i]
+            tasks.append(task)
+        return tasks
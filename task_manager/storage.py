@@ -0,0 +1,441 @@
+import csv
+import json
+import os
+import sqlite3
+import sys
+import uuid
+from datetime import date
+from typing import List, Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+from .loader import load_tasks_bulk, iter_task_chunks, DEFAULT_CHUNKSIZE
+
+
+FIELDNAMES = [
+    "Nama", "Deskripsi", "Prioritas", "Deadline",
+    "Selesai", "Tanggal_Selesai", "Durasi_Aktual",
+    "Durasi_Estimasi", "Waktu_Rekomendasi", "ID"
+]
+
+
+def _write_csv_atomic(path: str, rows: List[Dict]) -> None:
+    """Write rows to a temporary file and atomically swap it into place"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class TaskStorage:
+    """Interface for task persistence backends working on CSV-style row dicts"""
+
+    # Backend can persist single add/update/delete records via append()
+    incremental = False
+    # Backend can answer filtered queries without loading every task
+    queryable = False
+    # Opened only for reading: no compaction, truncation or other writes
+    read_only = False
+
+    def load(self) -> List[Dict]:
+        """Return every stored task row"""
+        raise NotImplementedError
+
+    def save_all(self, rows: List[Dict]) -> None:
+        """Replace the stored data with the given rows"""
+        raise NotImplementedError
+
+    def load_tasks(self, task_class: type) -> List:
+        """Build task objects for every stored row, skipping unrecoverable rows"""
+        tasks = []
+        for row in self.load():
+            try:
+                tasks.append(task_class.from_dict(row))
+            except ValueError as e:
+                print(f"Warning: Skipping invalid task - {e}")
+        return tasks
+
+    def iter_task_chunks(self, task_class: type, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[List]:
+        """Yield stored tasks in chunks; backends may stream instead of loading everything"""
+        tasks = self.load_tasks(task_class)
+        for start in range(0, len(tasks), chunksize):
+            yield tasks[start:start + chunksize]
+
+    def append(self, op: str, row: Dict) -> None:
+        """Persist a single add/update/delete record"""
+        raise NotImplementedError
+
+    def append_many(self, records: List[Tuple[str, Dict]]) -> None:
+        """Persist several (op, row) records; backends may write them in one go"""
+        for op, row in records:
+            self.append(op, row)
+
+    def needs_compaction(self) -> bool:
+        """Whether save_all() should be called to fold pending records"""
+        return False
+
+    def query(self, selesai: Optional[bool] = None, valid_completed: bool = False,
+              deadline_from: Optional[date] = None, deadline_to: Optional[date] = None) -> List[Dict]:
+        """Return rows matching the filters, ordered by deadline"""
+        raise NotImplementedError
+
+    def get_many(self, task_ids: List[str]) -> List[Dict]:
+        """Return the stored rows of the given task IDs (missing IDs are left out)"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Number of stored tasks"""
+        return len(self.load())
+
+
+class CSVStorage(TaskStorage):
+    """Plain CSV storage that rewrites the whole file on every save"""
+
+    def __init__(self, path: str = "tugas.csv"):
+        self.path = path
+
+    def load(self) -> List[Dict]:
+        """Read all task rows from the CSV file"""
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+
+    def save_all(self, rows: List[Dict]) -> None:
+        """Replace the stored data with the given rows"""
+        _write_csv_atomic(self.path, rows)
+
+    def load_tasks(self, task_class: type) -> List:
+        """Bulk-load tasks with column-wise parsing instead of per-row from_dict"""
+        return load_tasks_bulk(self.path, task_class)
+
+    def iter_task_chunks(self, task_class: type, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[List]:
+        """Stream tasks from the CSV file without materializing all of them"""
+        return iter_task_chunks(self.path, task_class, chunksize)
+
+    def replay_journal(self) -> Dict[str, Optional[Dict]]:
+        """Changes recorded on top of the CSV file (none for plain CSV storage)"""
+        return {}
+
+    def apply_journal(self, tasks: List, task_class: type) -> List:
+        """Apply journaled changes to tasks loaded from the CSV file"""
+        changes = self.replay_journal()
+        if not changes:
+            return tasks
+
+        positions = {task.id: i for i, task in enumerate(tasks)}
+        for task_id, row in changes.items():
+            task = None
+            if row is not None:
+                try:
+                    task = task_class.from_dict(row)
+                except ValueError as e:
+                    print(f"Warning: Skipping invalid task - {e}")
+            if task_id in positions:
+                tasks[positions[task_id]] = task
+            elif task is not None:
+                tasks.append(task)
+        return [task for task in tasks if task is not None]
+
+
+class JournalStorage(CSVStorage):
+    """CSV snapshot plus an append-only journal of add/update/delete records.
+
+    Every mutation appends one JSON line to the journal, so saving a single
+    edit costs O(1) bytes. Once the journal holds ``compact_every`` records
+    it is folded into a fresh snapshot. Snapshots are written to a temporary
+    file and renamed into place, and a torn last journal line (crash during
+    append) is discarded on replay, so a crash never corrupts stored data.
+    """
+
+    incremental = True
+
+    def __init__(self, path: str = "tugas.csv", journal_path: Optional[str] = None,
+                 compact_every: int = 500, read_only: bool = False):
+        super().__init__(path)
+        self.journal_path = journal_path or f"{os.path.splitext(path)[0]}.journal"
+        self.compact_every = compact_every
+        # For readers next to a process that writes: a torn last record may still be being appended
+        self.read_only = read_only
+        self._journal_records = 0
+
+    def load(self) -> List[Dict]:
+        """Read the snapshot and replay the journal on top of it"""
+        rows = super().load()
+        needs_compaction = False
+        for row in rows:
+            if not (row.get("ID") or "").strip():
+                # Legacy snapshot without IDs: journal records need stable keys
+                row["ID"] = uuid.uuid4().hex
+                needs_compaction = True
+
+        state = {row["ID"]: row for row in rows}
+        self._journal_records = self._replay(state)
+        rows = [row for row in state.values() if row is not None]
+
+        if (needs_compaction or self._journal_records >= self.compact_every) and not self.read_only:
+            self.save_all(rows)
+        return rows
+
+    def load_tasks(self, task_class: type) -> List:
+        """Bulk-load the CSV snapshot and apply the journal on top of it"""
+        stats: Dict = {}
+        tasks = self.apply_journal(load_tasks_bulk(self.path, task_class, stats=stats), task_class)
+
+        # Legacy snapshot without IDs: journal records need stable keys
+        if (stats.get("missing_ids") or self._journal_records >= self.compact_every) and not self.read_only:
+            self.save_all([task.to_dict() for task in tasks])
+        return tasks
+
+    def iter_task_chunks(self, task_class: type, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[List]:
+        """Stream the snapshot directly when no journal records are pending"""
+        if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path):
+            return TaskStorage.iter_task_chunks(self, task_class, chunksize)
+        return iter_task_chunks(self.path, task_class, chunksize)
+
+    def replay_journal(self) -> Dict[str, Optional[Dict]]:
+        """Final row per task ID changed by the journal (None for deleted tasks)"""
+        changes: Dict[str, Optional[Dict]] = {}
+        self._journal_records = self._replay(changes)
+        return changes
+
+    def _replay(self, state: Dict[str, Optional[Dict]]) -> int:
+        """Apply journal records to state, truncating a torn trailing record"""
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        applied = 0
+        valid_until = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    op, task_id = record["op"], record["id"]
+                except (ValueError, KeyError, TypeError):
+                    break
+                state[task_id] = None if op == "delete" else record["task"]
+                applied += 1
+                valid_until += len(line)
+
+        if valid_until < os.path.getsize(self.journal_path) and not self.read_only:
+            print("Warning: Discarding incomplete journal record")
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(valid_until)
+        return applied
+
+    def append(self, op: str, row: Dict) -> None:
+        """Durably append a single add/update/delete record to the journal"""
+        self.append_many([(op, row)])
+
+    def append_many(self, records: List[Tuple[str, Dict]]) -> None:
+        """Durably append records to the journal with a single fsync"""
+        self._check_writable()
+        lines = []
+        for op, row in records:
+            record = {"op": op, "id": row["ID"], "task": row if op != "delete" else None}
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        with open(self.journal_path, "a", encoding='utf-8') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_records += len(lines)
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise PermissionError(f"{self.path} dibuka hanya untuk dibaca")
+
+    def needs_compaction(self) -> bool:
+        """Whether the journal has grown enough to fold into a snapshot"""
+        return self._journal_records >= self.compact_every
+
+    def save_all(self, rows: List[Dict]) -> None:
+        """Write a fresh snapshot and reset the journal"""
+        self._check_writable()
+        super().save_all(rows)
+        # Replaying records over the new snapshot is idempotent, so a crash
+        # between the rename above and this truncate loses nothing.
+        with open(self.journal_path, "w", encoding='utf-8'):
+            pass
+        self._journal_records = 0
+
+
+class SQLiteStorage(TaskStorage):
+    """SQLite storage (WAL mode) with indexes on deadline and on status plus deadline.
+
+    Rows are upserted or deleted one at a time, and the filters used by
+    TaskManager's views run as indexed queries, so neither startup nor the
+    common views need to read the whole dataset.
+    """
+
+    incremental = True
+    queryable = True
+
+    def __init__(self, path: str = "tugas.db", read_only: bool = False):
+        self.path = path
+        self.read_only = read_only
+        if read_only:
+            self._conn = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True,
+                                         check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            return
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS tasks (
+                    ID TEXT PRIMARY KEY,
+                    Nama TEXT NOT NULL,
+                    Deskripsi TEXT NOT NULL DEFAULT '',
+                    Prioritas TEXT NOT NULL,
+                    Deadline TEXT NOT NULL,
+                    Selesai INTEGER NOT NULL DEFAULT 0,
+                    Tanggal_Selesai TEXT NOT NULL DEFAULT '',
+                    Durasi_Aktual REAL,
+                    Durasi_Estimasi REAL,
+                    Waktu_Rekomendasi TEXT NOT NULL DEFAULT ''
+                )"""
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks (Deadline)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_selesai ON tasks (Selesai, Deadline)")
+            # No query filters on priority alone, so databases created before are rid of that index
+            self._conn.execute("DROP INDEX IF EXISTS idx_tasks_prioritas")
+
+    @staticmethod
+    def _to_params(row: Dict) -> tuple:
+        """Convert a CSV-style row into SQL column values"""
+        def _float(value):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+
+        return (
+            row["ID"],
+            (row.get("Nama") or "").strip(),
+            (row.get("Deskripsi") or "").strip(),
+            (row.get("Prioritas") or "").strip(),
+            (row.get("Deadline") or "").strip(),
+            1 if (row.get("Selesai") or "").strip().lower() == "true" else 0,
+            (row.get("Tanggal_Selesai") or "").strip(),
+            _float(row.get("Durasi_Aktual")),
+            _float(row.get("Durasi_Estimasi")),
+            (row.get("Waktu_Rekomendasi") or "").strip(),
+        )
+
+    @staticmethod
+    def _to_row(record: sqlite3.Row) -> Dict:
+        """Convert an SQL record back into a CSV-style row"""
+        return {
+            "Nama": record["Nama"],
+            "Deskripsi": record["Deskripsi"],
+            "Prioritas": record["Prioritas"],
+            "Deadline": record["Deadline"],
+            "Selesai": str(bool(record["Selesai"])),
+            "Tanggal_Selesai": record["Tanggal_Selesai"],
+            "Durasi_Aktual": str(record["Durasi_Aktual"]) if record["Durasi_Aktual"] is not None else "",
+            "Durasi_Estimasi": str(record["Durasi_Estimasi"]) if record["Durasi_Estimasi"] is not None else "",
+            "Waktu_Rekomendasi": record["Waktu_Rekomendasi"],
+            "ID": record["ID"],
+        }
+
+    _UPSERT = (
+        "INSERT OR REPLACE INTO tasks (ID, Nama, Deskripsi, Prioritas, Deadline, Selesai, "
+        "Tanggal_Selesai, Durasi_Aktual, Durasi_Estimasi, Waktu_Rekomendasi) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+
+    def load(self) -> List[Dict]:
+        """Read all task rows ordered by deadline"""
+        return self.query()
+
+    def save_all(self, rows: List[Dict]) -> None:
+        """Replace the table contents in a single transaction"""
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.executemany(self._UPSERT, (self._to_params(row) for row in rows))
+
+    def append(self, op: str, row: Dict) -> None:
+        """Upsert or delete a single task row"""
+        self.append_many([(op, row)])
+
+    def append_many(self, records: List[Tuple[str, Dict]]) -> None:
+        """Upsert or delete rows in a single transaction"""
+        with self._conn:
+            for op, row in records:
+                if op == "delete":
+                    self._conn.execute("DELETE FROM tasks WHERE ID = ?", (row["ID"],))
+                else:
+                    self._conn.execute(self._UPSERT, self._to_params(row))
+
+    def query(self, selesai: Optional[bool] = None, valid_completed: bool = False,
+              deadline_from: Optional[date] = None, deadline_to: Optional[date] = None) -> List[Dict]:
+        """Return rows matching the filters using the table indexes"""
+        clauses, params = [], []
+        if valid_completed:
+            clauses.append("Selesai = 1 AND Tanggal_Selesai != '' AND Durasi_Aktual IS NOT NULL")
+        elif selesai is not None:
+            clauses.append("Selesai = ?")
+            params.append(1 if selesai else 0)
+        if deadline_from is not None:
+            clauses.append("Deadline >= ?")
+            params.append(deadline_from.isoformat())
+        if deadline_to is not None:
+            clauses.append("Deadline <= ?")
+            params.append(deadline_to.isoformat())
+
+        sql = "SELECT * FROM tasks"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY Deadline"
+        return [self._to_row(record) for record in self._conn.execute(sql, params)]
+
+    # Bound on the parameters of one IN (...) lookup, below SQLite's default variable limit
+    _ID_BATCH = 500
+
+    def get_many(self, task_ids: List[str]) -> List[Dict]:
+        """Return the rows of the given task IDs by primary key lookup"""
+        rows = []
+        for start in range(0, len(task_ids), self._ID_BATCH):
+            batch = task_ids[start:start + self._ID_BATCH]
+            sql = f"SELECT * FROM tasks WHERE ID IN ({', '.join('?' * len(batch))})"
+            rows.extend(self._to_row(record) for record in self._conn.execute(sql, batch))
+        return rows
+
+    def count(self) -> int:
+        """Number of stored tasks"""
+        return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection"""
+        self._conn.close()
+
+
+def migrate_csv_to_sqlite(csv_path: str = "tugas.csv", db_path: str = "tugas.db") -> int:
+    """One-shot migration of a CSV (plus journal, if any) into an SQLite database"""
+    from .models import Task
+
+    journal = JournalStorage(csv_path)
+    source = journal if os.path.exists(journal.journal_path) else CSVStorage(csv_path)
+
+    rows = []
+    for row in source.load():
+        try:
+            # Round-trip through Task so the database only holds validated rows
+            rows.append(Task.from_dict(row).to_dict())
+        except ValueError as e:
+            print(f"Warning: Skipping invalid task - {e}")
+
+    target = SQLiteStorage(db_path)
+    target.save_all(rows)
+    target.close()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    # Usage: python -m task_manager.storage [tugas.csv] [tugas.db]
+    count = migrate_csv_to_sqlite(*sys.argv[1:3])
+    print(f"Migrated {count} tasks")
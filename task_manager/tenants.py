@@ -0,0 +1,314 @@
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterator, List, Optional
+from .models import TaskManager, CompactTask
+from .columnar import PRIORITIES, TaskColumns
+from .aggregates import ProductivityStats
+from .storage import TaskStorage, JournalStorage, SQLiteStorage
+from .shared import SharedTaskManager
+from .training import ModelTrainer
+from .analytics import CLUSTER_MODEL_PATH, DELAY_MODEL_PATH, forget_models
+from .metrics import count, timer
+
+
+# Per-workspace partitions are opt-in: TASK_MANAGER_WORKSPACES=<dir> keeps each workspace in <dir>/<name>/
+WORKSPACES_DIR = os.environ.get("TASK_MANAGER_WORKSPACES") or None
+DEFAULT_WORKSPACE = "default"
+WORKSPACE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+# Loaded partitions kept in memory, and seconds after which an unused one is unloaded
+DEFAULT_CAPACITY = 16
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+
+
+def open_storage(directory: str, read_only: bool = False) -> TaskStorage:
+    """Storage of the tasks in a directory: tugas.db once migrated, else tugas.csv with its journal"""
+    db_path = os.path.join(directory, "tugas.db")
+    if os.path.exists(db_path):
+        return SQLiteStorage(db_path, read_only=read_only)
+    return JournalStorage(os.path.join(directory, "tugas.csv"), read_only=read_only)
+
+
+def _close_storage(storage: TaskStorage) -> None:
+    close = getattr(storage, "close", None)
+    if close is not None:
+        close()
+
+
+class Tenant:
+    """One loaded partition: its shared manager, its model trainer and how it is being used"""
+
+    def __init__(self, name: str, directory: str, executor: ThreadPoolExecutor):
+        self.name = name
+        self.directory = directory
+        # Configured like the single-user app: lazy load, binary snapshot, estimates left to the trainer
+        self.manager = SharedTaskManager(TaskManager(
+            storage=open_storage(directory), task_class=CompactTask, lazy=True, snapshot=True,
+            defer_estimates=True
+        ))
+        self.trainer = ModelTrainer(
+            self.manager,
+            delay_model_path=os.path.join(directory, DELAY_MODEL_PATH),
+            cluster_model_path=os.path.join(directory, CLUSTER_MODEL_PATH),
+            executor=executor
+        )
+        self.leases = 0
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        # Queued training is dropped; a running job is waited for, so it cannot write to the
+        # closed storage or cache the models again after they are forgotten
+        self.trainer.shutdown(wait=True)
+        forget_models(self.trainer.delay_model_path, self.trainer.cluster_model_path)
+        _close_storage(self.manager.storage)
+
+
+class TenantPool:
+    """Bounded LRU of loaded workspace partitions under one root directory.
+
+    Every workspace keeps its tasks, snapshot, similarity index and models
+    in its own directory, so users never see or rewrite each other's
+    files. Partitions are loaded on first use and unloaded again when more
+    than ``capacity`` are loaded (least recently used first) or when one
+    has not been used for ``idle_timeout`` seconds. Both are checked on
+    every get(), so memory follows the active working set rather than
+    the number of workspaces. Writes are persisted as they happen, so
+    unloading needs no save.
+
+    A partition is never unloaded while it is leased; callers that keep
+    using a manager for a while (a page run, a request) should hold it
+    through lease() so that a second copy of the same partition is never
+    loaded next to it. All trainers share one small executor, and the
+    training still queued for a partition is dropped when it is unloaded.
+    Unloading waits for a training job that is running, outside the pool
+    lock; loading the same workspace again waits until that has finished.
+    """
+
+    def __init__(self, root: str, capacity: int = DEFAULT_CAPACITY, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 training_workers: int = 1):
+        self.root = root
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        self._tenants: "OrderedDict[str, Tenant]" = OrderedDict()
+        # Unloaded partitions that are still being closed, set once they are
+        self._closing: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=training_workers, thread_name_prefix="model-trainer")
+
+    def directory(self, name: str) -> str:
+        """Directory of a workspace partition"""
+        if not WORKSPACE_NAME.match(name):
+            raise ValueError("Nama workspace hanya boleh berisi huruf, angka, - dan _ (maksimal 64 karakter)")
+        return os.path.join(self.root, name)
+
+    def workspaces(self) -> List[str]:
+        """Names of the workspaces that have stored tasks"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if WORKSPACE_NAME.match(name) and any(
+                os.path.exists(os.path.join(self.root, name, f)) for f in ("tugas.csv", "tugas.journal", "tugas.db")
+            )
+        )
+
+    @property
+    def loaded(self) -> List[str]:
+        """Names of the loaded workspaces, least recently used first"""
+        with self._lock:
+            return list(self._tenants)
+
+    def _acquire(self, name: str, lease: bool) -> Tenant:
+        directory = self.directory(name)
+        while True:
+            with self._lock:
+                closing = self._closing.get(name)
+                if closing is None:
+                    tenant = self._tenants.get(name)
+                    if tenant is None:
+                        os.makedirs(directory, exist_ok=True)
+                        with timer("tenants.load"):
+                            tenant = self._tenants[name] = Tenant(name, directory, self._executor)
+                        count("tenants.loaded")
+                    self._tenants.move_to_end(name)
+                    tenant.last_used = time.monotonic()
+                    tenant.leases += lease
+                    evicted = self._evict(keep=name)
+                    break
+            # Its previous copy may still be training on the same files
+            closing.wait()
+        self._close(evicted)
+        return tenant
+
+    def get(self, name: str) -> Tenant:
+        """Loaded partition of a workspace, loading it (and unloading others) as needed"""
+        return self._acquire(name, lease=False)
+
+    @contextmanager
+    def lease(self, name: str) -> Iterator[Tenant]:
+        """Partition of a workspace that stays loaded until the block ends"""
+        tenant = self._acquire(name, lease=True)
+        try:
+            yield tenant
+        finally:
+            with self._lock:
+                tenant.leases -= 1
+                tenant.last_used = time.monotonic()
+
+    def _evict(self, keep: Optional[str] = None) -> List[Tenant]:
+        """Unload idle partitions, then the least recently used ones above capacity (lock held).
+
+        Returns the unloaded tenants, which the caller closes with _close() after releasing the lock.
+        """
+        now = time.monotonic()
+        evicted = []
+        for name, tenant in list(self._tenants.items()):
+            if name != keep and not tenant.leases and now - tenant.last_used > self.idle_timeout:
+                evicted.append(self._unload(name))
+        for name, tenant in list(self._tenants.items()):
+            if len(self._tenants) <= self.capacity:
+                break
+            if name != keep and not tenant.leases:
+                evicted.append(self._unload(name))
+        return evicted
+
+    def _unload(self, name: str) -> Tenant:
+        """Take a partition out of the pool (lock held); it is closed later by _close()"""
+        self._closing[name] = threading.Event()
+        count("tenants.evicted")
+        return self._tenants.pop(name)
+
+    def _close(self, tenants: List[Tenant]) -> None:
+        for tenant in tenants:
+            try:
+                tenant.close()
+            finally:
+                with self._lock:
+                    self._closing.pop(tenant.name).set()
+
+    def evict_idle(self) -> None:
+        """Unload partitions that have been idle for longer than idle_timeout"""
+        with self._lock:
+            evicted = self._evict()
+        self._close(evicted)
+
+    def aggregate(self, workers: Optional[int] = None, today: Optional[date] = None) -> Dict:
+        """Task counts and productivity statistics of every workspace, and their totals.
+
+        Loaded partitions are summarized from memory. The others are read
+        in a process pool, one partition at a time per worker, without
+        being added to the pool, so the memory of an aggregate run is
+        bounded by the workers rather than by the number of workspaces.
+        """
+        today = today or date.today()
+        names = self.workspaces()
+        with self._lock:
+            loaded = {name: self._tenants[name] for name in names if name in self._tenants}
+            # Leased so that a concurrent get() cannot unload them while they are summarized
+            for tenant in loaded.values():
+                tenant.leases += 1
+        try:
+            summaries = {name: partition_summary(tenant.manager.columns, today) for name, tenant in loaded.items()}
+        finally:
+            with self._lock:
+                for tenant in loaded.values():
+                    tenant.leases -= 1
+
+        rest = [name for name in names if name not in summaries]
+        if rest:
+            workers = min(workers or os.cpu_count() or 1, len(rest))
+            # Not fork: the app and API call this from a process with running threads
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            with timer("tenants.aggregate"), ProcessPoolExecutor(workers, mp_context=context) as pool:
+                results = pool.map(_summarize_partition, [self.directory(name) for name in rest],
+                                   [today] * len(rest), chunksize=max(1, len(rest) // (4 * workers)))
+                summaries.update(zip(rest, results))
+        return merge_summaries(summaries)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            evicted = [self._unload(name) for name in list(self._tenants)]
+        self._close(evicted)
+        self._executor.shutdown(wait=True)
+
+
+def partition_summary(columns: TaskColumns, today: date) -> Dict:
+    """Task counts and productivity statistics of one partition"""
+    active = ~columns.selesai
+    completed = columns.completed_mask()
+    return {
+        "tasks": len(columns),
+        "active": int(active.sum()),
+        "completed": int(columns.selesai.sum()),
+        "overdue": int((active & (columns.deadline < today.toordinal())).sum()),
+        "late": int((completed & (columns.tanggal_selesai > columns.deadline)).sum()),
+        "stats": columns.stats.copy(),
+    }
+
+
+def _summarize_partition(directory: str, today: date) -> Dict:
+    # Read-only: the app may be writing to the same partition, so no compaction or snapshot refresh here
+    storage = open_storage(directory, read_only=True)
+    try:
+        manager = TaskManager(storage, task_class=CompactTask, lazy=True, snapshot=True)
+        return partition_summary(manager.columns, today)
+    finally:
+        _close_storage(storage)
+
+
+_COUNTS = ("tasks", "active", "completed", "overdue", "late")
+
+
+def merge_summaries(summaries: Dict[str, Dict]) -> Dict:
+    """Totals over partition summaries, with per-workspace counts and the merged productivity means"""
+    stats = ProductivityStats(len(PRIORITIES))
+    for summary in summaries.values():
+        stats.merge(summary["stats"])
+    durations = stats.weekday
+    return {
+        "workspaces": len(summaries),
+        **{key: sum(s[key] for s in summaries.values()) for key in _COUNTS},
+        "mean_duration": float(durations.sum.sum() / durations.total) if durations.total else None,
+        "hourly_productivity": stats.hour.means(),
+        "weekday_productivity": stats.weekday.means(),
+        "priority_productivity": {PRIORITIES[k]: mean for k, mean in stats.priority.means().items()},
+        "partitions": {name: {key: s[key] for key in _COUNTS} for name, s in sorted(summaries.items())},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m task_manager.tenants",
+                                     description="Aggregate task statistics over all workspace partitions")
+    parser.add_argument("root", nargs="?", default=WORKSPACES_DIR,
+                        help="workspace directory (default: $TASK_MANAGER_WORKSPACES)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--report", help="write the aggregate to this JSON file")
+    args = parser.parse_args(argv)
+    if not args.root:
+        parser.error("no workspace directory given and TASK_MANAGER_WORKSPACES is not set")
+
+    started = time.perf_counter()
+    report = TenantPool(args.root).aggregate(args.workers)
+    seconds = time.perf_counter() - started
+    print(f"{report['workspaces']} workspaces, {report['tasks']} tasks: {report['active']} active "
+          f"({report['overdue']} overdue), {report['completed']} completed ({report['late']} late) "
+          f"in {seconds:.1f}s")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    # Usage: python -m task_manager.tenants workspaces/ [--workers N] [--report ringkasan.json]
+    sys.exit(main())
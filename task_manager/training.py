@@ -0,0 +1,110 @@
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from typing import Callable, Dict, Optional
+from .analytics import CLUSTER_MODEL_PATH, DELAY_MODEL_PATH, get_delay_model, update_productivity_clusters
+from .metrics import timer
+
+
+class ModelTrainer:
+    """Trains the duration estimator, delay model and productivity clusters on a worker thread.
+
+    refresh() only submits work and returns at once. Each model is trained
+    against the manager version it started from; when that version is
+    outdated by the time a job ends, the job runs again, and a model
+    whose job is still running is not submitted twice. Until a job
+    finishes, readers keep using the last good model (see the retrain
+    and refresh_clusters flags in analytics), and ``version`` increases
+    whenever a job finishes so pages can pick up fresh results.
+
+    Trainers of several managers can share one executor. shutdown() cancels
+    the jobs still queued for this trainer, waits for one that is running
+    unless told not to, and leaves a shared executor running.
+    """
+
+    def __init__(self, manager, delay_model_path: str = DELAY_MODEL_PATH,
+                 cluster_model_path: str = CLUSTER_MODEL_PATH, max_workers: int = 1,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        self.manager = manager
+        self.delay_model_path = delay_model_path
+        self.cluster_model_path = cluster_model_path
+        self.version = 0
+        self._jobs: Dict[str, Callable[[], None]] = {
+            "duration": self._train_durations,
+            "delay": self._train_delay_model,
+            "clusters": self._train_clusters,
+        }
+        self._trained: Dict[str, int] = {}
+        self._running: set = set()
+        self._futures: set = set()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-trainer")
+
+    @property
+    def busy(self) -> bool:
+        """Whether a model is being trained or waiting to be"""
+        return bool(self._running)
+
+    def refresh(self) -> None:
+        """Queue training for every model that is behind the manager's current version"""
+        for name in self._jobs:
+            self._submit(name)
+
+    def _submit(self, name: str) -> None:
+        with self._lock:
+            if self._closed or name in self._running or self._trained.get(name) == self.manager.version:
+                return
+            self._running.add(name)
+            future = self._executor.submit(self._run, name)
+            self._futures.add(future)
+        future.add_done_callback(functools.partial(self._done, name))
+
+    def _done(self, name: str, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+            if future.cancelled():
+                self._running.discard(name)
+
+    def _run(self, name: str) -> None:
+        version = self.manager.version
+        try:
+            if not self._closed:
+                with timer(f"trainer.{name}"):
+                    self._jobs[name]()
+        except Exception as e:
+            print(f"Warning: Background training of {name} failed - {e}")
+        finally:
+            with self._lock:
+                self._trained[name] = version
+                self._running.discard(name)
+                self.version += 1
+        # Changes that arrived during training get their own run
+        self._submit(name)
+
+    def _train_durations(self) -> None:
+        """Sync the similarity index off-lock on first use; afterwards it is kept current by the manager"""
+        if self.manager.similarity_ready:
+            return
+        index = self.manager.new_similarity_index()
+        index.sync(self.manager.get_valid_completed_tasks())
+        self.manager.install_similarity(index)
+
+    def _train_delay_model(self) -> None:
+        get_delay_model([], self.delay_model_path, columns=self.manager.columns)
+
+    def _train_clusters(self) -> None:
+        update_productivity_clusters(self.manager.columns, self.cluster_model_path)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop training; with wait, return only once no job of this trainer is running"""
+        self._closed = True
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()  # Only succeeds for jobs that have not started
+        if self._owns_executor:
+            self._executor.shutdown(wait=wait)
+        elif wait:
+            wait_futures(futures)
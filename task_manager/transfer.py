@@ -0,0 +1,94 @@
+import csv
+import json
+from contextlib import nullcontext
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, TextIO
+from .storage import FIELDNAMES
+
+
+FORMATS = {"csv": "CSV", "jsonl": "JSON Lines"}
+IMPORT_CHUNKSIZE = 1000
+
+
+def iter_rows(stream: TextIO, fmt: str) -> Iterator[Dict]:
+    """Lazily read CSV-style task rows from a CSV or JSON Lines text stream"""
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value or "" for key, value in row.items() if key is not None}
+    elif fmt == "jsonl":
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                print(f"Warning: Skipping invalid JSON on line {number}")
+                continue
+            if isinstance(record, dict):
+                yield {key: "" if value is None else str(value) for key, value in record.items()}
+    else:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+
+
+def write_rows(stream: TextIO, rows: Iterable[Dict], fmt: str) -> int:
+    """Write rows to a text stream one at a time, returns the number written"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            stream.write(json.dumps({key: row.get(key, "") for key in FIELDNAMES}, ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+    return count
+
+
+def _chunks(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    """Split an iterator into lists of at most size items"""
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_tasks(manager, stream: TextIO, fmt: str, chunksize: int = IMPORT_CHUNKSIZE) -> Dict[str, int]:
+    """Import tasks from a stream in bounded chunks.
+
+    Rows with an ID that is already stored update that task, all others are
+    added; the stored IDs of a chunk are looked up in one query. Each chunk
+    is written as it is read (one journal append or one transaction), so
+    pending changes stay bounded by the chunk size. Storage that can only
+    rewrite the whole file writes once at the end instead, as it holds
+    every task in memory anyway.
+    """
+    stats = {"added": 0, "updated": 0, "skipped": 0}
+    block = manager.bulk() if not manager.storage.incremental else nullcontext()
+    with block:
+        for rows in _chunks(iter_rows(stream, fmt), chunksize):
+            tasks = []
+            for row in rows:
+                try:
+                    tasks.append(manager.task_class.from_dict(row))
+                except ValueError as e:
+                    print(f"Warning: Skipping invalid task - {e}")
+                    stats["skipped"] += 1
+            stored = manager.find_tasks([task.id for task in tasks])
+            new = [task for task in tasks if task.id not in stored]
+            known = [task for task in tasks if task.id in stored]
+            added = manager.add_tasks(new)
+            stats["added"] += len(added)
+            stats["skipped"] += len(new) - len(added)
+            stats["updated"] += manager.update_tasks(known)
+    return stats
+
+
+def export_tasks(manager, stream: TextIO, fmt: str, chunksize: int = IMPORT_CHUNKSIZE) -> int:
+    """Stream every task to a CSV or JSON Lines text stream, returns the number written"""
+    rows = (task.to_dict() for chunk in manager.iter_task_chunks(chunksize) for task in chunk)
+    return write_rows(stream, rows, fmt)
@@ -0,0 +1,42 @@
+import os
+import sys
+from datetime import date, timedelta
+from typing import List
+import pytest
+
+# The package is used from a checkout, without installation
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_manager.models import Task  # noqa: E402
+from task_manager.storage import SQLiteStorage  # noqa: E402
+
+
+TODAY = date(2025, 1, 6)  # A Monday
+
+
+def make_tasks(n: int = 9) -> List[Task]:
+    """Mix of active and completed tasks with deadlines around TODAY"""
+    tasks = []
+    for i in range(n):
+        prioritas = ("Tinggi", "Sedang", "Rendah")[i % 3]
+        task = Task(f"Tugas {i} laporan" if i % 2 else f"Tugas {i} rapat", prioritas,
+                    TODAY + timedelta(days=i - 3), deskripsi=f"deskripsi {i}")
+        if i % 3 == 0:
+            task.mark_completed(TODAY - timedelta(days=1), 1.0 + i / 2)
+        tasks.append(task)
+    return tasks
+
+
+@pytest.fixture
+def tasks() -> List[Task]:
+    return make_tasks()
+
+
+@pytest.fixture
+def sqlite_path(tmp_path, tasks) -> str:
+    """SQLite database holding the tasks fixture"""
+    path = str(tmp_path / "tugas.db")
+    storage = SQLiteStorage(path)
+    storage.save_all([task.to_dict() for task in tasks])
+    storage.close()
+    return path
@@ -0,0 +1,64 @@
+import random
+from datetime import datetime, timedelta
+import numpy as np
+from task_manager.aggregates import ProductivityStats
+from task_manager.columnar import PRIORITIES, TaskColumns
+from task_manager.models import CompactTask
+from conftest import TODAY
+
+
+def assert_same(stats: ProductivityStats, expected: ProductivityStats) -> None:
+    for name in ("hour", "weekday", "priority"):
+        actual, wanted = getattr(stats, name), getattr(expected, name)
+        assert np.array_equal(actual.count, wanted.count), name
+        assert np.allclose(actual.sum, wanted.sum) and np.allclose(actual.sumsq, wanted.sumsq), name
+        assert actual.means().keys() == wanted.means().keys()
+        assert np.allclose(list(actual.means().values()), list(wanted.means().values()))
+        assert np.allclose(list(actual.stds().values()), list(wanted.stds().values()))
+
+
+def new_task(rng: random.Random, i: int) -> CompactTask:
+    task = CompactTask(f"Tugas {i}", rng.choice(list(PRIORITIES) + ["Lain"]), TODAY + timedelta(days=rng.randrange(-20, 20)))
+    if rng.random() < 0.7:
+        task.waktu_rekomendasi = datetime.combine(TODAY, datetime.min.time()) + timedelta(hours=rng.randrange(24))
+    return task
+
+
+def test_running_stats_match_a_full_recomputation():
+    rng = random.Random(7)
+    tasks = {}
+    columns = TaskColumns.from_tasks([])
+    columns.stats  # Built now, so every operation below updates it incrementally
+    for i in range(2000):
+        op = rng.random()
+        if op < 0.4 or not tasks:
+            task = new_task(rng, i)
+            tasks[task.id] = task
+            columns.add(task)
+        elif op < 0.7:
+            task = rng.choice(list(tasks.values()))
+            task.mark_completed(TODAY - timedelta(days=rng.randrange(30)), rng.choice([0.5, 1.0, 2.5, 7.0]))
+            columns.update(task)
+        elif op < 0.85:
+            task = rng.choice(list(tasks.values()))
+            task.prioritas = rng.choice(PRIORITIES)
+            task.selesai = task.selesai and rng.random() < 0.5
+            columns.update(task)
+        else:
+            columns.remove(tasks.pop(rng.choice(list(tasks))).id)
+
+        if i % 250 == 0:
+            assert_same(columns.stats, TaskColumns.from_tasks(list(tasks.values())).stats)
+    assert_same(columns.stats, TaskColumns.from_tasks(list(tasks.values())).stats)
+    assert columns.stats.completed == sum(t.selesai for t in tasks.values())
+
+
+def test_merged_partitions_equal_one_partition():
+    rng = random.Random(3)
+    tasks = [new_task(rng, i) for i in range(300)]
+    for task in tasks[::2]:
+        task.mark_completed(TODAY - timedelta(days=rng.randrange(10)), rng.uniform(0.5, 8))
+    merged = ProductivityStats(len(PRIORITIES))
+    for part in (tasks[:100], tasks[100:250], tasks[250:]):
+        merged.merge(TaskColumns.from_tasks(part).stats.copy())
+    assert_same(merged, TaskColumns.from_tasks(tasks).stats)
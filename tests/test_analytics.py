@@ -0,0 +1,73 @@
+import os
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from task_manager.analytics import forget_models, predict_task_delay, predict_task_delays, update_productivity_clusters
+from task_manager.columnar import TaskColumns
+from task_manager.models import Task
+from conftest import TODAY, make_tasks
+
+
+def test_clusters_learn_a_completion_hidden_by_a_deletion(tmp_path):
+    path = str(tmp_path / "clusters.pkl")
+    tasks = make_tasks(30)
+    columns = TaskColumns.from_tasks(tasks)
+    try:
+        before = update_productivity_clusters(columns, path)
+        assert before is not None
+
+        # One completed task deleted and one completed: the completed count stays the same
+        completed = next(task for task in tasks if task.selesai)
+        columns.remove(completed.id)
+        active = next(task for task in tasks if not task.selesai)
+        active.mark_completed(TODAY + timedelta(days=3), 40.0)
+        columns.update(active)
+
+        after = update_productivity_clusters(columns, path)
+        assert not np.array_equal(before, after)
+        # Nothing new since the last refresh: the model is left as it is
+        assert np.array_equal(after, update_productivity_clusters(columns, path))
+    finally:
+        forget_models(path)
+
+
+def history(n: int, late_every: int = 0):
+    """Completed tasks, every late_every-th finished after its deadline (0: none late)"""
+    tasks = []
+    for i in range(n):
+        task = Task(f"Tugas {i}", ("Tinggi", "Sedang", "Rendah")[i % 3], TODAY + timedelta(days=i % 7))
+        late = late_every and i % late_every == 0
+        task.mark_completed(task.deadline + timedelta(days=2 if late else -1), 1.0 + i % 4)
+        tasks.append(task)
+    return tasks
+
+
+def active_tasks():
+    return [Task(f"Baru {i}", ("Tinggi", "Sedang", "Rendah")[i % 3], date.today() + timedelta(days=i - 5))
+            for i in range(12)]
+
+
+@pytest.mark.parametrize("completed, trained", [
+    (history(4, late_every=2), False),   # Too few completed tasks: no model
+    (history(40), True),                 # Nobody is ever late: single-class model
+    (history(60, late_every=3), True),   # Late and on-time tasks
+])
+def test_batch_delay_predictions_match_single_ones(tmp_path, completed, trained):
+    path = str(tmp_path / "delay.pkl")
+    active = active_tasks()
+    try:
+        risks = predict_task_delays(active, completed, path)
+        assert os.path.exists(path) == trained
+        assert risks == {task.id: predict_task_delay(task, completed, path) for task in active}
+        assert predict_task_delays([], completed, path) == {}
+    finally:
+        forget_models(path)
+
+
+def test_batch_predictions_differ_between_tasks_when_trained(tmp_path):
+    path = str(tmp_path / "delay.pkl")
+    try:
+        risks = predict_task_delays(active_tasks(), history(60, late_every=3), path)
+        assert all(0.0 <= risk <= 1.0 for risk in risks.values()) and len(set(risks.values())) > 1
+    finally:
+        forget_models(path)
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from task_manager import api as api_module
+from task_manager.api import ApiError, TaskAPI, open_shared_manager
+
+
+class StubTrainer:
+    """Stands in for ModelTrainer without training anything"""
+
+    busy = False
+
+    def __init__(self, delay_model_path: str):
+        self.delay_model_path = delay_model_path
+        self.refreshed = 0
+
+    def refresh(self) -> None:
+        self.refreshed += 1
+
+    def shutdown(self) -> None:
+        pass
+
+
+@pytest.fixture
+def api(sqlite_path, tmp_path):
+    api = TaskAPI(open_shared_manager(sqlite_path), StubTrainer(str(tmp_path / "delay_model.pkl")), workers=2,
+                  model_workers=1)
+    yield api
+    api.shutdown()
+
+
+def request(api: TaskAPI, method: str, target: str, body=None):
+    return asyncio.run(api.dispatch(method, target, body))
+
+
+def test_task_routes_on_fresh_sqlite_server(api, tasks):
+    task_id = tasks[1].id
+    status, payload = request(api, "GET", f"/tasks/{task_id}")
+    assert status == 200 and payload["task"]["ID"] == task_id
+    status, _ = request(api, "POST", f"/tasks/{task_id}/complete", {"durasi_aktual": 1.5})
+    assert status == 200
+    status, _ = request(api, "DELETE", f"/tasks/{tasks[2].id}")
+    assert status == 200
+    with pytest.raises(ApiError) as error:
+        request(api, "GET", f"/tasks/{tasks[2].id}")
+    assert error.value.status == 404
+
+
+def test_patch_with_null_deskripsi_clears_it(api, tasks):
+    status, payload = request(api, "PATCH", f"/tasks/{tasks[1].id}", {"deskripsi": None})
+    assert status == 200 and payload["task"]["Deskripsi"] == ""
+    assert api.manager.get_task(tasks[1].id).deskripsi == ""
+
+
+def test_predictions_use_the_trainer_model(api, tasks, monkeypatch):
+    paths = []
+    monkeypatch.setattr(api_module, "predict_task_delay",
+                        lambda task, history, path, retrain: paths.append(path) or 0.0)
+    monkeypatch.setattr(api_module, "predict_task_delays",
+                        lambda active, history, path, retrain: paths.append(path) or {})
+    request(api, "GET", f"/tasks/{tasks[1].id}/risk")
+    request(api, "GET", "/recommendations")
+    assert paths == [api.trainer.delay_model_path] * 2
+
+
+@pytest.mark.parametrize("raw", [b'{"durasi_aktual": NaN}', b'{"durasi_aktual": Infinity}',
+                                 b'{"durasi_aktual": -Infinity}'])
+def test_complete_rejects_non_finite_durations(api, tasks, raw):
+    status, _ = asyncio.run(api._respond("POST", f"/tasks/{tasks[1].id}/complete", raw))
+    assert status == 400
+    assert not api.manager.get_task(tasks[1].id).selesai
+
+
+def test_negative_content_length_is_rejected(api):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"POST /tasks HTTP/1.1\r\nContent-Length: -5\r\n\r\n{}")
+        reader.feed_eof()
+        return await api._read_request(reader)
+
+    with pytest.raises(ApiError) as error:
+        asyncio.run(read())
+    assert error.value.status == 400
@@ -0,0 +1,63 @@
+import json
+import pytest
+from task_manager import cli
+from task_manager.analytics import forget_models
+from task_manager.storage import JournalStorage
+from conftest import make_tasks
+
+PREVIOUS_ESTIMATE = 99.0
+
+
+@pytest.fixture
+def task_file(tmp_path) -> str:
+    tasks = make_tasks(60)
+    for task in tasks:
+        task.durasi_estimasi = PREVIOUS_ESTIMATE
+    storage = JournalStorage(str(tmp_path / "tugas.csv"))
+    storage.save_all([task.to_dict() for task in tasks])
+    return storage.path
+
+
+def run_cli(tmp_path, task_file, *options) -> dict:
+    models = [str(tmp_path / "delay.pkl"), str(tmp_path / "clusters.pkl")]
+    report = str(tmp_path / "hasil.json")
+    try:
+        assert cli.main([task_file, "--workers", "1", "--delay-model", models[0], "--cluster-model", models[1],
+                         "--report", report, *options]) == 0
+    finally:
+        forget_models(*models)
+    with open(report, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def stored_active(task_file):
+    return cli.open_manager(task_file).get_active_tasks()
+
+
+def test_batch_run_report_and_saved_plan(tmp_path, task_file):
+    report = run_cli(tmp_path, task_file)
+    assert {"tasks", "active", "completed", "recommend", "delay", "clusters", "timings", "finished"} <= report.keys()
+    assert (report["tasks"], report["active"], report["completed"]) == (60, 40, 20)
+    assert report["recommend"] == {"estimated": 40, "skipped": 0, "late": report["recommend"]["late"]}
+    assert report["delay"]["trained"] and len(report["delay"]["top"]) == 20
+    assert {"load", "index", "recommend", "models", "save", "total"} <= report["timings"].keys()
+
+    active = stored_active(task_file)
+    assert all(task.durasi_estimasi != PREVIOUS_ESTIMATE for task in active)
+    assert all(task.waktu_rekomendasi is not None for task in active)
+    starts = sorted(task.waktu_rekomendasi for task in active)
+    assert len(set(starts)) == len(starts)  # Packed one after another, never on top of each other
+
+
+def test_budget_leaves_unreached_tasks_with_their_estimate(tmp_path, task_file, monkeypatch):
+    monkeypatch.setattr(cli, "CHUNKSIZE", 4)
+    report = run_cli(tmp_path, task_file, "--jobs", "recommend", "--budget", "0.000001")
+    recommend = report["recommend"]
+    assert recommend["skipped"] > 0 and recommend["estimated"] + recommend["skipped"] == 40
+    assert "delay" not in report and "clusters" not in report
+
+    active = stored_active(task_file)
+    kept = [task for task in active if task.durasi_estimasi == PREVIOUS_ESTIMATE]
+    assert len(kept) == recommend["skipped"]
+    # Chunks go earliest deadline first, so the skipped tasks are the ones due last
+    assert min(task.deadline for task in kept) >= max(t.deadline for t in active if t not in kept)
@@ -0,0 +1,19 @@
+import numpy as np
+from benchmarks.suite import COMPACT_FOOTPRINT_BUDGET, FOOTPRINT_SAMPLE
+from benchmarks.workload import generate_tasks
+from task_manager.models import CompactTask, Task, task_footprint
+
+
+def mean_footprint(task_class) -> float:
+    return float(np.mean([task_footprint(t) for t in generate_tasks(FOOTPRINT_SAMPLE, 0, task_class)]))
+
+
+def test_compact_task_footprint_within_budget():
+    compact = mean_footprint(CompactTask)
+    assert compact <= COMPACT_FOOTPRINT_BUDGET
+    assert compact < mean_footprint(Task)
+
+
+def test_compact_task_keeps_task_fields():
+    for task, compact in zip(generate_tasks(50, 0, Task), generate_tasks(50, 0, CompactTask)):
+        assert compact.to_dict() == task.to_dict()
@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+from task_manager.deadlines import DeadlineIndex
+from task_manager.models import TaskManager, Task
+from task_manager.search import SearchIndex
+from task_manager.storage import JournalStorage
+from conftest import TODAY
+
+
+def indexed(*tasks) -> SearchIndex:
+    index = SearchIndex()
+    for task in tasks:
+        index.add(task)
+    return index
+
+
+def test_search_matches_words_prefixes_and_infixes():
+    laporan = Task("Laporan keuangan", "Tinggi", TODAY, deskripsi="kuartal pertama")
+    rapat = Task("Rapat anggaran", "Rendah", TODAY, deskripsi="bahas laporan")
+    index = indexed(laporan, rapat)
+
+    assert index.search("laporan") == [laporan.id, rapat.id]  # Name weighs more than description
+    assert index.search("lapor") == [laporan.id, rapat.id]
+    assert index.search("uangan") == [laporan.id]
+    assert index.search("laporan rapat") == [rapat.id]
+    assert index.search("tidakada") == [] and index.search("  ") == []
+
+
+def test_search_filters_and_removal():
+    active = Task("Laporan harian", "Tinggi", TODAY)
+    done = Task("Laporan mingguan", "Rendah", TODAY)
+    done.mark_completed(TODAY, 1.0)
+    index = indexed(active, done)
+
+    assert index.search("laporan", selesai=True) == [done.id]
+    assert index.search("laporan", prioritas={"Tinggi"}) == [active.id]
+    assert len(index.search("laporan", limit=1)) == 1
+
+    index.remove(active.id)
+    assert index.search("harian") == [] and index.search("laporan") == [done.id]
+    active.nama = "Review kode"
+    index.add(active)
+    assert index.search("review") == [active.id]
+
+
+def test_deadline_index_ranges():
+    index = DeadlineIndex()
+    for i, day in enumerate([3, 1, 2, 1]):
+        index.add(f"t{i}", TODAY + timedelta(days=day))
+
+    assert index.range(TODAY + timedelta(days=1), TODAY + timedelta(days=2)) == ["t1", "t3", "t2"]
+    assert index.range(start=TODAY + timedelta(days=3)) == ["t0"]
+    index.add("t1", TODAY + timedelta(days=5))
+    index.remove("t3")
+    assert index.range() == ["t2", "t0", "t1"] and "t3" not in index
+
+
+def test_manager_indexes_follow_changes(tmp_path, tasks):
+    storage = JournalStorage(str(tmp_path / "tugas.csv"))
+    storage.save_all([task.to_dict() for task in tasks])
+    manager = TaskManager(storage, lazy=True)
+    window = (TODAY, TODAY + timedelta(days=2))
+    assert [t.deadline for t in manager.get_tasks_in_range(*window)] == [TODAY, TODAY + timedelta(days=1),
+                                                                        TODAY + timedelta(days=2)]
+    assert {t.id for t in manager.search_tasks("rapat")} == {t.id for t in tasks if "rapat" in t.nama}
+
+    ok, added = manager.add_task("Rapat klien", "", "Tinggi", "2025-01-07")
+    assert ok
+    first = manager.get_task(tasks[3].id)
+    manager.update_task(first, "Presentasi", first.deskripsi, first.prioritas, date(2025, 3, 1))
+    manager.complete_task(manager.get_task(tasks[4].id), TODAY, 1.0)
+
+    assert added in manager.get_tasks_in_range(*window)
+    assert first not in manager.get_tasks_in_range(*window)
+    assert tasks[4].id not in {t.id for t in manager.get_tasks_in_range(*window, active_only=True)}
+    assert manager.search_tasks("presentasi") == [first]
+    assert added in manager.search_tasks("rapat", selesai=False)
+
+    manager.delete_task(added)
+    assert added not in manager.get_tasks_in_range(*window) and manager.search_tasks("klien") == []
@@ -0,0 +1,41 @@
+import csv
+import random
+from task_manager.loader import load_tasks_bulk
+from task_manager.models import Task, CompactTask
+
+FIELDS = ["Nama", "Deskripsi", "Prioritas", "Deadline", "Selesai", "Tanggal_Selesai",
+          "Durasi_Aktual", "Durasi_Estimasi", "Waktu_Rekomendasi", "ID"]
+DATES = ["2025-01-06", "2025-1-6", "1677-09-21", "1500-01-01", "2262-04-12", "2500-06-30", "3000-01-01",
+         "9999-12-31", "0001-01-01", "2025-02-30", "2025-13-01", "kemarin", ""]
+TIMES = ["2025-01-06 09:30", "3000-01-01 10:00", "1600-05-05 23:59", "2025-01-06 25:00", "2025-01-06", ""]
+NUMBERS = ["1.5", "0", "-2", "nan", "NaN", "inf", "-inf", "1e3", "1_000", "abc", ""]
+
+
+def random_row(rng: random.Random, i: int) -> dict:
+    return {
+        "Nama": rng.choice(["Laporan", " Rapat tim ", ""]),
+        "Deskripsi": rng.choice(["", "catatan", " spasi "]),
+        "Prioritas": rng.choice(["Tinggi", "Sedang", "Rendah", "Lain"]),
+        "Deadline": rng.choice(DATES),
+        "Selesai": rng.choice(["True", "False", "true", " TRUE ", ""]),
+        "Tanggal_Selesai": rng.choice(DATES),
+        "Durasi_Aktual": rng.choice(NUMBERS),
+        "Durasi_Estimasi": rng.choice(NUMBERS),
+        "Waktu_Rekomendasi": rng.choice(TIMES),
+        "ID": f"id-{i}",
+    }
+
+
+def test_bulk_loader_matches_from_dict_row_for_row(tmp_path):
+    rng = random.Random(0)
+    rows = [random_row(rng, i) for i in range(3000)]
+    path = str(tmp_path / "tugas.csv")
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    for task_class in (Task, CompactTask):
+        loaded = load_tasks_bulk(path, task_class)
+        expected = [task_class.from_dict(row).to_dict() for row in rows]
+        assert [task.to_dict() for task in loaded] == expected
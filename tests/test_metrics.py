@@ -0,0 +1,54 @@
+import math
+from task_manager.metrics import N_BUCKETS, Histogram, Metrics, deep_sizeof
+from task_manager.models import CompactTask
+from conftest import TODAY
+
+
+def test_each_sample_lands_in_the_bucket_bounding_it():
+    for seconds in (0.0, 5e-7, 1e-6, 1.5e-6, 2e-6, 3e-3, 1.0, 60.0):
+        histogram = Histogram()
+        histogram.record(seconds)
+        i = histogram.counts.index(1)
+        assert seconds <= Histogram.bucket_bound(i)
+        assert i == 0 or seconds > Histogram.bucket_bound(i - 1)
+    assert Histogram.bucket_bound(0) == 1e-6 and Histogram.bucket_bound(10) == 1e-6 * 1024
+
+
+def test_percentiles_are_within_a_factor_of_two():
+    histogram = Histogram()
+    samples = [i / 1000 for i in range(1, 1001)]  # 1 ms to 1 s
+    for seconds in samples:
+        histogram.record(seconds)
+    for q in (50, 90, 99):
+        exact = samples[math.ceil(len(samples) * q / 100) - 1]
+        assert exact <= histogram.percentile(q) <= 2 * exact
+    assert histogram.percentile(100) == histogram.max == 1.0
+    assert Histogram().percentile(50) == 0.0
+
+
+def test_last_bucket_reports_the_largest_sample():
+    histogram = Histogram()
+    huge = Histogram.bucket_bound(N_BUCKETS) * 3
+    histogram.record(huge)
+    assert histogram.counts[-1] == 1 and histogram.percentile(50) == huge
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    with metrics.timer("x"):
+        pass
+    metrics.count("y")
+    assert metrics.snapshot()["timers"] == {} and metrics.snapshot()["counters"] == {}
+    metrics.enabled = True
+    with metrics.timer("x"):
+        pass
+    assert metrics.snapshot()["timers"]["x"]["count"] == 1
+
+
+def test_deep_sizeof_counts_shared_objects_once_and_skips_excluded():
+    item = ["x" * 1000]
+    assert deep_sizeof([item, item]) == deep_sizeof([item]) + 8
+    assert deep_sizeof({"a": item}, exclude={id(item)}) < deep_sizeof({"a": item})
+
+    task = CompactTask("Laporan " * 50, "Tinggi", TODAY)
+    assert deep_sizeof(task) > len(task.nama)  # Follows __slots__
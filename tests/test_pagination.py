@@ -0,0 +1,50 @@
+import pytest
+from task_manager.models import TASK_ORDERS, TaskManager, CompactTask
+from task_manager.storage import JournalStorage
+from conftest import make_tasks
+
+
+@pytest.fixture
+def manager(tmp_path) -> TaskManager:
+    storage = JournalStorage(str(tmp_path / "tugas.csv"))
+    storage.save_all([task.to_dict() for task in make_tasks(25)])
+    return TaskManager(storage, task_class=CompactTask, lazy=True, snapshot=True)
+
+
+def expected_ids(manager, order, selesai=None, prioritas=None):
+    tasks = sorted(manager.tasks, key=TASK_ORDERS[order])
+    return [t.id for t in tasks
+            if (selesai is None or t.selesai == selesai) and (prioritas is None or t.prioritas in prioritas)]
+
+
+@pytest.mark.parametrize("order", list(TASK_ORDERS))
+def test_pages_follow_the_task_order(manager, order):
+    ids, total, offset = [], None, 0
+    while True:
+        page, total = manager.get_task_page(order, offset=offset, limit=7)
+        if not page:
+            break
+        ids += [task.id for task in page]
+        offset += 7
+    assert total == 25 and ids == expected_ids(manager, order)
+
+
+def test_filtered_page(manager):
+    page, total = manager.get_task_page("deadline", selesai=False, prioritas=["Tinggi", "Sedang"], offset=2, limit=3)
+    expected = expected_ids(manager, "deadline", False, {"Tinggi", "Sedang"})
+    assert total == len(expected) and [task.id for task in page] == expected[2:5]
+
+
+def test_page_of_a_fresh_manager_over_the_snapshot(manager):
+    manager.tasks  # Loading writes the snapshot
+    manager.delete_task(manager.get_task_page("prioritas", limit=1)[0][0])  # Journaled on top of it
+    fresh = TaskManager(manager.storage, task_class=CompactTask, lazy=True, snapshot=True)
+    page, total = fresh.get_task_page("prioritas", limit=5)
+    assert total == 24 and [t.id for t in page] == expected_ids(manager, "prioritas")[:5]
+
+
+def test_order_is_refreshed_after_changes(manager):
+    page, _ = manager.get_task_page("deadline", limit=1)
+    manager.delete_task(page[0])
+    assert manager.get_task_page("deadline", limit=1)[0][0].id == expected_ids(manager, "deadline")[0]
+    assert manager.get_task_page("deadline")[1] == 24
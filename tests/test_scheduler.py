@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+import pytest
+from task_manager.models import TaskManager, Task
+from task_manager.recommendations import TimeOptimizer
+from task_manager.scheduler import FreeTime, build_schedule
+from task_manager.storage import JournalStorage
+from conftest import TODAY
+
+MONDAY = datetime.combine(TODAY, datetime.min.time())
+
+
+def at(days: int, hour: int, minute: int = 0) -> datetime:
+    return MONDAY + timedelta(days=days, hours=hour, minutes=minute)
+
+
+def task(nama: str, prioritas: str, days: int, hours: float) -> Task:
+    t = Task(nama, prioritas, TODAY + timedelta(days=days))
+    t.durasi_estimasi = hours
+    return t
+
+
+def test_free_time_skips_busy_time_nights_and_weekends():
+    free = FreeTime(at(0, 8, 10), busy=[(at(0, 10), at(0, 11))])
+    assert free.take(1.5) == [(at(0, 9), at(0, 10)), (at(0, 11), at(0, 11, 30))]
+    assert free.take(6) == [(at(0, 11, 30), at(0, 17)), (at(1, 9), at(1, 9, 30))]
+
+    friday = FreeTime(at(4, 16, 5))
+    assert friday.take(1) == [(at(4, 16, 30), at(4, 17)), (at(7, 9), at(7, 9, 30))]
+    with pytest.raises(ValueError):
+        FreeTime(MONDAY, work_start=17, work_end=9)
+
+
+@pytest.mark.parametrize("workdays", [[7], [0, -1], []])
+def test_free_time_rejects_unknown_workdays(workdays):
+    with pytest.raises(ValueError):
+        FreeTime(MONDAY, workdays=workdays)
+
+
+def test_non_finite_estimates_are_planned_with_the_fallback():
+    free = FreeTime(at(0, 9))
+    with pytest.raises(ValueError):
+        free.take(float("nan"))
+    broken = task("rusak", "Sedang", 1, float("nan"))
+    endless = task("tanpa akhir", "Sedang", 2, float("inf"))
+    schedule = build_schedule([endless, broken], now=at(0, 9))
+    assert schedule.blocks[broken.id] == [(at(0, 9), at(0, 11))]
+    assert schedule.blocks[endless.id] == [(at(0, 11), at(0, 13))]
+
+
+def test_schedule_orders_by_deadline_with_priority_slack():
+    low = task("rendah", "Rendah", 1, 2)
+    high = task("tinggi", "Tinggi", 3, 2)  # Two days of slack: same key as low, wins on priority
+    later = task("sedang", "Sedang", 5, 1)
+    schedule = build_schedule([later, low, high], now=at(0, 9))
+
+    assert sorted([later, low, high], key=lambda t: schedule.start(t.id)) == [high, low, later]
+    assert schedule.blocks[high.id] == [(at(0, 9), at(0, 11))]
+    assert schedule.finish(later.id) == at(0, 14)
+    assert not schedule.late
+
+
+def test_schedule_flags_tasks_ending_after_their_deadline_day():
+    big = task("besar", "Tinggi", 0, 10)
+    schedule = build_schedule([big], now=at(0, 9))
+    assert schedule.late_ids == {big.id}
+    assert schedule.finish(big.id) == at(1, 11)
+
+
+def test_schedule_active_tasks_persists_the_start_times(tmp_path, tasks):
+    storage = JournalStorage(str(tmp_path / "tugas.csv"))
+    storage.save_all([t.to_dict() for t in tasks])
+    manager = TaskManager(storage)
+    schedule = manager.schedule_active_tasks(now=at(0, 9))
+
+    reloaded = TaskManager(JournalStorage(storage.path))
+    for active in manager.get_active_tasks():
+        assert reloaded.get_task(active.id).waktu_rekomendasi == schedule.start(active.id)
+
+
+def test_time_optimizer_follows_added_and_removed_tasks():
+    laporan = Task("Laporan keuangan", "Tinggi", TODAY)
+    laporan.mark_completed(TODAY, 2.0)
+    rapat = Task("Rapat tim", "Rendah", TODAY)
+    optimizer = TimeOptimizer([laporan, rapat])
+
+    new = Task("Laporan keuangan bulanan", "Sedang", TODAY)
+    assert optimizer.find_similar_tasks([new], k=1) == [[laporan]]
+    schedule = optimizer.optimize_schedule(new)
+    assert schedule["similar_tasks"][0] is laporan and 9 <= schedule["optimal_time"].hour <= 17
+
+    optimizer.remove(laporan.id)
+    assert optimizer.find_similar_tasks([new]) == [[rapat]]
+    optimizer.add(new)
+    assert optimizer.find_similar_tasks([new]) == [[rapat]]  # A known task never finds itself
@@ -0,0 +1,48 @@
+from datetime import date
+from task_manager.models import TaskManager, CompactTask
+from task_manager.shared import SharedTaskManager
+from task_manager.storage import SQLiteStorage
+
+
+def open_shared(path: str) -> SharedTaskManager:
+    return SharedTaskManager(TaskManager(SQLiteStorage(path), task_class=CompactTask))
+
+
+def test_get_task_finds_stored_task_before_any_query(sqlite_path, tasks):
+    manager = open_shared(sqlite_path)
+    task = manager.get_task(tasks[1].id)
+    assert task is not None and task.nama == tasks[1].nama
+    assert manager.get_task("tidak-ada") is None
+
+
+def test_complete_task_on_fresh_manager(sqlite_path, tasks):
+    active = tasks[1]
+    manager = open_shared(sqlite_path)
+    assert manager.complete_task(active, tanggal_selesai=date(2025, 1, 6), durasi_aktual=2.5)
+    stored = SQLiteStorage(sqlite_path).get_many([active.id])
+    assert stored[0]["Selesai"] == "True" and stored[0]["Durasi_Aktual"] == "2.5"
+
+
+def test_update_task_on_fresh_manager(sqlite_path, tasks):
+    manager = open_shared(sqlite_path)
+    assert manager.update_task(tasks[2], nama="Baru", deskripsi="", prioritas="Rendah",
+                               deadline=date(2025, 2, 1))
+    assert open_shared(sqlite_path).get_task(tasks[2].id).nama == "Baru"
+
+
+def test_edits_are_copy_on_write(sqlite_path, tasks):
+    manager = open_shared(sqlite_path)
+    before = manager.get_task(tasks[1].id)
+    manager.update_task(before, nama="Baru", deskripsi="", prioritas="Rendah", deadline=date(2025, 2, 1))
+    assert before.nama == tasks[1].nama
+    assert manager.get_task(tasks[1].id).nama == "Baru"
+
+
+def test_update_tasks_skips_unknown_ids_on_sqlite(sqlite_path, tasks):
+    manager = TaskManager(SQLiteStorage(sqlite_path), task_class=CompactTask)
+    stranger = CompactTask("Tidak tersimpan", "Sedang", date(2025, 1, 6))
+    known = manager.get_task(tasks[1].id)
+    known.nama = "Baru"
+    assert manager.update_tasks([stranger, known]) == 1
+    storage = SQLiteStorage(sqlite_path)
+    assert storage.get_many([stranger.id]) == [] and storage.count() == len(tasks)
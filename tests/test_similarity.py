@@ -0,0 +1,61 @@
+from datetime import timedelta
+from task_manager.models import Task
+from task_manager.similarity import SimilarityIndex
+from conftest import TODAY
+
+
+def completed(nama: str, durasi: float) -> Task:
+    task = Task(nama, "Sedang", TODAY, deskripsi="")
+    task.mark_completed(TODAY - timedelta(days=1), durasi)
+    return task
+
+
+def sample():
+    return [completed("laporan keuangan bulanan", 3.0), completed("rapat tim mingguan", 1.0),
+            completed("deploy server produksi", 2.0), completed("laporan keuangan tahunan", 5.0)]
+
+
+def test_nearest_finds_tasks_sharing_terms():
+    tasks = sample()
+    index = SimilarityIndex()
+    index.add_many(tasks)
+    assert set(index.nearest("laporan keuangan", k=2)) == {tasks[0].id, tasks[3].id}
+    assert index.nearest_many(["rapat tim", "deploy server"], k=1) == [[tasks[1].id], [tasks[2].id]]
+    assert index.duration(tasks[3].id) == 5.0
+
+
+def test_pending_and_removed_tasks():
+    tasks = sample()
+    index = SimilarityIndex()
+    index.add_many(tasks[:3])
+    index.add(tasks[3])  # Still pending, not merged
+    assert index.nearest_many(["keuangan tahunan"], k=1) == [[tasks[3].id]]
+
+    index.remove(tasks[3].id)
+    assert len(index) == 3
+    assert tasks[3].id not in index.nearest_many(["keuangan tahunan"], k=3)[0]
+
+
+def test_sync_and_persistence(tmp_path):
+    tasks = sample()
+    path = str(tmp_path / "similarity.npz")
+    index = SimilarityIndex(path)
+    assert index.sync(tasks)
+    assert not index.sync(tasks)
+
+    tasks[1].durasi_aktual = 4.0
+    assert index.sync(tasks[1:])
+    restored = SimilarityIndex(path)
+    assert len(restored) == 3 and restored.duration(tasks[1].id) == 4.0
+    assert restored.nearest_many(["laporan keuangan"], k=1) == [[tasks[3].id]]
+
+
+def test_cold_sync_merges_and_saves_once(tmp_path, monkeypatch):
+    tasks = [completed(f"tugas kode{i}", 1.0 + i % 5) for i in range(3 * SimilarityIndex.MERGE_EVERY)]
+    index = SimilarityIndex(str(tmp_path / "similarity.npz"))
+    saves = []
+    save = index.save
+    monkeypatch.setattr(index, "save", lambda: saves.append(1) or save())
+    assert index.sync(tasks)
+    assert len(saves) == 1 and len(index) == len(tasks)
+    assert index.nearest_many(["kode7"], k=1) == [[tasks[7].id]]
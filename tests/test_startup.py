@@ -0,0 +1,11 @@
+from benchmarks.suite import STARTUP_IMPORT_BUDGET, startup_imports
+
+
+def test_startup_modules_do_not_import_heavy_libraries():
+    run = startup_imports()
+    assert run["heavy"] == [], f"{run['heavy']} imported at startup; import them inside the functions using them"
+
+
+def test_startup_imports_within_budget():
+    # Best of three, so that one slow interpreter start on a busy machine does not fail the test
+    assert min(startup_imports()["seconds"] for _ in range(3)) <= STARTUP_IMPORT_BUDGET
@@ -0,0 +1,138 @@
+import os
+from datetime import date
+import pytest
+from task_manager.models import Task, CompactTask, TaskManager
+from task_manager.snapshot import TaskSnapshot
+from task_manager.storage import CSVStorage, JournalStorage, SQLiteStorage, migrate_csv_to_sqlite
+from conftest import TODAY
+
+
+def rows_by_id(rows):
+    return {row["ID"]: row for row in rows}
+
+
+@pytest.fixture
+def journal(tmp_path, tasks) -> JournalStorage:
+    storage = JournalStorage(str(tmp_path / "tugas.csv"))
+    storage.save_all([task.to_dict() for task in tasks])
+    return storage
+
+
+def test_journal_replays_records_over_the_snapshot(journal, tasks):
+    renamed = tasks[1].to_dict()
+    renamed["Nama"] = "Baru"
+    extra = Task("Tambahan", "Sedang", TODAY)
+    journal.append_many([("update", renamed), ("delete", tasks[2].to_dict()), ("add", extra.to_dict())])
+
+    rows = rows_by_id(JournalStorage(journal.path).load())
+    assert rows[tasks[1].id]["Nama"] == "Baru"
+    assert tasks[2].id not in rows
+    assert extra.id in rows and len(rows) == len(tasks)
+
+
+def test_journal_discards_a_torn_last_record(journal, tasks):
+    renamed = tasks[1].to_dict()
+    renamed["Nama"] = "Baru"
+    journal.append("update", renamed)
+    with open(journal.journal_path, "ab") as f:
+        f.write(b'{"op": "delete", "id": "')
+    intact = os.path.getsize(journal.journal_path) - len(b'{"op": "delete", "id": "')
+
+    rows = rows_by_id(JournalStorage(journal.path).load())
+    assert rows[tasks[1].id]["Nama"] == "Baru" and len(rows) == len(tasks)
+    assert os.path.getsize(journal.journal_path) == intact
+
+
+def test_journal_compacts_into_the_snapshot(tmp_path, tasks):
+    storage = JournalStorage(str(tmp_path / "tugas.csv"), compact_every=3)
+    storage.save_all([])
+    storage.append_many([("add", task.to_dict()) for task in tasks[:3]])
+
+    reopened = JournalStorage(storage.path, compact_every=3)
+    assert len(reopened.load()) == 3
+    assert os.path.getsize(reopened.journal_path) == 0
+    assert len(CSVStorage(storage.path).load()) == 3
+
+
+def test_read_only_journal_refuses_writes(journal, tasks):
+    reader = JournalStorage(journal.path, read_only=True)
+    assert len(reader.load()) == len(tasks)
+    with pytest.raises(PermissionError):
+        reader.append("delete", tasks[0].to_dict())
+
+
+def test_snapshot_round_trip(tmp_path, tasks):
+    source = str(tmp_path / "tugas.csv")
+    CSVStorage(source).save_all([task.to_dict() for task in tasks])
+    path = str(tmp_path / "tugas.snap")
+    TaskSnapshot.write(path, tasks, source)
+
+    snapshot = TaskSnapshot.open(path, source)
+    assert len(snapshot) == len(tasks)
+    assert [t.to_dict() for t in snapshot.load_tasks(CompactTask)] == [t.to_dict() for t in tasks]
+    columns = snapshot.columns()
+    assert columns.ids == [task.id for task in tasks]
+    assert columns.stats.completed == sum(task.selesai for task in tasks)
+
+
+def test_snapshot_is_ignored_once_the_source_changes(tmp_path, tasks):
+    source = str(tmp_path / "tugas.csv")
+    storage = CSVStorage(source)
+    storage.save_all([task.to_dict() for task in tasks])
+    path = str(tmp_path / "tugas.snap")
+    TaskSnapshot.write(path, tasks, source)
+
+    storage.save_all([task.to_dict() for task in tasks[:-1]])
+    assert TaskSnapshot.open(path, source) is None
+
+
+def test_sqlite_queries_use_the_filters(sqlite_path, tasks):
+    storage = SQLiteStorage(sqlite_path)
+    assert storage.count() == len(tasks)
+
+    active = storage.query(selesai=False)
+    assert {row["ID"] for row in active} == {task.id for task in tasks if not task.selesai}
+    assert [row["Deadline"] for row in active] == sorted(row["Deadline"] for row in active)
+
+    completed = storage.query(valid_completed=True)
+    assert {row["ID"] for row in completed} == {task.id for task in tasks if task.selesai}
+
+    window = storage.query(deadline_from=TODAY, deadline_to=date(2025, 1, 8))
+    assert sorted(row["Deadline"] for row in window) == ["2025-01-06", "2025-01-07", "2025-01-08"]
+
+
+def test_sqlite_rows_round_trip(sqlite_path, tasks):
+    storage = SQLiteStorage(sqlite_path)
+    stored = rows_by_id(storage.get_many([task.id for task in tasks] + ["tidak-ada"]))
+    assert [Task.from_dict(stored[task.id]).to_dict() for task in tasks] == [task.to_dict() for task in tasks]
+
+    storage.append_many([("delete", tasks[0].to_dict())])
+    assert storage.get_many([tasks[0].id]) == []
+    assert storage.count() == len(tasks) - 1
+
+
+def test_migrate_csv_with_journal_to_sqlite(journal, tasks, tmp_path):
+    journal.append("delete", tasks[0].to_dict())
+    db_path = str(tmp_path / "tugas.db")
+    assert migrate_csv_to_sqlite(journal.path, db_path) == len(tasks) - 1
+    assert SQLiteStorage(db_path).count() == len(tasks) - 1
+
+
+def test_sqlite_has_no_unused_priority_index(sqlite_path):
+    storage = SQLiteStorage(sqlite_path)
+    indexes = {row[0] for row in storage._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_tasks_prioritas" not in indexes and "idx_tasks_selesai" in indexes
+
+
+def test_snapshot_keeps_non_ascii_ids(tmp_path, tasks):
+    for task, task_id in zip(tasks, ["tugas-ü", "任务-1", "ıd ğ", "é" * 40]):
+        task.id = task_id
+    storage = JournalStorage(str(tmp_path / "tugas.csv"))
+    storage.save_all([task.to_dict() for task in tasks])
+    TaskManager(storage, task_class=CompactTask, snapshot=True)  # Loading writes the snapshot
+    snapshot = TaskSnapshot.open(str(tmp_path / "tugas.snapshot"), storage.path)
+    assert snapshot is not None
+
+    fresh = TaskManager(storage, task_class=CompactTask, lazy=True, snapshot=True)
+    assert fresh.columns.ids == [task.id for task in tasks]
+    assert [t.to_dict() for t in fresh.tasks] == [t.to_dict() for t in tasks]
@@ -0,0 +1,149 @@
+import os
+import threading
+import pytest
+from conftest import TODAY, make_tasks
+from task_manager.models import TaskManager, CompactTask
+from task_manager.storage import JournalStorage, SQLiteStorage
+from task_manager.tenants import TenantPool, _summarize_partition
+
+
+def write_partition(root, name: str, n: int = 9) -> str:
+    directory = os.path.join(str(root), name)
+    os.makedirs(directory)
+    TaskManager(JournalStorage(os.path.join(directory, "tugas.csv")), task_class=CompactTask).add_tasks(make_tasks(n))
+    return directory
+
+
+def file_state(directory: str) -> dict:
+    return {name: open(os.path.join(directory, name), "rb").read() for name in sorted(os.listdir(directory))}
+
+
+def test_summary_does_not_write_to_the_partition(tmp_path):
+    directory = write_partition(tmp_path, "a")
+    storage = JournalStorage(os.path.join(directory, "tugas.csv"), compact_every=10 ** 6)
+    tasks = storage.load_tasks(CompactTask)
+    # Enough journal records to trigger compaction, plus a record still being appended
+    storage.append_many([("update", task.to_dict()) for task in tasks * 60])
+    with open(storage.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "upd')
+    before = file_state(directory)
+
+    summary = _summarize_partition(directory, TODAY)
+    assert summary["tasks"] == 9 and summary["completed"] == 3
+    assert file_state(directory) == before
+
+
+def test_summary_of_sqlite_partition(tmp_path, tasks):
+    directory = str(tmp_path / "b")
+    os.makedirs(directory)
+    storage = SQLiteStorage(os.path.join(directory, "tugas.db"))
+    storage.save_all([task.to_dict() for task in tasks])
+    storage.close()
+    summary = _summarize_partition(directory, TODAY)
+    assert summary["tasks"] == len(tasks)
+    read_only = SQLiteStorage(os.path.join(directory, "tugas.db"), read_only=True)
+    with pytest.raises(Exception):
+        read_only.append("delete", tasks[0].to_dict())
+
+
+def test_pool_keeps_at_most_capacity_loaded(tmp_path):
+    pool = TenantPool(str(tmp_path), capacity=2)
+    try:
+        for name in ("a", "b", "c"):
+            pool.get(name)
+        assert pool.loaded == ["b", "c"]
+        pool.get("b")
+        pool.get("d")
+        assert pool.loaded == ["b", "d"]
+    finally:
+        pool.shutdown()
+
+
+def test_leased_partition_is_not_unloaded(tmp_path):
+    pool = TenantPool(str(tmp_path), capacity=1, idle_timeout=0)
+    try:
+        with pool.lease("a") as tenant:
+            pool.get("b")
+            assert "a" in pool.loaded
+            assert pool.get("a") is tenant
+        pool.get("b")
+        assert pool.loaded == ["b"]
+    finally:
+        pool.shutdown()
+
+
+def test_workspace_names_are_validated(tmp_path):
+    pool = TenantPool(str(tmp_path))
+    for name in ("../a", "", ".hidden", "a/b"):
+        with pytest.raises(ValueError):
+            pool.directory(name)
+    pool.shutdown()
+
+
+def test_aggregate_sums_loaded_and_stored_partitions(tmp_path):
+    for name, n in (("a", 9), ("b", 6), ("c", 3)):
+        write_partition(tmp_path, name, n)
+    pool = TenantPool(str(tmp_path))
+    try:
+        pool.get("a").manager.tasks  # Summarized from memory, the others in worker processes
+        report = pool.aggregate(workers=2, today=TODAY)
+    finally:
+        pool.shutdown()
+    assert report["workspaces"] == 3
+    assert report["tasks"] == 18
+    assert report["partitions"]["b"]["tasks"] == 6
+    assert report["completed"] == sum(p["completed"] for p in report["partitions"].values())
+    assert set(report["priority_productivity"]) <= {"Tinggi", "Sedang", "Rendah"}
+
+
+def test_unload_waits_for_running_training(tmp_path, monkeypatch):
+    from task_manager import tenants as tenants_module
+    events = []
+    monkeypatch.setattr(tenants_module, "_close_storage", lambda storage: events.append("closed"))
+    pool = TenantPool(str(tmp_path), capacity=1)
+    try:
+        old = pool.get("a")
+        release, started = threading.Event(), threading.Event()
+
+        def train():
+            started.set()
+            release.wait(5)
+            events.append("trained")
+
+        old.trainer._jobs = {"delay": train}
+        old.trainer.refresh()
+        assert started.wait(5)
+
+        unloading = threading.Thread(target=pool.get, args=("b",))
+        unloading.start()
+        unloading.join(0.2)
+        assert unloading.is_alive() and pool.loaded == ["b"]  # Closing happens outside the pool lock
+        reloading = threading.Thread(target=pool.get, args=("a",))
+        reloading.start()
+        reloading.join(0.2)
+        assert reloading.is_alive()  # Waits for the old copy of "a" to be closed
+
+        release.set()
+        unloading.join(5)
+        reloading.join(5)
+        assert events[:2] == ["trained", "closed"]
+        assert pool.loaded == ["a"] and pool.get("a") is not old
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_aggregate_leases_loaded_partitions(tmp_path, monkeypatch):
+    from task_manager import tenants as tenants_module
+    write_partition(tmp_path, "a")
+    pool = TenantPool(str(tmp_path))
+    leases = []
+    summarize = tenants_module.partition_summary
+    monkeypatch.setattr(tenants_module, "partition_summary",
+                        lambda columns, today: leases.append(pool._tenants["a"].leases) or summarize(columns, today))
+    try:
+        pool.get("a")
+        assert pool.aggregate(today=TODAY)["tasks"] == 9
+        assert leases == [1] and pool._tenants["a"].leases == 0
+    finally:
+        pool.shutdown()
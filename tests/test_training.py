@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from task_manager.analytics import forget_models
+from task_manager.models import TaskManager, CompactTask
+from task_manager.shared import SharedTaskManager
+from task_manager.storage import JournalStorage
+from task_manager.training import ModelTrainer
+from conftest import make_tasks
+
+
+class StubManager:
+    version = 0
+
+
+def wait_until(condition, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def blocking_trainer(manager, executor=None):
+    """Trainer whose jobs record each run and wait for the test to release them"""
+    trainer = ModelTrainer(manager, executor=executor)
+    release = threading.Event()
+    runs = []
+
+    def job(name):
+        def run():
+            runs.append((name, manager.version))
+            assert release.wait(5)
+        return run
+
+    trainer._jobs = {name: job(name) for name in ("delay",)}
+    return trainer, release, runs
+
+
+def test_refresh_trains_every_model(tmp_path):
+    storage = JournalStorage(str(tmp_path / "tugas.csv"))
+    storage.save_all([task.to_dict() for task in make_tasks(30)])
+    manager = SharedTaskManager(TaskManager(storage, task_class=CompactTask, lazy=True, defer_estimates=True))
+    trainer = ModelTrainer(manager, delay_model_path=str(tmp_path / "delay.pkl"),
+                           cluster_model_path=str(tmp_path / "clusters.pkl"))
+    try:
+        trainer.refresh()
+        # Installing the similarity index is a change too, so a job may run twice
+        wait_until(lambda: not trainer.busy and trainer._trained == dict.fromkeys(trainer._jobs, manager.version))
+        assert trainer.version >= 3
+        assert manager.similarity_ready
+        assert os.path.exists(trainer.cluster_model_path)
+    finally:
+        trainer.shutdown()
+        forget_models(trainer.delay_model_path, trainer.cluster_model_path)
+
+
+def test_changes_during_training_run_the_job_again():
+    manager = StubManager()
+    trainer, release, runs = blocking_trainer(manager)
+    trainer.refresh()
+    wait_until(lambda: runs)
+    trainer.refresh()  # Already running: not submitted twice
+    manager.version = 1
+    release.set()
+    wait_until(lambda: len(runs) == 2 and not trainer.busy)
+    trainer.shutdown()
+    assert runs == [("delay", 0), ("delay", 1)]
+    assert trainer._trained == {"delay": 1}
+
+
+def test_shutdown_drops_queued_jobs_of_a_shared_executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        first, release, first_runs = blocking_trainer(StubManager(), executor)
+        second, _, second_runs = blocking_trainer(StubManager(), executor)
+        first.refresh()
+        wait_until(lambda: first_runs)
+        second.refresh()  # Queued behind the first trainer's job
+        second.shutdown(wait=False)
+        release.set()
+    finally:
+        executor.shutdown(wait=True)
+    assert first_runs == [("delay", 0)] and second_runs == []
+    assert not second.busy
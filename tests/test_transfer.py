@@ -0,0 +1,47 @@
+import io
+import json
+from task_manager.models import TaskManager, CompactTask, Task
+from task_manager.storage import JournalStorage, SQLiteStorage
+from task_manager.transfer import export_tasks, import_tasks
+
+
+def exported(manager, fmt="csv") -> io.StringIO:
+    stream = io.StringIO()
+    export_tasks(manager, stream, fmt)
+    stream.seek(0)
+    return stream
+
+
+def exported_row(task: Task) -> str:
+    return json.dumps(task.to_dict()) + "\n"
+
+
+def test_reimport_on_sqlite_updates_known_tasks(sqlite_path, tasks):
+    stream = exported(TaskManager(SQLiteStorage(sqlite_path), task_class=CompactTask))
+    stats = import_tasks(TaskManager(SQLiteStorage(sqlite_path), task_class=CompactTask), stream, "csv")
+    assert stats == {"added": 0, "updated": len(tasks), "skipped": 0}
+
+
+def test_import_sorts_new_and_known_tasks(tmp_path, tasks):
+    manager = TaskManager(JournalStorage(str(tmp_path / "tugas.csv")), task_class=CompactTask)
+    manager.add_tasks(tasks[:4])
+    stream = exported(TaskManager(JournalStorage(str(tmp_path / "tugas.csv")), task_class=CompactTask), "jsonl")
+    extra = Task("Baru", "Sedang", tasks[0].deadline)
+    stream = io.StringIO(stream.getvalue() + exported_row(extra))
+    stats = import_tasks(manager, stream, "jsonl")
+    assert stats == {"added": 1, "updated": 4, "skipped": 0}
+    assert manager.get_task(extra.id) is not None
+
+
+def test_import_writes_each_chunk(tmp_path, tasks):
+    source = TaskManager(JournalStorage(str(tmp_path / "a.csv")), task_class=CompactTask)
+    source.add_tasks(tasks)
+    manager = TaskManager(JournalStorage(str(tmp_path / "b.csv")), task_class=CompactTask)
+    writes = []
+    append_many = manager.storage.append_many
+    manager.storage.append_many = lambda records: (writes.append(len(records)), append_many(records))
+    stats = import_tasks(manager, exported(source), "csv", chunksize=2)
+    assert stats["added"] == len(tasks)
+    assert writes and max(writes) <= 2
+    reloaded = TaskManager(JournalStorage(str(tmp_path / "b.csv")), task_class=CompactTask)
+    assert {t.id for t in reloaded.tasks} == {t.id for t in tasks}